@@ -1,5 +1,6 @@
 import argparse
 import logging
+import sys
 
 import gdk.common.consts as consts
 import gdk.common.model_actions as model_actions
@@ -39,18 +40,24 @@ class CLIParser:
             self.parser = ArgumentParser(prog=consts.cli_tool_name, description=help_text_for_command)
         self.subparsers = self.parser.add_subparsers(dest=command)
 
-    def create_parser(self):
+    def create_parser(self, invoked_commands=None):
         """
         Creates a parser with arguments and subcommands at specified command level and returns it.
 
+        When the invoked sub-commands are given, only the parsers of those sub-commands are created with their arguments
+        and sub-commands. Other sub-commands get a parser with just their help, which is enough to list them in the help
+        of the command.
+
         Parameters
         ----------
-          None
+          invoked_commands(list): Sub-commands invoked below this command level, in order. All the sub-commands are
+                                  created if None.
 
         Returns
         -------
           parser(argparse.ArgumentParser): ArgumentParser object which can parse args at its command level.
         """
+        self.invoked_commands = invoked_commands
         self.command_model = self.cli_model[self.command]
         self._add_common_args_for_all_commands()
         self._add_arguments()
@@ -137,7 +144,13 @@ class CLIParser:
         if "sub-commands" in self.command_model:
             sub_commands = self.command_model["sub-commands"]
             for sub_command in sub_commands:
-                CLIParser(sub_command, self.subparsers).create_parser()
+                if self.invoked_commands is None:
+                    CLIParser(sub_command, self.subparsers).create_parser()
+                elif self.invoked_commands and self.invoked_commands[0] == sub_command:
+                    CLIParser(sub_command, self.subparsers).create_parser(self.invoked_commands[1:])
+                else:
+                    help_text = self.cli_model[sub_command]["help"]
+                    self.subparsers.add_parser(sub_command, help=help_text, description=help_text)
 
     def _get_arg_from_model(self, argument):
         """
@@ -158,7 +171,9 @@ class CLIParser:
             if param in argument and param != "name":
                 modified_arg[param] = argument[param]
             if param in argument and param == "type":
-                modified_arg[param] = eval(argument[param])
+                if argument[param] not in consts.arg_types:
+                    raise Exception("Unsupported type '{}' of the argument '{}'.".format(argument[param], argument["name"]))
+                modified_arg[param] = consts.arg_types[argument[param]]
         return argument["name"], modified_arg
 
     def _add_common_args_for_all_commands(self):
@@ -182,7 +197,57 @@ class CLIParser:
         )
 
 
+def get_invoked_commands(args):
+    """
+    Identifies the sub-commands invoked by the command-line args, in order from the top level command.
+
+    Eg. 'gdk component build -d' invokes ['component', 'build'].
+
+    Parameters
+    ----------
+      args(list): Command-line args without the name of the CLI tool.
+
+    Returns
+    -------
+      invoked_commands(list): Sub-commands invoked by the args.
+    """
+    invoked_commands = []
+    command = consts.cli_tool_name
+    for arg in args:
+        if arg in CLIParser.cli_model[command].get("sub-commands", []):
+            invoked_commands.append(arg)
+            command = arg
+    return invoked_commands
+
+
+def create_cli_parser(args=None):
+    """
+    Creates the argument parser of the CLI tool.
+
+    When the command-line args are given, only the parsers of the sub-commands they invoke are fully created.
+
+    Parameters
+    ----------
+      args(list): Command-line args without the name of the CLI tool. All the sub-commands are created if None.
+
+    Returns
+    -------
+      parser(argparse.ArgumentParser): ArgumentParser object of the CLI tool.
+    """
+    try:
+        invoked_commands = get_invoked_commands(args) if args is not None else None
+        return CLIParser(consts.cli_tool_name, None).create_parser(invoked_commands)
+    except Exception as e:
+        print(
+            f"{utils.error_line}Command failed due to CLI error.\nPlease report it at"
+            " https://github.com/aws-greengrass/aws-greengrass-gdk-cli/issues if the issue persists.\n"
+            "Error details: {}".format(e)
+        )
+        exit(1)
+
+
 def main():
+    cli_parser = create_cli_parser(sys.argv[1:])
     try:
         args_namespace = cli_parser.parse_args()
         parse_args_actions.run_command(args_namespace)
@@ -191,13 +256,27 @@ def main():
         exit(1)
 
 
-try:
-    logging.basicConfig(level=logging.INFO, format=utils.log_format, datefmt="%Y-%m-%d %H:%M:%S", force=True)
-    cli_tool = CLIParser(consts.cli_tool_name, None)
-    cli_parser = cli_tool.create_parser()
-except Exception as e:
-    print(
-        f"{utils.error_line}Command failed due to CLI error.\nPlease report it at"
-        " https://github.com/aws-greengrass/aws-greengrass-gdk-cli/issues if the issue persists.\nError details: {}".format(e)
-    )
-    exit(1)
+def get_cli_parser():
+    """
+    Returns the argument parser of the CLI tool with all the sub-commands, creating it on first use.
+
+    main() doesn't use it as it creates only the parsers of the invoked sub-commands.
+
+    Parameters
+    ----------
+      None
+
+    Returns
+    -------
+      parser(argparse.ArgumentParser): ArgumentParser object of the CLI tool.
+    """
+    global _cli_parser
+    if _cli_parser is None:
+        _cli_parser = create_cli_parser()
+    return _cli_parser
+
+
+_cli_parser = None
+
+
+logging.basicConfig(level=logging.INFO, format=utils.log_format, datefmt="%Y-%m-%d %H:%M:%S", force=True)
@@ -1,14 +1,18 @@
 import json
 import logging
-import shutil
+import os
 import subprocess as sp
 from pathlib import Path
 
+import gdk.commands.component.cache_utils as cache_utils
+import gdk.commands.component.command_context as command_context
+import gdk.commands.component.multi_component as multi_component
 import gdk.commands.component.project_utils as project_utils
+import gdk.commands.component.recipe_utils as recipe_utils
+import gdk.commands.component.zip_utils as zip_utils
 import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
-import yaml
 
 
 def run(command_args):
@@ -22,6 +26,12 @@ def run(command_args):
     If the project configuration specifies custom build system with a custom build command, then the tool executes
     the command as it is.
 
+    For the build systems supported by the tool, the build is skipped when the project sources and the build
+    configuration are unchanged since the last successful build, unless the command is run with '--force'.
+
+    When the command is run with '--all' or in the root of a multi-component project, all the component projects are
+    built in parallel instead.
+
     Parameters
     ----------
         command_args(dict): A dictionary object that contains parsed args namespace of a command.
@@ -30,29 +40,48 @@ def run(command_args):
     -------
         None
     """
+    if multi_component.is_multi_component_command(command_args):
+        multi_component.build_components(command_args)
+        return
+
     component_build_config = project_config["component_build_config"]
     build_system = component_build_config["build_system"]
 
     logging.info("Building the component '{}' with the given project configuration.".format(project_config["component_name"]))
-    # Create build directories
-    create_gg_build_directories()
-
+    _build_folders_cache.clear()
     if build_system == "custom":
+        # Create build directories
+        create_gg_build_directories()
         # Run custom command as is.
         custom_build_command = component_build_config["custom_build_command"]
         logging.info("Using custom build configuration to build the component.")
         logging.info("Running the following command\n{}".format(custom_build_command))
         sp.run(custom_build_command)
     else:
+        fingerprint, files = cache_utils.get_build_fingerprint(project_config, supported_build_sytems[build_system])
+        if "force" in command_args and command_args["force"]:
+            logging.info("Ignoring the build cache as the build is forced.")
+        elif cache_utils.is_build_cached(project_config, fingerprint):
+            logging.info(
+                "Build cache hit. The component '{}' is already built from the same sources and build configuration.".format(
+                    project_config["component_name"]
+                )
+            )
+            return
+        # Create build directories
+        create_gg_build_directories()
         logging.info(f"Using '{build_system}' build system to build the component.")
         default_build_component()
+        cache_utils.update_build_cache(project_config, fingerprint, files)
 
 
 def create_gg_build_directories():
     """
     Creates "greengrass-build" directory with component artifacts and recipes sub directories.
 
-    This method removes the "greengrass-build" directory if it already exists.
+    This method removes the contents of the "greengrass-build" directory if it already exists, except the project cache
+    which depends only on the project config file and the recipe, and the checkpoints of interrupted uploads which are
+    needed to resume or abort them.
 
     Parameters
     ----------
@@ -63,7 +92,15 @@ def create_gg_build_directories():
         None
     """
     # Clean build directory if it exists already.
-    utils.clean_dir(project_config["gg_build_directory"])
+    gg_build_directory = Path(project_config["gg_build_directory"])
+    if utils.dir_exists(gg_build_directory):
+        for path in gg_build_directory.iterdir():
+            if path.name in [consts.project_cache_file, consts.upload_checkpoints_dir]:
+                continue
+            if path.is_dir() and not path.is_symlink():
+                utils.clean_dir(path)
+            else:
+                path.unlink()
 
     logging.debug("Creating '{}' directory with artifacts and recipes.".format(consts.greengrass_build_dir))
     # Create build artifacts and recipe directories
@@ -140,9 +177,9 @@ def _build_system_zip():
     """
     Builds the component as a zip file.
 
-    Copies over necessary files by excluding certain files to a build folder identied for zip build system
-    (supported_component_builds.json has the build folder info).
-    This build folder is zipped completely as a component zip artifact.
+    Walks the component project once and streams its files into a zip archive in the build folder identied for zip
+    build system (supported_component_builds.json has the build folder info), excluding certain files as it goes.
+    Compression of the archive is based on the zip options in the build configuration of the project.
     Raises an exception if there's an error in the process of zippings.
 
     Parameters
@@ -155,20 +192,20 @@ def _build_system_zip():
     """
     try:
         zip_build = next(iter(_get_build_folder_by_build_system()))  # Only one zip-build folder in the set
-        artifacts_zip_build = Path(zip_build).joinpath(utils.current_directory.name).resolve()
         utils.clean_dir(zip_build)
-        logging.debug("Copying over component files to the '{}' folder.".format(artifacts_zip_build.name))
-        shutil.copytree(utils.current_directory, artifacts_zip_build, ignore=_ignore_files_during_zip)
+        Path.mkdir(zip_build, parents=True, exist_ok=True)
 
         # Get build file name without extension. This will be used as name of the archive.
         archive_file = utils.current_directory.name
-        logging.debug(
-            "Creating an archive named '{}.zip' in '{}' folder with the files in '{}' folder.".format(
-                archive_file, zip_build.name, artifacts_zip_build.name
-            )
+        logging.debug("Creating an archive named '{}.zip' in '{}' folder.".format(archive_file, zip_build.name))
+        archive_file_name = Path(zip_build).joinpath(f"{archive_file}.zip").resolve()
+        zip_utils.create_zip_archive(
+            utils.current_directory,
+            archive_file_name,
+            _ignore_files_during_zip,
+            project_config["zip_options"],
+            excluded_dirs=[zip_build],
         )
-        archive_file_name = Path(zip_build).joinpath(archive_file).resolve()
-        shutil.make_archive(archive_file_name, "zip", root_dir=artifacts_zip_build)
         logging.debug("Archive complete.")
 
     except Exception as e:
@@ -177,7 +214,7 @@ def _build_system_zip():
 
 def _ignore_files_during_zip(path, names):
     """
-    Creates a list of files or directories to ignore while copying a directory.
+    Creates a list of files or directories to ignore while zipping a directory.
 
     Helper function to create custom list of files/directories to ignore. Here, we exclude,
     1. project config file -> gdk-config.json
@@ -226,10 +263,8 @@ def _get_build_folder_by_build_system():
     """
     build_system = project_config["component_build_config"]["build_system"]
     build_folder = supported_build_sytems[build_system]["build_folder"]
-    if build_system == "gradle":
-        return get_build_folders(build_folder, "build.gradle")
-    elif build_system == "maven":
-        return get_build_folders(build_folder, "pom.xml")
+    if build_system in consts.build_system_files:
+        return get_build_folders(build_folder, consts.build_system_files[build_system])
     return {Path(utils.current_directory).joinpath(*build_folder).resolve()}
 
 
@@ -240,6 +275,10 @@ def get_build_folders(build_folder, build_file):
     This function makes use of build configuration files (such as pom.xml and build.gradle) and build folder
     directories (such as target, build/libs) to identify the module directory.
 
+    The project is walked once to find the module directories and their build folders together. Hidden directories,
+    the greengrass build directory, node_modules and the build folders themselves are not walked as they don't contain
+    any modules. The build folders found are cached for the rest of the command.
+
     Once the module directory is found, its build folder is added to the return list.
 
     Parameters
@@ -251,9 +290,24 @@ def get_build_folders(build_folder, build_file):
     -------
         paths(list): List of build folder paths in a multi-module project.
     """
-    set_build_file = set(f.parent for f in Path(utils.current_directory).rglob(build_file))
-    set_build_folder = set(f.parent for f in Path(utils.current_directory).rglob(str(Path().joinpath(*build_folder))))
-    return set(x.joinpath(*build_folder) for x in (set_build_folder & set_build_file))
+    cache_key = (Path(utils.current_directory), tuple(build_folder), build_file)
+    if cache_key not in _build_folders_cache:
+        _build_folders_cache[cache_key] = _find_build_folders(Path(utils.current_directory), build_folder, build_file)
+    return set(_build_folders_cache[cache_key])
+
+
+def _find_build_folders(project_dir, build_folder, build_file):
+    """
+    Walks the project directory once and returns the build folders of the modules that have the build file.
+    """
+    pruned_dirs = {consts.greengrass_build_dir, "node_modules", build_folder[0]}
+    build_folders = set()
+    for root, dirs, files in os.walk(project_dir):
+        module_build_folder = Path(root).joinpath(*build_folder)
+        if build_file in files and module_build_folder.is_dir():
+            build_folders.add(module_build_folder)
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in pruned_dirs]
+    return build_folders
 
 
 def copy_artifacts_and_update_uris():
@@ -264,6 +318,12 @@ def copy_artifacts_and_update_uris():
     the recipe and copied over to the greengrass component's artifacts build folder. The parsed component
     recipe file is also updated with the artifact URIs.
 
+    The build folders are indexed once and the artifacts of all the manifests are resolved against the index. An artifact
+    file found in more than one build folder is reported as an error.
+
+    When the 'artifact_staging' build option is 'link', the artifacts are reflinked or hardlinked into the artifacts build
+    folder instead of being copied, and copied only when they can't be linked.
+
     Parameters
     ----------
         None
@@ -282,7 +342,12 @@ def copy_artifacts_and_update_uris():
         logging.debug("No 'Manifests' key in the recipe.")
         return
 
+    copied_artifacts = set()
+    link_artifacts = (
+        project_config["component_build_config"].get("artifact_staging", consts.default_artifact_staging) == "link"
+    )
     build_folders = _get_build_folder_by_build_system()
+    artifact_index = get_artifact_index(build_folders)
     manifests = parsed_component_recipe["Manifests"]
     for manifest in manifests:
         if "Artifacts" not in manifest:
@@ -297,31 +362,61 @@ def copy_artifacts_and_update_uris():
             if not artifact["URI"].startswith("s3://"):
                 continue
             artifact_file = Path(artifact["URI"]).name
-            artifact_found = False
-            # If the artifact is present in build system specific build folder, copy it to greengrass artifacts build folder
-            for build_folder in build_folders:
-                build_files = list(build_folder.glob(artifact_file))
-                if len(build_files) == 1:
-                    logging.debug(
-                        "Copying file '{}' from '{}' to '{}'.".format(
-                            artifact_file, build_folder, gg_build_component_artifacts_dir
-                        )
-                    )
-                    shutil.copy(build_files[0], gg_build_component_artifacts_dir)
-                    logging.debug("Updating artifact URI of '{}' in the recipe file.".format(artifact_file))
-                    artifact["URI"] = f"{artifact_uri}/{artifact_file}"
-                    artifact_found = True
-                    break
-                else:
-                    logging.debug(
-                        f"Could not find the artifact file specified in the recipe '{artifact_file}' inside the build folder"
-                        f" '{build_folder}'."
-                    )
-            if not artifact_found:
+            build_files = artifact_index.get(artifact_file, [])
+            if not build_files:
                 raise Exception(
                     f"Could not find the artifact file specified in the recipe '{artifact_file}' inside the build folders."
                     f" '{build_folders}'."
                 )
+            if len(build_files) > 1:
+                raise Exception(
+                    f"Found the artifact file specified in the recipe '{artifact_file}' in multiple build folders."
+                    f" '{sorted(str(build_file.parent) for build_file in build_files)}'."
+                )
+            # Artifacts listed in multiple manifests are copied only once.
+            if artifact_file not in copied_artifacts:
+                logging.debug(
+                    "Copying file '{}' from '{}' to '{}'.".format(
+                        artifact_file, build_files[0].parent, gg_build_component_artifacts_dir
+                    )
+                )
+                staged_by = utils.stage_file(build_files[0], gg_build_component_artifacts_dir, link=link_artifacts)
+                logging.debug("Staged the artifact '{}' with {}.".format(artifact_file, staged_by))
+                copied_artifacts.add(artifact_file)
+            logging.debug("Updating artifact URI of '{}' in the recipe file.".format(artifact_file))
+            artifact["URI"] = f"{artifact_uri}/{artifact_file}"
+
+
+def get_artifact_index(build_folders):
+    """
+    Creates an index of the files in the build folders by their names.
+
+    Each build folder is listed once so that the artifacts of all the manifests in the recipe are resolved against the
+    index instead of searching the build folders for each artifact. Files with the same name in multiple build folders
+    are logged as they can't be resolved to a single artifact.
+
+    Parameters
+    ----------
+        build_folders(set): Build folders of the component project.
+
+    Returns
+    -------
+        artifact_index(dict): Mapping of the file name to the list of paths of the files with that name.
+    """
+    artifact_index = {}
+    for build_folder in build_folders:
+        if not build_folder.is_dir():
+            logging.debug("Build folder '{}' does not exist.".format(build_folder))
+            continue
+        for build_file in build_folder.iterdir():
+            if build_file.is_file():
+                artifact_index.setdefault(build_file.name, []).append(build_file)
+    for name, build_files in artifact_index.items():
+        if len(build_files) > 1:
+            logging.debug(
+                "Found the file '{}' in multiple build folders '{}'.".format(name, [str(f.parent) for f in build_files])
+            )
+    return artifact_index
 
 
 def create_build_recipe_file():
@@ -354,11 +449,15 @@ def create_build_recipe_file():
             if component_recipe_file_name.endswith(".json"):
                 recipe_file.write(json.dumps(parsed_component_recipe, indent=4))
             else:
-                yaml.dump(parsed_component_recipe, recipe_file)
+                recipe_utils.dump_yaml_recipe(parsed_component_recipe, recipe_file)
         except Exception as e:
             raise Exception("""Failed to create build recipe file at '{}'.\n{}""".format(gg_build_recipe_file, e))
 
 
-project_config = project_utils.get_project_config_values()
+# View of the command context. The project configuration is loaded on its first use and shared with the publish command.
+project_config = command_context.project_config
 
 supported_build_sytems = project_utils.get_supported_component_builds()
+
+# Build folders found in the project, keyed by the project directory, build folder and build file.
+_build_folders_cache = {}
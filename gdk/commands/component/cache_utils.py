@@ -0,0 +1,359 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+from gdk import _version
+
+
+def get_build_fingerprint(project_config, build_system_config):
+    """
+    Calculates a fingerprint of everything that determines the output of the component build.
+
+    The fingerprint covers the content of the project source files (including the project config file and the recipe),
+    the component build configuration, the build system entry from 'project_build_system.json' and the version of the
+    CLI tool. The greengrass build directory of the project, the build output directory of the build system and the
+    directories in which git and the build tools keep their state (Eg. '.gradle') are not part of the project sources.
+    The build output directory (Eg. 'target' of maven) is excluded only
+    next to a build file of the build system (Eg. 'pom.xml' of each module), or in the project directory for build systems
+    without a build file, so that source directories with the same name are still part of the project sources.
+
+    The digest of a source file is reused from the previous build cache when its size and modification time are
+    unchanged, so that only modified files are read.
+
+    Parameters
+    ----------
+        project_config(dict): Project configuration values of the component.
+        build_system_config(dict): Build system entry from the 'project_build_system.json' file.
+
+    Returns
+    -------
+        fingerprint(string): Hex digest of the build inputs.
+        files(dict): Size, modification time and digest of each project source file.
+    """
+    cached_files = _read_build_cache(project_config).get("files", {})
+    build_folder = build_system_config.get("build_folder", []) if build_system_config else []
+    build_output_dir = build_folder[0] if build_folder else None
+    build_system = project_config["component_build_config"].get("build_system")
+    build_file = consts.build_system_files.get(build_system)
+    state_dirs = consts.build_state_dirs | consts.build_system_state_dirs.get(build_system, set())
+
+    files = {}
+    fingerprint = hashlib.sha256()
+    for file_path in _walk_project_files(Path(utils.current_directory), build_output_dir, build_file, state_dirs):
+        relative_path = file_path.relative_to(utils.current_directory).as_posix()
+        stat = file_path.stat()
+        cached = cached_files.get(relative_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            digest = cached[2]
+        else:
+            digest = utils.get_file_hash(file_path).hexdigest()
+        files[relative_path] = [stat.st_size, stat.st_mtime_ns, digest]
+        fingerprint.update("{}:{}\n".format(relative_path, digest).encode())
+
+    build_inputs = {
+        "build": project_config["component_build_config"],
+        "build_system": build_system_config,
+        "gdk_version": _version.__version__,
+    }
+    fingerprint.update(json.dumps(build_inputs, sort_keys=True).encode())
+    return fingerprint.hexdigest(), files
+
+
+def is_build_cached(project_config, fingerprint):
+    """
+    Checks if the component is already built from the build inputs with the given fingerprint.
+
+    The build is cached only if the fingerprint matches the one stored after the last successful build and the built
+    component artifacts and recipe still exist.
+
+    Parameters
+    ----------
+        project_config(dict): Project configuration values of the component.
+        fingerprint(string): Hex digest of the current build inputs.
+
+    Returns
+    -------
+        (bool): True if the build output of the same build inputs exists. Else False.
+    """
+    if _read_build_cache(project_config).get("fingerprint") != fingerprint:
+        return False
+    build_recipe = Path(project_config["gg_build_recipes_dir"]).joinpath(project_config["component_recipe_file"].name)
+    return utils.dir_exists(project_config["gg_build_component_artifacts_dir"]) and utils.file_exists(build_recipe)
+
+
+def update_build_cache(project_config, fingerprint, files):
+    """
+    Stores the fingerprint of the build inputs of a successful build in the greengrass build directory.
+
+    Parameters
+    ----------
+        project_config(dict): Project configuration values of the component.
+        fingerprint(string): Hex digest of the build inputs.
+        files(dict): Size, modification time and digest of each project source file.
+
+    Returns
+    -------
+        None
+    """
+    cache_file = _get_build_cache_file(project_config)
+    logging.debug("Updating the build cache '{}'.".format(cache_file))
+    with open(cache_file, "w") as f:
+        f.write(json.dumps({"fingerprint": fingerprint, "files": files}))
+
+
+def _read_build_cache(project_config):
+    cache_file = _get_build_cache_file(project_config)
+    if not utils.file_exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, "r") as f:
+            return json.loads(f.read())
+    except Exception as e:
+        logging.debug("Ignoring the invalid build cache '{}'.\n{}".format(cache_file, e))
+        return {}
+
+
+def _get_build_cache_file(project_config):
+    return Path(project_config["gg_build_directory"]).joinpath(consts.build_cache_file)
+
+
+def _walk_project_files(project_dir, build_output_dir, build_file, state_dirs):
+    """
+    Yields the project files in a sorted order by walking the project directory once.
+
+    The given state directories at any level, the greengrass build directory of the project and the build output directory
+    next to each build file (or in the project directory if there is no build file) are skipped.
+    """
+    for root, dirs, files in os.walk(project_dir):
+        excluded_dirs = set(state_dirs)
+        is_project_dir = Path(root) == project_dir
+        if is_project_dir:
+            excluded_dirs.add(consts.greengrass_build_dir)
+        if build_output_dir and (build_file in files if build_file else is_project_dir):
+            excluded_dirs.add(build_output_dir)
+        dirs[:] = sorted(d for d in dirs if d not in excluded_dirs)
+        for name in sorted(files):
+            yield Path(root).joinpath(name)
+
+
+def get_file_key(file_path):
+    """
+    Returns the key of a project file in the project cache.
+
+    The key identifies the content of the file by its path, size, modification time and digest, along with the version
+    of the CLI tool since the cached data is parsed and validated by it.
+
+    Parameters
+    ----------
+        file_path(Path): Path of the project file.
+
+    Returns
+    -------
+        (dict): Key of the file in the project cache.
+    """
+    stat = os.stat(file_path)
+    return {
+        "file": str(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": utils.get_file_hash(file_path).hexdigest(),
+        "gdk_version": _version.__version__,
+    }
+
+
+def get_cached_file_data(name, file_key):
+    """
+    Returns the data stored in the project cache under the given name if it was stored for the same file key.
+
+    Parameters
+    ----------
+        name(string): Name of the cached data. Eg. 'config' or 'recipe'.
+        file_key(dict): Key of the file that the data is parsed from.
+
+    Returns
+    -------
+        (tuple): (True, data) if the cached data of the file is found. Else (False, None).
+    """
+    entry = _read_project_cache().get(name)
+    if not isinstance(entry, dict) or entry.get("key") != file_key or "data" not in entry:
+        return False, None
+    logging.debug("Using the cached {} of the unchanged file '{}'.".format(name, file_key["file"]))
+    return True, entry["data"]
+
+
+def update_cached_file_data(name, file_key, data):
+    """
+    Stores the data parsed from a project file in the project cache under the given name.
+
+    The data is not stored if it doesn't survive a round trip through json unchanged (eg. a yaml recipe with dates), and
+    failures to write the cache are ignored since the cache is only an optimization.
+
+    Parameters
+    ----------
+        name(string): Name of the cached data. Eg. 'config' or 'recipe'.
+        file_key(dict): Key of the file that the data is parsed from.
+        data(object): Data parsed from the file.
+
+    Returns
+    -------
+        None
+    """
+    try:
+        if json.loads(json.dumps(data)) != data:
+            logging.debug("Not caching the {} of the file '{}' as it cannot be stored as json.".format(name, file_key["file"]))
+            return
+        project_cache = _read_project_cache()
+        project_cache[name] = {"key": file_key, "data": data}
+        utils.write_json_atomic(_get_project_cache_file(), project_cache)
+    except Exception as e:
+        logging.debug("Could not update the project cache with the {} of the file '{}'.\n{}".format(name, file_key["file"], e))
+
+
+def _read_project_cache():
+    cache_file = _get_project_cache_file()
+    if not utils.file_exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, "r") as f:
+            project_cache = json.loads(f.read())
+        return project_cache if isinstance(project_cache, dict) else {}
+    except Exception as e:
+        logging.debug("Ignoring the invalid project cache '{}'.\n{}".format(cache_file, e))
+        return {}
+
+
+def _get_project_cache_file():
+    return Path(utils.current_directory).joinpath(consts.greengrass_build_dir, consts.project_cache_file)
+
+
+def get_cached_account_number(credentials_key):
+    """
+    Returns the account number of the credentials from the caller identity cache of the user if it hasn't expired.
+
+    Parameters
+    ----------
+        credentials_key(string): Key of the credentials that identifies their source and profile.
+
+    Returns
+    -------
+        (string): Account number of the credentials if it is cached. Else None.
+    """
+    account_number = _get_user_cache_entry(consts.caller_identity_cache_file, credentials_key)
+    if account_number:
+        logging.debug("Using the cached account number of the credentials.")
+    return account_number
+
+
+def update_cached_account_number(credentials_key, account_number):
+    """
+    Stores the account number of the credentials in the caller identity cache of the user for a limited time.
+
+    Parameters
+    ----------
+        credentials_key(string): Key of the credentials that identifies their source and profile.
+        account_number(string): Account number of the credentials.
+
+    Returns
+    -------
+        None
+    """
+    _update_user_cache_entry(
+        consts.caller_identity_cache_file, credentials_key, account_number, consts.caller_identity_cache_ttl
+    )
+
+
+def get_cached_bucket_region(bucket):
+    """
+    Returns the region of the bucket from the bucket cache of the user if the bucket was verified recently.
+
+    Parameters
+    ----------
+        bucket(string): Name of the bucket.
+
+    Returns
+    -------
+        (string): Region of the bucket if it is cached. Else None.
+    """
+    return _get_user_cache_entry(consts.bucket_cache_file, bucket)
+
+
+def update_cached_bucket_region(bucket, region):
+    """
+    Stores the region of a bucket that is verified to exist in the bucket cache of the user for a limited time.
+
+    Parameters
+    ----------
+        bucket(string): Name of the bucket.
+        region(string): Region of the bucket.
+
+    Returns
+    -------
+        None
+    """
+    _update_user_cache_entry(consts.bucket_cache_file, bucket, region, consts.bucket_cache_ttl)
+
+
+def remove_cached_bucket_region(bucket):
+    """
+    Removes the bucket from the bucket cache of the user, so that the bucket is verified again on its next use.
+
+    Parameters
+    ----------
+        bucket(string): Name of the bucket.
+
+    Returns
+    -------
+        None
+    """
+    _update_user_cache_entry(consts.bucket_cache_file, bucket, None, 0)
+
+
+def _get_user_cache_entry(cache_file_name, key):
+    entry = _read_user_cache(cache_file_name).get(key)
+    if not isinstance(entry, dict) or entry.get("expires_at", 0) <= time.time():
+        return None
+    return entry.get("value")
+
+
+def _update_user_cache_entry(cache_file_name, key, value, ttl):
+    """
+    Stores the value in a cache file of the user until the given seconds pass, or removes it if the value is None.
+
+    Expired entries are removed from the cache, which is readable only by the user. Failures to write the cache are
+    ignored since the cache is only an optimization.
+    """
+    try:
+        now = time.time()
+        user_cache = {
+            cached_key: entry
+            for cached_key, entry in _read_user_cache(cache_file_name).items()
+            if isinstance(entry, dict) and entry.get("expires_at", 0) > now and cached_key != key
+        }
+        if value is not None:
+            user_cache[key] = {"value": value, "expires_at": now + ttl}
+        utils.write_json_atomic(_get_user_cache_file(cache_file_name), user_cache, mode=0o600)
+    except Exception as e:
+        logging.debug("Could not update the cache '{}'.\n{}".format(cache_file_name, e))
+
+
+def _read_user_cache(cache_file_name):
+    try:
+        # The home directory of the user may not be resolvable, eg. in some containers.
+        cache_file = _get_user_cache_file(cache_file_name)
+        if not utils.file_exists(cache_file):
+            return {}
+        with open(cache_file, "r") as f:
+            user_cache = json.loads(f.read())
+        return user_cache if isinstance(user_cache, dict) else {}
+    except Exception as e:
+        logging.debug("Ignoring the cache '{}' as it cannot be read.\n{}".format(cache_file_name, e))
+        return {}
+
+
+def _get_user_cache_file(cache_file_name):
+    return Path.home().joinpath(consts.user_cache_dir, cache_file_name)
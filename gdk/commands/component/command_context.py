@@ -0,0 +1,133 @@
+import logging
+from collections.abc import Mapping, MutableMapping
+
+import gdk.commands.component.project_utils as project_utils
+
+# Functions in project_utils that create the service clients used by the component commands, by the name of the client.
+client_factories = {
+    "s3_client": "create_s3_client",
+    "sts_client": "create_sts_client",
+    "greengrass_client": "create_greengrass_client",
+}
+
+
+class CommandContext:
+    """
+    Project configuration and service clients shared by the component commands run in a single invocation of the CLI.
+
+    Nothing is loaded when the context is created. The project configuration (along with the parsed recipe) is loaded
+    the first time it is used and each service client is created the first time it is used, so that a command only pays
+    for what it needs and a command that runs another one (eg. publish runs build) doesn't load the project again.
+    """
+
+    def __init__(self, project_config=None):
+        self._project_config = project_config
+        self._service_clients = {}
+
+    @property
+    def project_config(self):
+        if self._project_config is None:
+            self._project_config = project_utils.get_project_config_values()
+        return self._project_config
+
+    def get_service_client(self, name):
+        """
+        Returns the service client with the given name in the region of the project configuration, creating it on first
+        use.
+
+        Parameters
+        ----------
+            name(string): Name of the client. One of the keys of 'client_factories'.
+
+        Returns
+        -------
+            client(boto3.client): Service client.
+        """
+        if name not in self._service_clients:
+            logging.debug("Creating the service client '{}' on its first use.".format(name))
+            create_client = getattr(project_utils, client_factories[name])
+            if name == "s3_client":
+                # Artifacts are uploaded concurrently on the connections of the s3 client.
+                upload_options = self.project_config.get("upload_options", {})
+                max_pool_connections = project_utils.get_max_pool_connections(upload_options)
+                self._service_clients[name] = create_client(self.project_config["region"], max_pool_connections)
+            else:
+                self._service_clients[name] = create_client(self.project_config["region"])
+        return self._service_clients[name]
+
+
+class ProjectConfig(MutableMapping):
+    """
+    Dictionary view of the project configuration of the current command context.
+    """
+
+    def __getitem__(self, key):
+        return get_context().project_config[key]
+
+    def __setitem__(self, key, value):
+        get_context().project_config[key] = value
+
+    def __delitem__(self, key):
+        del get_context().project_config[key]
+
+    def __iter__(self):
+        return iter(get_context().project_config)
+
+    def __len__(self):
+        return len(get_context().project_config)
+
+
+class ServiceClients(Mapping):
+    """
+    Dictionary view of the service clients of the current command context. A client is created when it is first looked
+    up.
+    """
+
+    def __getitem__(self, name):
+        return get_context().get_service_client(name)
+
+    def __iter__(self):
+        return iter(client_factories)
+
+    def __len__(self):
+        return len(client_factories)
+
+
+def get_context():
+    """
+    Returns the command context of the current invocation of the CLI, creating it if it doesn't exist.
+
+    Parameters
+    ----------
+        None
+
+    Returns
+    -------
+        context(CommandContext): Command context of the current invocation.
+    """
+    global _context
+    if _context is None:
+        _context = CommandContext()
+    return _context
+
+
+def reset_context(context=None):
+    """
+    Replaces the command context of the current invocation, so that the project is loaded again on its next use.
+
+    Parameters
+    ----------
+        context(CommandContext): Command context to use. A new empty context is used if it is not provided.
+
+    Returns
+    -------
+        None
+    """
+    global _context
+    _context = context
+
+
+_context = None
+
+project_config = ProjectConfig()
+service_clients = ServiceClients()
@@ -13,7 +13,7 @@ def build(d_args):
 def publish(d_args):
     import gdk.commands.component.publish as publish
 
-    publish.run(d_args)
+    return publish.run(d_args)
 
 
 def list(d_args):
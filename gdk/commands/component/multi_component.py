@@ -0,0 +1,412 @@
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import gdk.commands.component.project_utils as project_utils
+import gdk.commands.component.task_utils as task_utils
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+import gdk.common.utils as utils
+
+# Directories that are not searched for component projects.
+excluded_dirs = {consts.greengrass_build_dir, "node_modules", "zip-build"}
+# Status of a component that the command completed for, by the name of the command.
+completed_status = {"build": "BUILT", "publish": "PUBLISHED"}
+
+
+def is_multi_component_command(command_args):
+    """
+    Checks if the build or publish command runs for multiple component projects.
+
+    The command runs for multiple components when it is run with '--all' or when the project config file in the current
+    directory lists the component projects of a multi-component project.
+
+    Parameters
+    ----------
+        command_args(dict): A dictionary object that contains parsed args namespace of a command.
+
+    Returns
+    -------
+        (bool): True if the command runs for multiple component projects. Else False.
+    """
+    if command_args.get("all"):
+        return True
+    return "components" in _get_root_configuration()
+
+
+def build_components(command_args):
+    """
+    Builds all the component projects of a multi-component project in parallel.
+
+    Each component is built in a separate process from its own project directory, as the build command works on the
+    current directory. The output of each build is captured and printed as a group when the build completes, followed
+    by a summary of all the builds.
+
+    Raises an exception if any of the component builds fail, after all the builds complete.
+
+    Parameters
+    ----------
+        command_args(dict): A dictionary object that contains parsed args namespace of a command.
+
+    Returns
+    -------
+        None
+    """
+    run_components("build", get_component_dirs(), command_args)
+
+
+def publish_components(command_args):
+    """
+    Publishes all the component projects of a multi-component project in parallel, in the order of their dependencies.
+
+    A component is published only after the components of the project that it depends on in its recipe are published,
+    so that their new versions exist when its version is created. Components that don't depend on each other are
+    published concurrently, and components that depend on a component that failed to publish are skipped. The latest
+    versions of the components with the 'NEXT_PATCH' version are resolved in one batch before publishing them. When a
+    refresh of the account is requested, the account is identified once here and the cached account is used for all the
+    components. When waiting for the created component versions is required, all of them are waited for together on
+    one poller after they are published.
+
+    Raises an exception if any of the components is not published, after all the other components are published.
+
+    Parameters
+    ----------
+        command_args(dict): A dictionary object that contains parsed args namespace of a command.
+
+    Returns
+    -------
+        None
+    """
+    component_dirs = get_component_dirs()
+    dependencies = get_component_dependencies(component_dirs)
+    if command_args.get("refresh_account"):
+        _refresh_account_number()
+    latest_versions = get_latest_component_versions(component_dirs)
+    publish_args = dict(command_args, latest_component_versions=latest_versions, refresh_account=False, wait=False)
+    results = run_components("publish", component_dirs, publish_args, dependencies)
+    if command_args.get("wait"):
+        import gdk.commands.component.wait_utils as wait_utils
+
+        component_arns = [results[component_dir]["result"] for component_dir in component_dirs]
+        wait_utils.wait_for_components(component_arns, command_args.get("wait_timeout"))
+
+
+def run_components(command, component_dirs, command_args, dependencies=None):
+    """
+    Runs the component command for each of the component projects on a pool of worker processes.
+
+    A component is run as soon as the components it depends on have completed successfully. The output of each run is
+    printed as a group when it completes, followed by a summary of all the runs.
+
+    Raises an exception if the command fails or is skipped for any of the components.
+
+    Parameters
+    ----------
+        command(string): Name of the component command. Eg. 'build' or 'publish'.
+        component_dirs(list): Paths of the component project directories.
+        command_args(dict): A dictionary object that contains parsed args namespace of a command.
+        dependencies(dict): Component project directories that each component project directory depends on.
+
+    Returns
+    -------
+        results(dict): Result of the run of each component project directory, including the value returned by the command.
+    """
+    dependencies = dependencies or {}
+    max_workers = command_args.get("workers") or min(len(component_dirs), os.cpu_count() or 1)
+    logging.info("Running '{}' for {} components with {} workers.".format(command, len(component_dirs), max_workers))
+    # Commands in the workers don't look for multiple components again.
+    component_args = dict(command_args, all=False)
+    log_level = logging.getLogger().getEffectiveLevel()
+
+    component_dependencies = {component_dir: dependencies.get(component_dir, []) for component_dir in component_dirs}
+    results = {}
+
+    def get_task(component_dir):
+        failed_dependencies = [d for d in component_dependencies[component_dir] if results[d]["error"]]
+        if failed_dependencies:
+            results[component_dir] = _get_skipped_result(component_dir, failed_dependencies)
+            _print_output(command, results[component_dir])
+            return None
+        return _run_component, (command, component_dir, component_args, log_level)
+
+    def complete_task(component_dir, future):
+        results[component_dir] = future.result()
+        _print_output(command, results[component_dir])
+        # The other components still run when a component fails. Only the components that depend on it are skipped.
+        return True
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        task_utils.schedule_tasks(executor, component_dependencies, get_task, complete_task)
+
+    _log_summary(command, [results[component_dir] for component_dir in component_dirs])
+    failed = [_get_display_name(component_dir) for component_dir in component_dirs if results[component_dir]["error"]]
+    if failed:
+        count = len(component_dirs)
+        raise Exception(error_messages.MULTI_COMPONENT_COMMAND_FAILED.format(command, len(failed), count, ", ".join(failed)))
+    return results
+
+
+def get_component_dependencies(component_dirs):
+    """
+    Identifies the dependencies between the component projects from the 'ComponentDependencies' of their recipes.
+
+    Dependencies on components that are not part of the project are ignored. The name of the component of a project is
+    the one in its project config file. A project whose config file or recipe can't be read has no dependencies, and
+    the error is reported when the command is run for it.
+
+    Raises an exception if the dependencies form a cycle.
+
+    Parameters
+    ----------
+        component_dirs(list): Paths of the component project directories.
+
+    Returns
+    -------
+        dependencies(dict): Component project directories that each component project directory depends on.
+    """
+    component_names = {}
+    component_dependencies = {}
+    for component_dir in component_dirs:
+        try:
+            with open(Path(component_dir).joinpath(consts.cli_project_config_file), "r") as f:
+                component_name = next(iter(json.loads(f.read())["component"]))
+            component_names[component_name] = component_dir
+            component_dependencies[component_dir] = list(_get_recipe_dependencies(component_dir))
+        except Exception as e:
+            logging.debug("Could not identify the dependencies of the component in '{}'.\n{}".format(component_dir, e))
+            component_dependencies[component_dir] = []
+
+    dependencies = {
+        component_dir: [component_names[name] for name in names if name in component_names]
+        for component_dir, names in component_dependencies.items()
+    }
+    cycle = task_utils.get_dependency_cycle(dependencies)
+    if cycle:
+        raise Exception(error_messages.COMPONENT_DEPENDENCY_CYCLE.format(" -> ".join(_get_display_name(d) for d in cycle)))
+    return dependencies
+
+
+def get_component_dirs():
+    """
+    Returns the directories of the component projects to build.
+
+    The component projects listed in the project config file of the current directory are used if it lists them.
+    Else, the current directory and its sub-directories are searched for directories with a project config file. The
+    search doesn't continue into a component project, or into hidden and build output directories.
+
+    Raises an exception if no component project is found.
+
+    Parameters
+    ----------
+        None
+
+    Returns
+    -------
+        component_dirs(list): Paths of the component project directories.
+    """
+    root_dir = Path(utils.current_directory).resolve()
+    listed_components = _get_root_configuration().get("components")
+    if listed_components:
+        component_dirs = [root_dir.joinpath(component).resolve() for component in listed_components]
+        for component_dir in component_dirs:
+            if not utils.file_exists(component_dir.joinpath(consts.cli_project_config_file)):
+                raise Exception(error_messages.COMPONENT_PROJECT_NOT_FOUND.format(component_dir))
+        return component_dirs
+
+    component_dirs = []
+    for root, dirs, files in os.walk(root_dir):
+        if consts.cli_project_config_file in files:
+            # Component projects are not nested.
+            component_dirs.append(Path(root))
+            dirs[:] = []
+        else:
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in excluded_dirs)
+    if not component_dirs:
+        raise Exception(error_messages.COMPONENT_PROJECTS_NOT_FOUND)
+    return component_dirs
+
+
+def _get_root_configuration():
+    config_file = Path(utils.current_directory).joinpath(consts.cli_project_config_file)
+    if not utils.file_exists(config_file):
+        return {}
+    return project_utils.get_project_configuration()
+
+
+def get_latest_component_versions(component_dirs):
+    """
+    Resolves the latest versions of the components with the 'NEXT_PATCH' version in one batch.
+
+    The versions are resolved only as an optimization. When they can't be resolved, each component resolves its own
+    version when it is published.
+
+    Parameters
+    ----------
+        component_dirs(list): Paths of the component project directories.
+
+    Returns
+    -------
+        latest_versions(dict): Highest version of each component by its ARN. None if the component doesn't exist.
+    """
+    import gdk.commands.component.version_utils as version_utils
+
+    next_patch_components = {}
+    for component_dir in component_dirs:
+        try:
+            with open(Path(component_dir).joinpath(consts.cli_project_config_file), "r") as f:
+                component_name, component_config = next(iter(json.loads(f.read())["component"].items()))
+            if component_config["version"] == "NEXT_PATCH":
+                region = component_config["publish"]["region"]
+                next_patch_components.setdefault(region, []).append(component_name)
+        except Exception as e:
+            logging.debug("Could not read the project configuration in '{}'.\n{}".format(component_dir, e))
+    if not next_patch_components:
+        return {}
+
+    latest_versions = {}
+    try:
+        regions = list(next_patch_components)
+        account_num = project_utils.get_account_number(project_utils.create_sts_client(regions[0]))
+        for region, component_names in next_patch_components.items():
+            greengrass_client = project_utils.create_greengrass_client(region)
+            arns = [version_utils.get_component_arn(region, account_num, name) for name in component_names]
+            latest_versions.update(version_utils.get_latest_component_versions(greengrass_client, arns))
+    except Exception as e:
+        logging.debug("Could not resolve the latest versions of the components.\n{}".format(e))
+    return latest_versions
+
+
+def _refresh_account_number():
+    try:
+        project_utils.get_account_number(project_utils.create_sts_client(), refresh=True)
+    except Exception as e:
+        logging.debug("Could not refresh the account number of the credentials.\n{}".format(e))
+
+
+def _get_recipe_dependencies(component_dir):
+    for recipe_name in ["recipe.json", "recipe.yaml"]:
+        recipe_file = Path(component_dir).joinpath(recipe_name)
+        if utils.file_exists(recipe_file):
+            return project_utils.parse_recipe_file(recipe_file).get("ComponentDependencies") or {}
+    return {}
+
+
+def _get_skipped_result(component_dir, failed_dependencies):
+    dependency_names = ", ".join(_get_display_name(d) for d in failed_dependencies)
+    return {
+        "component_dir": component_dir,
+        "error": "Skipped as the components it depends on failed: {}.".format(dependency_names),
+        "skipped": True,
+        "output": "",
+        "duration": 0.0,
+        "result": None,
+    }
+
+
+def _run_component(command, component_dir, command_args, log_level):
+    """
+    Runs the component command for the component project in the given directory in a worker process and returns the
+    result of the run.
+
+    The output of the command, including the output of the build commands, is captured in a temporary file.
+    """
+    import gdk.commands.component.command_context as command_context
+    import gdk.commands.component.component as component
+
+    start = time.perf_counter()
+    error = None
+    result = None
+    with tempfile.TemporaryFile() as output_file:
+        with _capture_output(output_file, log_level):
+            try:
+                # Commands run in the current working directory of the process.
+                os.chdir(component_dir)
+                utils.current_directory = Path(component_dir)
+                # A worker runs several components one after another, so the project context and the AWS clients of the
+                # previous component are not reused. Workers forked from the CLI process (Linux) also inherit its
+                # clients, which must not be shared between processes. Spawned workers (Windows and macOS) start
+                # without them, but still run more than one component.
+                project_utils.reset_clients()
+                command_context.reset_context()
+                result = getattr(component, command)(command_args)
+            except Exception as e:
+                logging.error("Failed to {} the component in '{}'.\n{}".format(command, component_dir, e))
+                error = str(e)
+        output_file.seek(0)
+        output = output_file.read().decode(errors="replace")
+    return {
+        "component_dir": component_dir,
+        "error": error,
+        "skipped": False,
+        "output": output,
+        "duration": time.perf_counter() - start,
+        "result": result,
+    }
+
+
+@contextlib.contextmanager
+def _capture_output(output_file, log_level):
+    # Redirects the stdout and stderr of the process, so that the output of the build commands is captured along with
+    # the logs.
+    root_logger = logging.getLogger()
+    handlers, level = root_logger.handlers[:], root_logger.level
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(1), os.dup(2)]
+    os.dup2(output_file.fileno(), 1)
+    os.dup2(output_file.fileno(), 2)
+    log_stream = open(output_file.fileno(), "w", closefd=False)
+    handler = logging.StreamHandler(log_stream)
+    handler.setFormatter(logging.Formatter(utils.log_format, datefmt="%Y-%m-%d %H:%M:%S"))
+    root_logger.handlers = [handler]
+    root_logger.setLevel(log_level)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+        root_logger.handlers = handlers
+        root_logger.setLevel(level)
+        log_stream.close()
+
+
+def _get_status(command, result):
+    if result["skipped"]:
+        return "SKIPPED"
+    if result["error"]:
+        return "FAILED"
+    return completed_status[command]
+
+
+def _print_output(command, result):
+    header = "{} ({})".format(_get_display_name(result["component_dir"]), _get_status(command, result))
+    print("\n=============================== {} ===============================".format(header))
+    if result["skipped"]:
+        print(result["error"])
+    print(result["output"], end="", flush=True)
+
+
+def _log_summary(command, results):
+    logging.info("Summary of '{}' for the components:".format(command))
+    for result in results:
+        status = _get_status(command, result)
+        logging.info("  {:<10}{:>8.1f}s  {}".format(status, result["duration"], _get_display_name(result["component_dir"])))
+    completed = len([result for result in results if not result["error"]])
+    logging.info("{} {} of the {} components.".format(completed_status[command].capitalize(), completed, len(results)))
+
+
+def _get_display_name(component_dir):
+    try:
+        return Path(component_dir).relative_to(Path(utils.current_directory).resolve()).as_posix()
+    except ValueError:
+        return str(component_dir)
@@ -1,13 +1,16 @@
+import hashlib
 import json
 import logging
+import os
+import threading
 from pathlib import Path
 
-import boto3
+import gdk.commands.component.cache_utils as cache_utils
+import gdk.commands.component.recipe_utils as recipe_utils
 import gdk.common.configuration as config_actions
 import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
-import yaml
 
 
 def get_supported_component_builds():
@@ -88,17 +91,70 @@ def parse_recipe_file(component_recipe_file):
                 recipe_json = json.loads(recipe)
                 return recipe_json
             else:
-                recipe_yaml = yaml.safe_load(recipe)
+                recipe_yaml = recipe_utils.load_yaml_recipe(recipe)
                 return recipe_yaml
         except Exception as e:
             raise Exception("""Unable to parse the recipe file - {}.\n{}""".format(component_recipe_file.name, e))
 
 
+def get_project_configuration():
+    """
+    Loads the validated configuration from the greengrass project config file.
+
+    The configuration is reused from the project cache in the greengrass build directory when the config file is
+    unchanged since it was last validated, which skips the schema validation.
+
+    Parameters
+    ----------
+        None
+
+    Returns
+    -------
+        config_data(dict): Greengrass project configuration as a dictionary object.
+    """
+    config_file = Path(utils.current_directory).joinpath(consts.cli_project_config_file).resolve()
+    if not utils.file_exists(config_file):
+        # Raises the error of the missing config file.
+        return config_actions.get_configuration()
+    file_key = cache_utils.get_file_key(config_file)
+    found, config_data = cache_utils.get_cached_file_data("config", file_key)
+    if not found:
+        config_data = config_actions.get_configuration()
+        cache_utils.update_cached_file_data("config", file_key, config_data)
+    return config_data
+
+
+def get_parsed_recipe(component_recipe_file):
+    """
+    Loads the recipe file of the project as a json object.
+
+    The parsed recipe is reused from the project cache in the greengrass build directory when the recipe file is
+    unchanged since it was last parsed, which skips parsing yaml recipes.
+
+    Parameters
+    ----------
+        component_recipe_file(pathlib.Path): Path of the component recipe file.
+
+    Returns
+    -------
+      (dict): Returns a dict object with the component recipe file.
+    """
+    file_key = cache_utils.get_file_key(component_recipe_file)
+    found, recipe = cache_utils.get_cached_file_data("recipe", file_key)
+    if not found:
+        recipe = parse_recipe_file(component_recipe_file)
+        cache_utils.update_cached_file_data("recipe", file_key, recipe)
+    return recipe
+
+
 def get_project_config_values():
 
     # Get component configuration from the greengrass project config file.
     logging.info("Getting project configuration from {}".format(consts.cli_project_config_file))
-    project_config = config_actions.get_configuration()["component"]
+    config_data = get_project_configuration()
+    if "component" not in config_data:
+        raise Exception(error_messages.PROJECT_CONFIG_LISTS_COMPONENTS)
+    project_config = config_data["component"]
 
     # Since there's only one key in the component configuration, use next() instead of looping in.
     component_name = next(iter(project_config))
@@ -106,8 +162,10 @@ def get_project_config_values():
     component_version = component_config["version"]
     component_author = component_config["author"]
     component_build_config = component_config["build"]
+    zip_options = get_zip_options(component_build_config)
     bucket = component_config["publish"]["bucket"]
     region = component_config["publish"]["region"]
+    upload_options = get_upload_options(component_config["publish"])
 
     # Build directories
     gg_build_directory = Path(utils.current_directory).joinpath(consts.greengrass_build_dir).resolve()
@@ -119,7 +177,7 @@ def get_project_config_values():
     component_recipe_file = get_recipe_file()
 
     # Get parsed recipe file
-    parsed_component_recipe = parse_recipe_file(component_recipe_file)
+    parsed_component_recipe = get_parsed_recipe(component_recipe_file)
 
     # Create dictionary with all the above values
     vars = {}
@@ -127,8 +185,10 @@ def get_project_config_values():
     vars["component_version"] = component_version
     vars["component_author"] = component_author
     vars["component_build_config"] = component_build_config
+    vars["zip_options"] = zip_options
     vars["bucket"] = bucket
     vars["region"] = region
+    vars["upload_options"] = upload_options
     vars["gg_build_directory"] = gg_build_directory
     vars["gg_build_artifacts_dir"] = gg_build_artifacts_dir
     vars["gg_build_recipes_dir"] = gg_build_recipes_dir
@@ -138,6 +198,44 @@ def get_project_config_values():
     return vars
 
 
+def get_zip_options(build_config):
+    """
+    Returns the options used to create the component zip artifact with the zip build system.
+
+    Options that are not specified in the build configuration of the project config file use the default values.
+
+    Parameters
+    ----------
+        build_config(dict): Build configuration of the component from the project config file.
+
+    Returns
+    -------
+        zip_options(dict): Options used to create the zip artifact.
+    """
+    zip_options = dict(consts.default_zip_options)
+    zip_options.update(build_config.get("zip_options", {}))
+    return zip_options
+
+
+def get_upload_options(publish_config):
+    """
+    Returns the options used to upload the component artifacts to s3 bucket during publish.
+
+    Options that are not specified in the publish configuration of the project config file use the default values.
+
+    Parameters
+    ----------
+        publish_config(dict): Publish configuration of the component from the project config file.
+
+    Returns
+    -------
+        upload_options(dict): Upload options of the component artifacts.
+    """
+    upload_options = dict(consts.default_upload_options)
+    upload_options.update(publish_config.get("upload_options", {}))
+    return upload_options
+
+
 def get_service_clients(region):
     service_clients = {}
     service_clients["s3_client"] = create_s3_client(region)
@@ -146,16 +244,177 @@ def get_service_clients(region):
     return service_clients
 
 
-def create_s3_client(region=None):
+def get_max_pool_connections(upload_options):
+    """
+    Returns the size of the connection pool of the s3 client, so that concurrent artifact uploads don't wait for a
+    connection.
+
+    Parameters
+    ----------
+        upload_options(dict): Upload options of the component artifacts.
+
+    Returns
+    -------
+        (int): Maximum number of connections of the s3 client.
+    """
+    if upload_options.get("max_pool_connections"):
+        return upload_options["max_pool_connections"]
+    return max(consts.default_client_options["max_pool_connections"], upload_options.get("max_concurrency", 0))
+
+
+def create_s3_client(region=None, max_pool_connections=None):
     logging.debug("Creating s3 client")
-    return boto3.client("s3", region_name=region)
+    return get_client("s3", region, max_pool_connections)
 
 
 def create_sts_client(region=None):
     logging.debug("Creating sts client")
-    return boto3.client("sts", region_name=region)
+    return get_client("sts", region)
 
 
 def create_greengrass_client(region=None):
     logging.debug("Creating GreengrassV2 client")
-    return boto3.client("greengrassv2", region_name=region)
+    return get_client("greengrassv2", region)
+
+
+def get_client(service_name, region=None, max_pool_connections=None):
+    """
+    Returns a client of the AWS service in the region, creating it from the shared session on its first use.
+
+    All the clients are created from one session, so that the credentials and the service models are loaded once, and
+    a client is reused for the rest of the run of the CLI. The clients retry in the adaptive mode and keep their
+    connections alive.
+
+    Parameters
+    ----------
+        service_name(string): Name of the AWS service. Eg. 's3'
+        region(string): Region of the client. The region of the session is used if it is None.
+        max_pool_connections(int): Maximum number of connections of the client. Defaults to the client options.
+
+    Returns
+    -------
+        client(boto3.client): Client of the service.
+    """
+    client_options = consts.default_client_options
+    pool_size = max_pool_connections or client_options["max_pool_connections"]
+    client_key = (service_name, region, pool_size)
+    with _clients_lock:
+        if client_key not in _clients:
+            from botocore.config import Config
+
+            config = Config(
+                max_pool_connections=pool_size,
+                retries={"mode": client_options["retry_mode"], "max_attempts": client_options["max_attempts"]},
+                tcp_keepalive=client_options["tcp_keepalive"],
+            )
+            _clients[client_key] = get_session().client(service_name, region_name=region, config=config)
+        return _clients[client_key]
+
+
+def get_session():
+    """
+    Returns the session that all the AWS clients are created from, creating it on its first use.
+    """
+    global _session, _botocore_session
+    if _session is None:
+        # boto3 is imported only when a client is created as it is slow to import and only publish needs it.
+        import boto3
+        import botocore.session
+
+        _botocore_session = botocore.session.Session()
+        _session = boto3.session.Session(botocore_session=_botocore_session)
+    return _session
+
+
+def reset_clients():
+    """
+    Discards the shared session and the clients created from it, so that they are created again on their next use.
+
+    boto3 sessions and clients are not fork-safe. A worker process forked from a process that has used them must not use
+    the inherited session, clients and their pooled connections.
+    """
+    global _session, _botocore_session, _clients, _clients_lock
+    _session = None
+    _botocore_session = None
+    _clients = {}
+    _clients_lock = threading.Lock()
+
+
+def get_credentials_key():
+    """
+    Returns a key that identifies the credentials of the shared session and the identity they belong to.
+
+    Along with the source and the profile of the credentials, the key has the role of the credentials when it is known
+    from the configuration: the role of web identity and assumed role credentials, or the account and the role of SSO
+    credentials. Other credentials (eg. static keys, a container or an instance role) are identified by their current
+    access key, so that credentials of different identities never have the same key.
+
+    Parameters
+    ----------
+        None
+
+    Returns
+    -------
+        (string): Hex digest of the credentials and their identity. None if there are no credentials or their identity
+            is not known.
+    """
+    session = get_session()
+    credentials = session.get_credentials()
+    if credentials is None:
+        return None
+    identity = _get_configured_role(credentials.method) or credentials.access_key
+    if not identity:
+        return None
+    credentials_source = {"method": credentials.method, "profile": session.profile_name, "identity": identity}
+    return hashlib.sha256(json.dumps(credentials_source, sort_keys=True).encode()).hexdigest()
+
+
+def _get_configured_role(method):
+    # Roles are configured in the profile of the shared session or, for web identity credentials, in the environment.
+    try:
+        profile_config = _botocore_session.get_scoped_config()
+    except Exception as e:
+        logging.debug("Could not read the configuration of the profile.\n{}".format(e))
+        return None
+    if method == "assume-role-with-web-identity":
+        return os.environ.get("AWS_ROLE_ARN") or profile_config.get("role_arn")
+    if method == "assume-role":
+        return profile_config.get("role_arn")
+    if method == "sso" and profile_config.get("sso_account_id"):
+        return "{}:{}".format(profile_config["sso_account_id"], profile_config.get("sso_role_name"))
+    return None
+
+
+def get_account_number(sts_client, refresh=False):
+    """
+    Returns the account number of the credentials of the shared session.
+
+    The account number is read from the caller identity cache of the user when it was identified with the same
+    credentials recently. Otherwise, it is identified with the STS client and stored in the cache.
+
+    Parameters
+    ----------
+        sts_client(boto3.client): STS client created from the shared session.
+        refresh(bool): Identifies the account with the STS client even if it is cached.
+
+    Returns
+    -------
+        account_num(string): Account number of the credentials.
+    """
+    credentials_key = get_credentials_key()
+    if credentials_key and not refresh:
+        account_num = cache_utils.get_cached_account_number(credentials_key)
+        if account_num:
+            return account_num
+    account_num = sts_client.get_caller_identity()["Account"]
+    if credentials_key:
+        cache_utils.update_cached_account_number(credentials_key, account_num)
+    return account_num
+
+
+# Shared session of the AWS clients, the botocore session it wraps and the clients created from it by the service, region
+# and connection pool size.
+_session = None
+_botocore_session = None
+_clients = {}
+_clients_lock = threading.Lock()
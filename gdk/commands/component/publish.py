@@ -1,49 +1,153 @@
+import base64
+import copy
+import hashlib
 import json
 import logging
 from pathlib import Path
 
+import gdk.commands.component.cache_utils as cache_utils
+import gdk.commands.component.command_context as command_context
 import gdk.commands.component.component as component
+import gdk.commands.component.multi_component as multi_component
 import gdk.commands.component.project_utils as project_utils
+import gdk.commands.component.recipe_utils as recipe_utils
+import gdk.commands.component.task_utils as task_utils
+import gdk.commands.component.transfer_utils as transfer_utils
+import gdk.commands.component.version_utils as version_utils
+import gdk.commands.component.wait_utils as wait_utils
+import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
-import yaml
 from botocore.exceptions import ClientError
 
 
 def run(args):
-    try:
-
-        project_config["account_number"] = get_account_number()
-        project_config["bucket"] = "{}-{}-{}".format(
-            project_config["bucket"], project_config["region"], project_config["account_number"]
-        )
+    if multi_component.is_multi_component_command(args):
+        multi_component.publish_components(args)
+        return
+    # Versions of the components resolved in one batch when publishing multiple components.
+    version_utils.cache_latest_component_versions(args.get("latest_component_versions") or {})
 
+    try:
         component_name = project_config["component_name"]
-        component_version = get_component_version_from_config()
-        logging.debug(f"Checking if the component '{component_name}' is built.")
-        if not utils.dir_exists(project_config["gg_build_component_artifacts_dir"]):
-            logging.warning(
-                f"The component '{component_name}' is not built.\nSo, building the component before publishing it."
-            )
-            component.build({})
         logging.info(f"Publishing the component '{component_name}' with the given project configuration.")
-        logging.info("Uploading the component built artifacts to s3 bucket.")
-        upload_artifacts_s3(component_name, component_version)
-
-        logging.info(f"Updating the component recipe {component_name}-{component_version}.")
-        update_and_create_recipe_file(component_name, component_version)
-
-        logging.info(f"Creating a new greengrass component {component_name}-{component_version}")
-        create_gg_component(component_name, component_version)
+        publish_steps = get_publish_steps(
+            component_name,
+            args.get("refresh_account", False),
+            args.get("wait", False),
+            args.get("wait_timeout"),
+            args.get("idempotent", False),
+        )
+        results, timings = task_utils.run_tasks(publish_steps)
+        task_utils.log_task_timings("Publish steps", timings)
+        return results["create"]
     except Exception as e:
         logging.error("Failed to publish new version of the component '{}'".format(project_config["component_name"]))
         raise Exception("{}\n{}".format(error_messages.PUBLISH_FAILED, e))
 
 
+def get_publish_steps(component_name, refresh_account=False, wait=False, wait_timeout=None, idempotent=False):
+    """
+    Returns the steps of publishing the component as tasks that run as soon as the steps they depend on are complete.
+
+    The account is identified first, as it completes the name of the artifacts bucket in the project configuration that
+    the build and the other steps read. Once the account is known, the component is built while its version is
+    calculated and the artifacts bucket is prepared. The artifacts are uploaded as soon as the component is built and
+    the bucket and the version are known, while the publish recipe is created. The component version is created after
+    both, and waited for until it is deployable if required.
+
+    In the idempotent mode, the built component is compared with its latest version once the version is known, and the
+    latest version is used without uploading the artifacts or creating a new version if they are the same.
+
+    Parameters
+    ----------
+        component_name(string): Name of the component to publish.
+        refresh_account(bool): Identifies the account with STS even if it is cached.
+        wait(bool): Waits until the created component version is deployable.
+        wait_timeout(int): Seconds to wait for the created component version. Defaults to the wait options.
+        idempotent(bool): Uses the latest version of the component if it is unchanged.
+
+    Returns
+    -------
+        publish_steps(dict): Tuple (function, dependencies) of each step by its name, as used by task_utils.run_tasks.
+    """
+    reuse = ["reuse"] if idempotent else []
+    publish_steps = {
+        "account": (lambda _: set_artifacts_bucket_name(refresh_account), []),
+        "build": (lambda _: build_if_not_built(component_name), ["account"]),
+        "version": (lambda _: get_component_version_from_config(), ["account"]),
+        "bucket": (lambda _: prepare_artifacts_bucket(project_config["bucket"], project_config["region"]), ["account"]),
+        "upload": (
+            _unless_reused(lambda results: upload_artifacts_s3(component_name, results["version"])),
+            ["build", "bucket", "version"] + reuse,
+        ),
+        "recipe": (
+            _unless_reused(lambda results: update_and_create_recipe_file(component_name, results["version"])),
+            ["build", "version"] + reuse,
+        ),
+        "create": (
+            lambda results: results.get("reuse") or create_gg_component(component_name, results["version"]),
+            ["upload", "recipe"],
+        ),
+    }
+    if idempotent:
+        publish_steps["reuse"] = (lambda _: get_reusable_component_version(component_name), ["build", "version"])
+    if wait:
+        publish_steps["wait"] = (lambda results: wait_utils.wait_for_components([results["create"]], wait_timeout), ["create"])
+    return publish_steps
+
+
+def _unless_reused(step):
+    # Skips a step that creates a new component version when the latest version is used instead.
+    return lambda results: None if results.get("reuse") else step(results)
+
+
+def set_artifacts_bucket_name(refresh_account=False):
+    """
+    Identifies the account of the credentials and adds it along with the region to the name of the artifacts bucket.
+
+    Parameters
+    ----------
+        refresh_account(bool): Identifies the account with STS even if it is cached.
+
+    Returns
+    -------
+        None
+    """
+    project_config["account_number"] = get_account_number(refresh_account)
+    project_config["bucket"] = "{}-{}-{}".format(
+        project_config["bucket"], project_config["region"], project_config["account_number"]
+    )
+
+
+def build_if_not_built(component_name):
+    """
+    Builds the component if its artifacts are not built yet.
+
+    Parameters
+    ----------
+        component_name(string): Name of the component to publish.
+
+    Returns
+    -------
+        None
+    """
+    logging.debug(f"Checking if the component '{component_name}' is built.")
+    if not utils.dir_exists(project_config["gg_build_component_artifacts_dir"]):
+        logging.warning(f"The component '{component_name}' is not built.\nSo, building the component before publishing it.")
+        component.build({})
+
+
 def upload_artifacts_s3(component_name, component_version):
     """
     Uploads all the artifacts from component artifacts build folder to s3 bucket.
 
+    Artifacts are uploaded concurrently and large artifacts are split into parts as per the upload options in the
+    project configuration. When the version is calculated from the latest version of the component, artifacts that are
+    unchanged from the latest version are copied within the bucket if unchanged artifacts are skipped. The progress of
+    multipart uploads is saved to checkpoints in the greengrass build directory so that an interrupted publish resumes
+    them.
+
     Raises an exception when the request is not successful.
 
     Parameters
@@ -57,23 +161,91 @@ def upload_artifacts_s3(component_name, component_version):
     """
     try:
         bucket = project_config["bucket"]
-        region = project_config["region"]
         logging.info(
             f"Uploading component artifacts to S3 bucket: {bucket}. If this is your first time using this bucket, add the"
             " 's3:GetObject' permission to each core device's token exchange role to allow it to download the component"
             f" artifacts. For more information, see {utils.doc_link_device_role}."
         )
 
-        create_bucket(bucket, region)
         build_component_artifacts = list(project_config["gg_build_component_artifacts_dir"].iterdir())
-        for artifact in build_component_artifacts:
-            s3_file_path = f"{component_name}/{component_version}/{artifact.name}"
-            logging.debug("Uploading artifact '{}' to the bucket '{}'.".format(artifact.resolve(), bucket))
-            service_clients["s3_client"].upload_file(str(artifact.resolve()), bucket, s3_file_path)
+        uploads = [
+            (artifact, f"{component_name}/{component_version}/{artifact.name}") for artifact in build_component_artifacts
+        ]
+        previous_keys = {}
+        latest_version = project_config.get("latest_component_version")
+        if latest_version:
+            previous_keys = {
+                s3_key: f"{component_name}/{latest_version}/{artifact.name}" for artifact, s3_key in uploads
+            }
+        checkpoint_dir = Path(project_config["gg_build_directory"]).joinpath(consts.upload_checkpoints_dir)
+        transfer_utils.upload_files(
+            service_clients["s3_client"], bucket, uploads, project_config["upload_options"], previous_keys, checkpoint_dir
+        )
     except Exception as e:
+        # The bucket is verified again in the next publish in case it was deleted.
+        cache_utils.remove_cached_bucket_region(project_config["bucket"])
         raise Exception("Error while uploading the artifacts to s3 during publish.\n{}".format(e))
 
 
+def prepare_artifacts_bucket(bucket, region):
+    """
+    Makes sure that the artifacts bucket exists in the region, creating it if it doesn't exist.
+
+    A bucket verified to exist in the region recently is used without any request. Otherwise, the bucket is checked with
+    a head request and stored in the bucket cache of the user once it is verified. The bucket is created only if it
+    doesn't exist, or if the head request is denied so that the create request reports why the bucket cannot be used.
+
+    Raises an exception if the bucket exists in a different region or cannot be created.
+
+    Parameters
+    ----------
+        bucket(string): Name of the artifacts bucket.
+        region(string): Region of the artifacts bucket.
+
+    Returns
+    -------
+        None
+    """
+    if cache_utils.get_cached_bucket_region(bucket) == region:
+        logging.debug("Using the artifacts bucket '{}' verified recently in the region '{}'.".format(bucket, region))
+        return
+    bucket_region = get_bucket_region(bucket)
+    if bucket_region is None:
+        create_bucket(bucket, region)
+    elif bucket_region != region:
+        logging.error("Cannot create the artifacts bucket '{}' as it is already owned by you in other region.".format(bucket))
+        raise Exception(
+            "The artifacts bucket '{}' exists in the region '{}' instead of '{}'.".format(bucket, bucket_region, region)
+        )
+    else:
+        logging.info("Not creating an artifacts bucket as it already exists.")
+    cache_utils.update_cached_bucket_region(bucket, region)
+
+
+def get_bucket_region(bucket):
+    """
+    Returns the region of the bucket using a head request.
+
+    Parameters
+    ----------
+        bucket(string): Name of the bucket.
+
+    Returns
+    -------
+        region(string): Region of the bucket. None if the bucket doesn't exist or the request is denied.
+    """
+    try:
+        response = service_clients["s3_client"].head_bucket(Bucket=bucket)
+    except ClientError as e:
+        # A bucket in another region responds with a redirect that includes its region.
+        bucket_region = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("x-amz-bucket-region")
+        if e.response.get("Error", {}).get("Code") in ["301", "PermanentRedirect"] and bucket_region:
+            return bucket_region
+        logging.debug("Could not find the bucket '{}'.\n{}".format(bucket, e))
+        return None
+    return response.get("BucketRegion") or response["ResponseMetadata"]["HTTPHeaders"].get("x-amz-bucket-region")
+
+
 def create_bucket(bucket, region):
     """
     Creates a new s3 bucket for artifacts if it doesn't exist already.
@@ -146,16 +318,18 @@ def create_gg_component(c_name, c_version):
 
     Returns
     -------
-        None
+        component_arn(string): ARN of the created component version.
     """
+    logging.info(f"Creating a new greengrass component {c_name}-{c_version}")
     publish_recipe_file = project_config["publish_recipe_file"]
     with open(publish_recipe_file) as f:
         try:
-            service_clients["greengrass_client"].create_component_version(inlineRecipe=f.read())
+            response = service_clients["greengrass_client"].create_component_version(inlineRecipe=f.read())
         except Exception as e:
             logging.error("Failed to create the component using the recipe at '{}'.".format(publish_recipe_file))
             raise Exception("Creating private version '{}' of the component '{}' failed.\n{}".format(c_version, c_name, e))
         logging.info("Created private version '{}' of the component in the account.'{}'.".format(c_version, c_name))
+        return response["arn"]
 
 
 def get_next_version():
@@ -185,36 +359,31 @@ def get_next_version():
             )
             return fallback_version
         logging.debug("Found latest version '{}' of the component '{}' in the account.".format(c_next_patch_version, c_name))
-        semver_alphanumeric = c_next_patch_version.split("-")
-        semver_numeric = semver_alphanumeric[0].split(".")
-        major = semver_numeric[0]
-        minor = semver_numeric[1]
-        patch = semver_numeric[2]
-        next_patch_version = int(patch) + 1
-        next_version = "{}.{}.{}".format(major, minor, str(next_patch_version))
+        project_config["latest_component_version"] = c_next_patch_version
+        next_version = version_utils.get_next_patch_version(c_next_patch_version)
         logging.info("Using '{}' as the next version of the component '{}' to create.".format(next_version, c_name))
         return next_version
     except Exception as e:
         raise Exception("Failed to calculate the next version of the component during publish.\n{}".format(e))
 
 
-def get_account_number():
+def get_account_number(refresh=False):
     """
     Uses STS client to get account number from the credentials provided using AWS cli.
 
-    Raises an exception when the request is unsuccessful.
+    The account number identified recently with the same credentials is reused from the local cache unless a refresh is
+    requested. Raises an exception when the request is unsuccessful.
 
     Parameters
     ----------
-        None
+        refresh(bool): Identifies the account with STS even if it is cached.
 
     Returns
     -------
         account_num: Returns account number.
     """
     try:
-        caller_identity_response = service_clients["sts_client"].get_caller_identity()
-        account_num = caller_identity_response["Account"]
+        account_num = project_utils.get_account_number(service_clients["sts_client"], refresh)
         logging.debug("Identified account number as '{}'.".format(account_num))
         return account_num
     except Exception as e:
@@ -223,26 +392,25 @@ def get_account_number():
 
 def get_next_patch_component_version(component_name, region, account_num):
     """
-    Gets highest version of the component from the sorted order of its versions from an account in a region.
+    Gets highest version of the component by semantic version precedence from an account in a region.
+
+    Pages through all the versions of the component in the account with the greengrass service client, unless the
+    versions are already resolved in this run of the CLI.
 
-    Makes a boto3 request with greengrass service client to list all versions of a component in an account.
     Parameters
     ----------
-        None
+        component_name(string): Name of the component.
+        region(string): Region of the component.
+        account_num(string): Account number of the component.
 
     Returns
     -------
-        version(string): Highest version of the component if it exists already. Else returns 1.0.0.
+        version(string): Highest version of the component if it exists already. Else None.
     """
 
     try:
-        comp_list_response = service_clients["greengrass_client"].list_component_versions(
-            arn="arn:aws:greengrass:{}:{}:components:{}".format(region, account_num, component_name)
-        )
-        component_versions = comp_list_response["componentVersions"]
-        if not component_versions:
-            return None
-        return component_versions[0]["componentVersion"]
+        component_arn = version_utils.get_component_arn(region, account_num, component_name)
+        return version_utils.get_latest_component_version(service_clients["greengrass_client"], component_arn)
     except Exception as e:
         raise Exception(
             "Error while getting the component versions of '{}' in '{}' from the account '{}' during publish.\n{}".format(
@@ -295,6 +463,29 @@ def update_and_create_recipe_file(component_name, component_version):
     -------
         None
     """
+    logging.info(f"Updating the component recipe {component_name}-{component_version}.")
+    parsed_component_recipe = get_publish_recipe(component_name, component_version)
+    if "Manifests" not in parsed_component_recipe:
+        logging.debug("No 'Manifests' key in the recipe.")
+        return
+    create_publish_recipe_file(component_name, component_version, parsed_component_recipe)
+
+
+def get_publish_recipe(component_name, component_version):
+    """
+    Returns the build recipe updated with the given component version and the s3 URIs of the artifacts of the version.
+
+    Raises an exception if the build recipe is of a different component or an artifact in it is not built.
+
+    Parameters
+    ----------
+        component_name(string): Name of the component.
+        component_version(string): Version of the component.
+
+    Returns
+    -------
+        parsed_component_recipe(dict): Publish recipe of the component version.
+    """
     logging.debug("Updating artifact URIs in the recipe...")
     build_recipe = Path(project_config["gg_build_recipes_dir"]).joinpath(project_config["component_recipe_file"].name)
     parsed_component_recipe = project_utils.parse_recipe_file(build_recipe)
@@ -309,10 +500,7 @@ def update_and_create_recipe_file(component_name, component_version):
     bucket = project_config["bucket"]
     artifact_uri = f"s3://{bucket}/{component_name}/{component_version}"
 
-    if "Manifests" not in parsed_component_recipe:
-        logging.debug("No 'Manifests' key in the recipe.")
-        return
-    for manifest in parsed_component_recipe["Manifests"]:
+    for manifest in parsed_component_recipe.get("Manifests", []):
         if "Artifacts" not in manifest:
             logging.debug("No 'Artifacts' key in the recipe manifest.")
             continue
@@ -337,7 +525,97 @@ def update_and_create_recipe_file(component_name, component_version):
 
     # Update the version of the component in the recipe
     parsed_component_recipe["ComponentVersion"] = component_version
-    create_publish_recipe_file(component_name, component_version, parsed_component_recipe)
+    return parsed_component_recipe
+
+
+def get_reusable_component_version(component_name):
+    """
+    Returns the ARN of the latest version of the component if publishing the component would create the same version.
+
+    The publish recipe of the latest version is fetched from the account and compared with the publish recipe that the
+    build creates for that version, using a hash of both recipes without the artifact digests added by the service. The
+    digests of the artifacts in the fetched recipe are then compared with the digests of the built artifacts.
+
+    The latest version is known only if the version of the component is 'NEXT_PATCH'. Any failure to compare the
+    versions is logged and treated as a change.
+
+    Parameters
+    ----------
+        component_name(string): Name of the component to publish.
+
+    Returns
+    -------
+        component_arn(string): ARN of the latest version of the component if it is unchanged. Else None.
+    """
+    latest_version = project_config.get("latest_component_version")
+    if not latest_version:
+        return None
+    component_arn = version_utils.get_component_version_arn(
+        project_config["region"], project_config["account_number"], component_name, latest_version
+    )
+    try:
+        response = service_clients["greengrass_client"].get_component(arn=component_arn, recipeOutputFormat="JSON")
+        latest_recipe = json.loads(response["recipe"])
+        publish_recipe = get_publish_recipe(component_name, latest_version)
+        if get_recipe_hash(publish_recipe) != get_recipe_hash(latest_recipe):
+            logging.debug("The recipe of the component '{}' has changed since '{}'.".format(component_name, latest_version))
+            return None
+        artifacts_dir = project_config["gg_build_component_artifacts_dir"]
+        artifact_digests = {
+            artifact["URI"]: get_artifact_digest(artifacts_dir.joinpath(Path(artifact["URI"]).name))
+            for artifact in _get_s3_artifacts(publish_recipe)
+        }
+        latest_digests = {artifact["URI"]: artifact.get("Digest") for artifact in _get_s3_artifacts(latest_recipe)}
+        if artifact_digests != latest_digests:
+            logging.debug(
+                "The artifacts of the component '{}' have changed since '{}'.".format(component_name, latest_version)
+            )
+            return None
+    except Exception as e:
+        logging.debug("Could not compare the component with its latest version '{}'.\n{}".format(latest_version, e))
+        return None
+    logging.info(
+        "The component '{}' is unchanged since its latest version '{}'. Using it instead of creating a new version.".format(
+            component_name, latest_version
+        )
+    )
+    return component_arn
+
+
+def get_recipe_hash(parsed_component_recipe):
+    """
+    Returns a hash of the recipe that doesn't depend on the order of its keys or the artifact digests in it.
+
+    Parameters
+    ----------
+        parsed_component_recipe(dict): Recipe of the component.
+
+    Returns
+    -------
+        (string): Hex sha256 digest of the canonical json of the recipe.
+    """
+    normalized_recipe = copy.deepcopy(parsed_component_recipe)
+    for manifest in normalized_recipe.get("Manifests", []):
+        for artifact in manifest.get("Artifacts", []):
+            # The service adds the digest of each artifact to the recipe of the component version.
+            artifact.pop("Digest", None)
+            artifact.pop("Algorithm", None)
+    canonical_recipe = json.dumps(normalized_recipe, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical_recipe.encode()).hexdigest()
+
+
+def get_artifact_digest(artifact_file):
+    """
+    Returns the base64 encoded sha256 digest of the artifact, in the format of the artifact digests in the recipes.
+    """
+    return base64.b64encode(utils.get_file_hash(artifact_file).digest()).decode()
+
+
+def _get_s3_artifacts(parsed_component_recipe):
+    for manifest in parsed_component_recipe.get("Manifests", []):
+        for artifact in manifest.get("Artifacts", []):
+            if artifact.get("URI", "").startswith("s3://"):
+                yield artifact
 
 
 def create_publish_recipe_file(component_name, component_version, parsed_component_recipe):
@@ -370,10 +648,11 @@ def create_publish_recipe_file(component_name, component_version, parsed_compone
             if publish_recipe_file_name.endswith(".json"):
                 prf.write(json.dumps(parsed_component_recipe, indent=4))
             else:
-                yaml.dump(parsed_component_recipe, prf)
+                recipe_utils.dump_yaml_recipe(parsed_component_recipe, prf)
         except Exception as e:
             raise Exception("""Failed to create publish recipe file at '{}'.\n{}""".format(publish_recipe_file, e))
 
 
-project_config = project_utils.get_project_config_values()
-service_clients = project_utils.get_service_clients(project_config["region"])
+# Views of the command context. The project configuration is loaded and the clients are created on their first use.
+project_config = command_context.project_config
+service_clients = command_context.service_clients
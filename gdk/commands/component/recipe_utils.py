@@ -0,0 +1,71 @@
+import logging
+
+# Line width of the yaml recipes. Long scalars are not folded since the libyaml and the pure python emitters fold them
+# differently.
+YAML_LINE_WIDTH = 2**31 - 1
+
+
+def load_yaml_recipe(recipe):
+    """
+    Parses the content of a yaml recipe file.
+
+    The recipe is parsed with the libyaml based safe loader when PyYAML is built with it, and with the pure python safe
+    loader otherwise. Both load the same objects as yaml.safe_load.
+
+    Parameters
+    ----------
+        recipe(string): Content of the yaml recipe file.
+
+    Returns
+    -------
+        (dict): Parsed recipe.
+    """
+    import yaml
+
+    return yaml.load(recipe, Loader=get_yaml_loader())
+
+
+def dump_yaml_recipe(parsed_recipe, stream):
+    """
+    Writes the recipe as yaml to the given stream.
+
+    The recipe is written with the libyaml based safe dumper when PyYAML is built with it, and with the pure python safe
+    dumper otherwise. Both produce the same output for recipes, which contain only mappings, sequences and scalars, as
+    long scalars are written on a single line.
+
+    Parameters
+    ----------
+        parsed_recipe(dict): Recipe to write.
+        stream(file): Text stream to write the recipe to.
+
+    Returns
+    -------
+        None
+    """
+    import yaml
+
+    yaml.dump(parsed_recipe, stream, Dumper=get_yaml_dumper(), width=YAML_LINE_WIDTH)
+
+
+def get_yaml_loader():
+    """
+    Returns the libyaml based safe loader if it is available. Else, the pure python safe loader.
+    """
+    import yaml
+
+    if yaml.__with_libyaml__:
+        return yaml.CSafeLoader
+    logging.debug("LibYAML is not available. Using the pure python yaml loader.")
+    return yaml.SafeLoader
+
+
+def get_yaml_dumper():
+    """
+    Returns the libyaml based safe dumper if it is available. Else, the pure python safe dumper.
+    """
+    import yaml
+
+    if yaml.__with_libyaml__:
+        return yaml.CSafeDumper
+    logging.debug("LibYAML is not available. Using the pure python yaml dumper.")
+    return yaml.SafeDumper
@@ -0,0 +1,182 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def run_tasks(tasks, max_workers=None):
+    """
+    Runs the tasks on a pool of threads, starting each task as soon as all the tasks it depends on are complete.
+
+    Each task function is called with the results of the tasks completed before it, by their names. Tasks that don't
+    depend on each other run concurrently. When a task fails, no more tasks are started and the exception of the failed
+    task is raised after the running tasks are complete. If more than one task fails, the exception of the task that comes
+    first in the tasks is raised.
+
+    Parameters
+    ----------
+        tasks(dict): Tuple (function, dependencies) of each task by its name, where dependencies is a list of the names
+            of the tasks that must be complete before the task starts.
+        max_workers(int): Maximum number of tasks that run concurrently. Defaults to the number of tasks.
+
+    Returns
+    -------
+        results(dict): Result of each task by its name.
+        timings(dict): Tuple (start, seconds) of each task by its name, where start is the seconds from the start of the
+            first task.
+    """
+    results = {}
+    timings = {}
+    errors = {}
+    start = time.perf_counter()
+
+    def get_task(name):
+        return _run_task, (name, tasks[name][0], dict(results), start, timings)
+
+    def complete_task(name, future):
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            errors[name] = e
+        # No more tasks are started once a task fails.
+        return not errors
+
+    dependencies = {name: task_dependencies for name, (_, task_dependencies) in tasks.items()}
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(tasks))) as executor:
+        schedule_tasks(executor, dependencies, get_task, complete_task)
+    if errors:
+        raise next(errors[name] for name in tasks if name in errors)
+    return results, timings
+
+
+def schedule_tasks(executor, dependencies, get_task, complete_task):
+    """
+    Runs the tasks on the executor, starting each task as soon as all the tasks it depends on are complete.
+
+    The tasks are started in the order of the dependencies. A task is complete without running on the executor when it
+    has nothing to run (Eg. it is skipped), so that the tasks that depend on it can start right away.
+
+    Raises an exception if a task depends on an unknown task or if the dependencies form a cycle.
+
+    Parameters
+    ----------
+        executor(concurrent.futures.Executor): Thread or process pool that the tasks run on.
+        dependencies(dict): Names of the tasks that each task depends on, by its name.
+        get_task(function): Called with the name of each task when it is ready to start. Returns a tuple (function,
+            args) that runs the task on the executor, or None if the task has nothing to run.
+        complete_task(function): Called with the name and the future of each task that completes on the executor.
+            Returns False to start no more tasks, in which case the running tasks still complete.
+
+    Returns
+    -------
+        None
+    """
+    _check_dependencies(dependencies)
+    pending = list(dependencies)
+    completed = set()
+    running = {}
+    while pending or running:
+        _start_ready_tasks(executor, dependencies, get_task, pending, completed, running)
+        if not running:
+            break
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            completed.add(name)
+            if not complete_task(name, future):
+                pending = []
+
+
+def _start_ready_tasks(executor, dependencies, get_task, pending, completed, running):
+    # Tasks with nothing to run complete right away, which can make the tasks that depend on them ready too.
+    ready = _get_ready_tasks(dependencies, pending, completed)
+    while ready:
+        for name in ready:
+            pending.remove(name)
+            task = get_task(name)
+            if task is None:
+                completed.add(name)
+            else:
+                function, args = task
+                running[executor.submit(function, *args)] = name
+        ready = _get_ready_tasks(dependencies, pending, completed)
+
+
+def _run_task(name, function, completed_results, start, timings):
+    task_start = time.perf_counter()
+    try:
+        return function(completed_results)
+    finally:
+        timings[name] = (task_start - start, time.perf_counter() - task_start)
+        logging.debug("Completed the task '{}' in {:.2f}s.".format(name, timings[name][1]))
+
+
+def _get_ready_tasks(dependencies, pending, completed):
+    return [name for name in pending if all(dependency in completed for dependency in dependencies[name])]
+
+
+def log_task_timings(description, timings):
+    """
+    Logs the time taken by each task in the order they started, along with the total time taken by the tasks.
+
+    Parameters
+    ----------
+        description(string): Description of the tasks. Eg. 'Publish steps'
+        timings(dict): Tuple (start, seconds) of each task by its name, where start is the seconds from the start of the
+            first task.
+
+    Returns
+    -------
+        None
+    """
+    if not timings:
+        return
+    total = max(start + seconds for start, seconds in timings.values())
+    steps = ", ".join(
+        "{} {:.2f}s".format(name, seconds) for name, (start, seconds) in sorted(timings.items(), key=lambda t: t[1][0])
+    )
+    logging.info("{} completed in {:.2f}s: {}.".format(description, total, steps))
+
+
+def get_dependency_cycle(dependencies):
+    """
+    Finds a cycle in the dependencies of the tasks.
+
+    Parameters
+    ----------
+        dependencies(dict): Names of the tasks that each task depends on, by its name.
+
+    Returns
+    -------
+        cycle(list): Names of the tasks on the cycle, starting and ending with the same task. None if there is no cycle.
+    """
+    # Depth first search for a path that leads back to a task on it.
+    visited = set()
+
+    def visit(name, path):
+        if name in path:
+            cycle_start = path.index(name)
+            return path[cycle_start:] + [name]
+        if name in visited:
+            return None
+        visited.add(name)
+        for dependency in dependencies[name]:
+            cycle = visit(dependency, path + [name])
+            if cycle:
+                return cycle
+        return None
+
+    for name in dependencies:
+        cycle = visit(name, [])
+        if cycle:
+            return cycle
+    return None
+
+
+def _check_dependencies(dependencies):
+    for name, task_dependencies in dependencies.items():
+        unknown = [dependency for dependency in task_dependencies if dependency not in dependencies]
+        if unknown:
+            raise Exception("The task '{}' depends on unknown tasks: {}.".format(name, ", ".join(unknown)))
+    cycle = get_dependency_cycle(dependencies)
+    if cycle:
+        raise Exception("The tasks depend on each other in a cycle: {}.".format(" -> ".join(cycle)))
@@ -0,0 +1,490 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import gdk.common.utils as utils
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+MB = 1024 * 1024
+CHECKSUM_METADATA_KEY = "gdk-sha256"
+# Limits of the parts of an s3 multipart upload.
+MIN_PART_SIZE = 5 * MB
+MAX_PART_SIZE = 5 * 1024 * MB
+MAX_PARTS = 10000
+
+
+def upload_files(s3_client, bucket, uploads, upload_options, previous_keys=None, checkpoint_dir=None):
+    """
+    Uploads the given files to the s3 bucket concurrently.
+
+    Files are uploaded on a pool of threads sized by the 'max_concurrency' upload option. Each file larger than the
+    'part_size_mb' upload option is split into parts of that size which are uploaded concurrently as a multipart upload.
+    The threads left over after the files in flight are shared among their parts so that the total number of
+    concurrent requests does not exceed 'max_concurrency'.
+
+    When the 'skip_unchanged' upload option is set, each file is hashed and compared with the object already in the
+    bucket at the same key. Files that match the object are not uploaded again. A file that doesn't match the object at
+    its key but matches the object at its previous key (eg. the same artifact of the previous component version) is copied
+    within the bucket instead of being uploaded.
+
+    When the 'resumable' upload option is set and a checkpoint directory is given, multipart uploads save their progress
+    to checkpoints so that an interrupted upload continues from its last uploaded part in the next run. Interrupted
+    uploads older than the 'stale_upload_ttl_hours' upload option are aborted first.
+
+    Raises an exception if any of the uploads fails.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to upload the files.
+        bucket(string): Name of the bucket to upload the files to.
+        uploads(list): List of tuples (file_path, s3_key) of the files to upload.
+        upload_options(dict): Upload options of the component artifacts.
+        previous_keys(dict): Optional mapping of the s3 key of a file to its previous key in the bucket.
+        checkpoint_dir(Path): Optional directory of the checkpoints of the multipart uploads.
+
+    Returns
+    -------
+        summaries(list): List of dictionaries with the name, size, upload time and skipped status of each file.
+    """
+    previous_keys = previous_keys or {}
+    if not upload_options["resumable"]:
+        checkpoint_dir = None
+    if checkpoint_dir:
+        abort_stale_uploads(s3_client, checkpoint_dir, upload_options["stale_upload_ttl_hours"])
+    if not uploads:
+        return []
+    max_concurrency = upload_options["max_concurrency"]
+    file_workers = min(max_concurrency, len(uploads))
+    transfer_config = get_transfer_config(upload_options["part_size_mb"], max(1, max_concurrency // file_workers))
+    logging.debug("Uploading {} files with {} concurrent uploads.".format(len(uploads), file_workers))
+    with ThreadPoolExecutor(max_workers=file_workers) as executor:
+        futures = [
+            executor.submit(
+                upload_file,
+                s3_client,
+                bucket,
+                file_path,
+                s3_key,
+                transfer_config,
+                upload_options["skip_unchanged"],
+                previous_keys.get(s3_key),
+                checkpoint_dir,
+            )
+            for file_path, s3_key in uploads
+        ]
+        summaries = [future.result() for future in futures]
+    if upload_options["throughput_summary"]:
+        log_throughput_summary(summaries)
+    if upload_options["skip_unchanged"]:
+        log_skipped_summary(summaries)
+    return summaries
+
+
+def upload_file(
+    s3_client, bucket, file_path, s3_key, transfer_config, skip_unchanged=False, previous_key=None, checkpoint_dir=None
+):
+    """
+    Uploads a single file to the s3 bucket with the given transfer configuration.
+
+    If skip_unchanged is set, the file is not uploaded when its content matches the object already in the bucket. When
+    it only matches the object at the previous key, that object is copied to the key within the bucket. The sha256
+    checksum of the uploaded file is stored in the object metadata for the comparison in later uploads. A file uploaded in
+    multiple parts is uploaded as a resumable upload when a checkpoint directory is given.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to upload the file.
+        bucket(string): Name of the bucket to upload the file to.
+        file_path(Path): Path of the file to upload.
+        s3_key(string): Key of the object in the bucket.
+        transfer_config(boto3.s3.transfer.TransferConfig): Multipart configuration of the upload.
+        skip_unchanged(bool): Skips the upload if the file content matches the object in the bucket.
+        previous_key(string): Key of the object to copy from if the file content matches it.
+        checkpoint_dir(Path): Directory of the checkpoints of the multipart uploads.
+
+    Returns
+    -------
+        summary(dict): Name, size in bytes, upload time in seconds and skipped status of the file.
+    """
+    file_path = file_path.resolve()
+    size = file_path.stat().st_size
+    start = time.perf_counter()
+    extra_args = {}
+    if skip_unchanged:
+        part_size = get_part_size(transfer_config.multipart_chunksize, size)
+        digests = get_file_digests(file_path, transfer_config.multipart_threshold, part_size)
+        if is_object_unchanged(s3_client, bucket, s3_key, digests):
+            logging.debug("Skipping upload of artifact '{}' as it is unchanged in the bucket '{}'.".format(file_path, bucket))
+            return {"name": file_path.name, "size": size, "seconds": time.perf_counter() - start, "skipped": True}
+        if previous_key and is_object_unchanged(s3_client, bucket, previous_key, digests):
+            logging.debug("Copying unchanged artifact '{}' from '{}' within the bucket.".format(file_path, previous_key))
+            s3_client.copy({"Bucket": bucket, "Key": previous_key}, bucket, s3_key, Config=transfer_config)
+            return {"name": file_path.name, "size": size, "seconds": time.perf_counter() - start, "skipped": True}
+        extra_args["Metadata"] = {CHECKSUM_METADATA_KEY: digests["sha256"]}
+    logging.debug("Uploading artifact '{}' to the bucket '{}'.".format(file_path, bucket))
+    if checkpoint_dir and size >= transfer_config.multipart_threshold:
+        upload_file_resumable(s3_client, bucket, file_path, s3_key, transfer_config, extra_args, checkpoint_dir)
+    else:
+        s3_client.upload_file(str(file_path), bucket, s3_key, ExtraArgs=extra_args or None, Config=transfer_config)
+    return {"name": file_path.name, "size": size, "seconds": time.perf_counter() - start, "skipped": False}
+
+
+def upload_file_resumable(s3_client, bucket, file_path, s3_key, transfer_config, extra_args, checkpoint_dir):
+    """
+    Uploads a file to the s3 bucket in multiple parts, saving the progress of the upload to a checkpoint.
+
+    The upload id and the ETag of each uploaded part are saved to a checkpoint file of the object as soon as the part is
+    uploaded. If the checkpoint of an earlier upload of the same file exists, the parts that are still in the upload are
+    not uploaded again. An earlier upload of a file that has changed since is aborted and the file is uploaded from its
+    first part. The checkpoint is removed once the upload is complete.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to upload the file.
+        bucket(string): Name of the bucket to upload the file to.
+        file_path(Path): Path of the file to upload.
+        s3_key(string): Key of the object in the bucket.
+        transfer_config(boto3.s3.transfer.TransferConfig): Multipart configuration of the upload.
+        extra_args(dict): Extra arguments of the upload. Eg. the object metadata.
+        checkpoint_dir(Path): Directory of the checkpoints of the multipart uploads.
+
+    Returns
+    -------
+        None
+    """
+    stat = file_path.stat()
+    checkpoint_file = get_checkpoint_file(checkpoint_dir, bucket, s3_key)
+    upload = {
+        "bucket": bucket,
+        "key": s3_key,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "part_size": get_part_size(transfer_config.multipart_chunksize, stat.st_size),
+        "extra_args": extra_args,
+    }
+    checkpoint = _read_checkpoint(checkpoint_file)
+    if checkpoint and any(checkpoint.get(name) != value for name, value in upload.items()):
+        logging.debug("Aborting the earlier upload of '{}' as the file has changed.".format(file_path))
+        abort_upload(s3_client, checkpoint_file, checkpoint)
+        checkpoint = None
+    if checkpoint:
+        uploaded_parts = get_uploaded_parts(s3_client, checkpoint)
+        if uploaded_parts is None:
+            checkpoint = None
+        else:
+            checkpoint["parts"] = uploaded_parts
+            logging.info("Resuming the upload of '{}' after {} uploaded parts.".format(file_path.name, len(uploaded_parts)))
+    if not checkpoint:
+        response = s3_client.create_multipart_upload(Bucket=bucket, Key=s3_key, **extra_args)
+        checkpoint = dict(upload, upload_id=response["UploadId"], created_at=time.time(), parts={})
+    _write_checkpoint(checkpoint_file, checkpoint)
+
+    part_size = upload["part_size"]
+    part_count = max(1, -(-upload["size"] // part_size))
+    pending_parts = [number for number in range(1, part_count + 1) if str(number) not in checkpoint["parts"]]
+    lock = threading.Lock()
+
+    def upload_part(part_number):
+        with open(file_path, "rb") as f:
+            f.seek((part_number - 1) * part_size)
+            body = f.read(part_size)
+        response = s3_client.upload_part(
+            Bucket=bucket, Key=s3_key, UploadId=checkpoint["upload_id"], PartNumber=part_number, Body=body
+        )
+        with lock:
+            checkpoint["parts"][str(part_number)] = response["ETag"]
+            _write_checkpoint(checkpoint_file, checkpoint)
+
+    if pending_parts:
+        with ThreadPoolExecutor(max_workers=min(transfer_config.max_concurrency, len(pending_parts))) as executor:
+            # Raises the error of the first failed part after the other parts are uploaded.
+            list(executor.map(upload_part, pending_parts))
+
+    parts = [{"PartNumber": int(number), "ETag": etag} for number, etag in checkpoint["parts"].items()]
+    s3_client.complete_multipart_upload(
+        Bucket=bucket,
+        Key=s3_key,
+        UploadId=checkpoint["upload_id"],
+        MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+    )
+    _remove_checkpoint(checkpoint_file)
+
+
+def get_uploaded_parts(s3_client, checkpoint):
+    """
+    Returns the parts of the upload in the checkpoint that are still in the multipart upload with the same ETag.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to list the parts of the upload.
+        checkpoint(dict): Checkpoint of the multipart upload.
+
+    Returns
+    -------
+        uploaded_parts(dict): ETag of each uploaded part by its part number. None if the upload doesn't exist anymore.
+    """
+    listed_parts = {}
+    try:
+        paginator = s3_client.get_paginator("list_parts")
+        pages = paginator.paginate(Bucket=checkpoint["bucket"], Key=checkpoint["key"], UploadId=checkpoint["upload_id"])
+        for page in pages:
+            listed_parts.update({str(part["PartNumber"]): part["ETag"] for part in page.get("Parts", [])})
+    except ClientError as e:
+        logging.debug("Could not resume the upload of '{}'.\n{}".format(checkpoint["key"], e))
+        return None
+    return {number: etag for number, etag in checkpoint.get("parts", {}).items() if listed_parts.get(number) == etag}
+
+
+def abort_stale_uploads(s3_client, checkpoint_dir, ttl_hours):
+    """
+    Aborts the multipart uploads in the checkpoint directory that were started more than the given hours ago.
+
+    The parts of an aborted upload are deleted from the bucket so that an interrupted upload that is not resumed doesn't
+    keep costing storage.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to abort the uploads.
+        checkpoint_dir(Path): Directory of the checkpoints of the multipart uploads.
+        ttl_hours(float): Hours after which an upload is stale.
+
+    Returns
+    -------
+        None
+    """
+    if not checkpoint_dir.is_dir():
+        return
+    stale_time = time.time() - ttl_hours * 3600
+    for checkpoint_file in sorted(checkpoint_dir.glob("*.json")):
+        checkpoint = _read_checkpoint(checkpoint_file)
+        if checkpoint is None:
+            _remove_checkpoint(checkpoint_file)
+        elif checkpoint.get("created_at", 0) < stale_time:
+            bucket, s3_key = checkpoint["bucket"], checkpoint["key"]
+            logging.info("Aborting the stale upload of '{}' to the bucket '{}'.".format(s3_key, bucket))
+            abort_upload(s3_client, checkpoint_file, checkpoint)
+
+
+def abort_upload(s3_client, checkpoint_file, checkpoint):
+    """
+    Aborts the multipart upload in the checkpoint and removes the checkpoint.
+
+    The checkpoint is kept if the upload cannot be aborted, so that aborting it is retried in a later run.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to abort the upload.
+        checkpoint_file(Path): Path of the checkpoint file.
+        checkpoint(dict): Checkpoint of the multipart upload.
+
+    Returns
+    -------
+        None
+    """
+    try:
+        s3_client.abort_multipart_upload(Bucket=checkpoint["bucket"], Key=checkpoint["key"], UploadId=checkpoint["upload_id"])
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in ["NoSuchUpload", "NoSuchBucket"]:
+            logging.debug("Could not abort the upload of '{}'.\n{}".format(checkpoint["key"], e))
+            return
+    _remove_checkpoint(checkpoint_file)
+
+
+def get_checkpoint_file(checkpoint_dir, bucket, s3_key):
+    """
+    Returns the path of the checkpoint file of the multipart upload of an object.
+    """
+    name = hashlib.sha256("{}/{}".format(bucket, s3_key).encode()).hexdigest()
+    return Path(checkpoint_dir).joinpath("{}.json".format(name))
+
+
+def _read_checkpoint(checkpoint_file):
+    if not checkpoint_file.is_file():
+        return None
+    try:
+        with open(checkpoint_file, "r") as f:
+            checkpoint = json.loads(f.read())
+        if isinstance(checkpoint, dict) and all(name in checkpoint for name in ["bucket", "key", "upload_id"]):
+            return checkpoint
+    except Exception as e:
+        logging.debug("Ignoring the invalid upload checkpoint '{}'.\n{}".format(checkpoint_file, e))
+    return None
+
+
+def _write_checkpoint(checkpoint_file, checkpoint):
+    utils.write_json_atomic(checkpoint_file, checkpoint)
+
+
+def _remove_checkpoint(checkpoint_file):
+    try:
+        checkpoint_file.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_part_size(multipart_chunksize, file_size):
+    """
+    Returns the size of the parts of a multipart upload of the file within the limits of s3.
+
+    The part size is doubled until the file fits in the maximum number of parts and is then kept between the minimum and
+    the maximum part size, in the same way as the managed uploads of boto3.
+
+    Parameters
+    ----------
+        multipart_chunksize(int): Size in bytes of each part as per the transfer configuration.
+        file_size(int): Size in bytes of the file.
+
+    Returns
+    -------
+        part_size(int): Size in bytes of each part of the upload.
+    """
+    part_size = multipart_chunksize
+    while -(-file_size // part_size) > MAX_PARTS:
+        part_size *= 2
+    return min(max(part_size, MIN_PART_SIZE), MAX_PART_SIZE)
+
+
+def get_file_digests(file_path, multipart_threshold, multipart_chunksize):
+    """
+    Hashes the file in a single streaming pass.
+
+    Along with the sha256 checksum of the file, calculates the ETag that s3 assigns to the object when the file is
+    uploaded with the given multipart configuration. This is the md5 of the file for single part uploads and the md5 of
+    the concatenated part md5s followed by the number of parts for multipart uploads.
+
+    Parameters
+    ----------
+        file_path(Path): Path of the file to hash.
+        multipart_threshold(int): Size in bytes from which the file is uploaded in multiple parts.
+        multipart_chunksize(int): Size in bytes of each part of a multipart upload, as adjusted by get_part_size.
+
+    Returns
+    -------
+        digests(dict): Hex sha256 checksum and the expected s3 ETag of the file.
+    """
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    part_md5s = []
+    part = hashlib.md5()
+    part_size = 0
+    size = 0
+    for chunk in utils.read_file_chunks(file_path):
+        sha256.update(chunk)
+        md5.update(chunk)
+        size += len(chunk)
+        start = 0
+        while start < len(chunk):
+            end = min(len(chunk), start + multipart_chunksize - part_size)
+            part.update(chunk[start:end])
+            part_size += end - start
+            start = end
+            if part_size == multipart_chunksize:
+                part_md5s.append(part.digest())
+                part = hashlib.md5()
+                part_size = 0
+    if part_size:
+        part_md5s.append(part.digest())
+
+    if size < multipart_threshold:
+        etag = md5.hexdigest()
+    else:
+        etag = "{}-{}".format(hashlib.md5(b"".join(part_md5s)).hexdigest(), len(part_md5s))
+    return {"sha256": sha256.hexdigest(), "etag": etag}
+
+
+def is_object_unchanged(s3_client, bucket, s3_key, digests):
+    """
+    Checks if the object in the bucket has the same content as the file with the given digests.
+
+    The sha256 checksum stored in the object metadata is compared when it exists. Otherwise, the ETag of the object is
+    compared with the ETag expected for the file.
+
+    Parameters
+    ----------
+        s3_client(boto3.client): S3 client used to fetch the object metadata.
+        bucket(string): Name of the bucket.
+        s3_key(string): Key of the object in the bucket.
+        digests(dict): Hex sha256 checksum and the expected s3 ETag of the file.
+
+    Returns
+    -------
+        (bool): True if the object exists and has the same content as the file. Else False.
+    """
+    try:
+        response = s3_client.head_object(Bucket=bucket, Key=s3_key)
+    except ClientError as e:
+        logging.debug("Could not fetch the object '{}' from the bucket '{}'.\n{}".format(s3_key, bucket, e))
+        return False
+    stored_checksum = response.get("Metadata", {}).get(CHECKSUM_METADATA_KEY)
+    if stored_checksum:
+        return stored_checksum == digests["sha256"]
+    return response.get("ETag", "").strip('"') == digests["etag"]
+
+
+def get_transfer_config(part_size_mb, max_concurrency):
+    """
+    Creates the transfer configuration used by the s3 client to split a file into parts and upload them concurrently.
+
+    Parameters
+    ----------
+        part_size_mb(int): Size of each part in MB. Files larger than this size are uploaded in multiple parts.
+        max_concurrency(int): Maximum number of parts of a file uploaded concurrently.
+
+    Returns
+    -------
+        transfer_config(boto3.s3.transfer.TransferConfig): Multipart configuration of the upload.
+    """
+    part_size = part_size_mb * MB
+    return TransferConfig(
+        multipart_threshold=part_size, multipart_chunksize=part_size, max_concurrency=max_concurrency, use_threads=True
+    )
+
+
+def log_throughput_summary(summaries):
+    """
+    Logs the size, upload time and throughput of each uploaded file.
+
+    Parameters
+    ----------
+        summaries(list): List of dictionaries with the name, size and upload time of each uploaded file.
+
+    Returns
+    -------
+        None
+    """
+    for summary in summaries:
+        if summary["skipped"]:
+            logging.info("Skipped '{}' as it is unchanged in the bucket.".format(summary["name"]))
+            continue
+        size_mb = summary["size"] / MB
+        seconds = summary["seconds"]
+        throughput = size_mb / seconds if seconds > 0 else 0
+        logging.info(
+            "Uploaded '{}' ({:.2f} MB) in {:.2f}s at {:.2f} MB/s.".format(summary["name"], size_mb, seconds, throughput)
+        )
+
+
+def log_skipped_summary(summaries):
+    """
+    Logs the number of files skipped as they are unchanged in the bucket and the bytes saved from uploading them.
+
+    Parameters
+    ----------
+        summaries(list): List of dictionaries with the name, size, upload time and skipped status of each file.
+
+    Returns
+    -------
+        None
+    """
+    skipped = [summary for summary in summaries if summary["skipped"]]
+    saved_mb = sum(summary["size"] for summary in skipped) / MB
+    logging.info(
+        "Skipped uploading {} of {} artifacts as they are unchanged in the bucket. Saved {:.2f} MB of uploads.".format(
+            len(skipped), len(summaries), saved_mb
+        )
+    )
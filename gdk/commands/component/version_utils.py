@@ -0,0 +1,157 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Semantic version with optional pre-release and build metadata. Eg. 1.0.0, 1.0.0-beta.1+build.5
+SEMVER_PATTERN = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+# Number of components whose versions are listed concurrently.
+MAX_CONCURRENT_LOOKUPS = 10
+
+
+def get_component_arn(region, account_num, component_name):
+    """
+    Returns the ARN of a private component in an account in a region.
+    """
+    return "arn:aws:greengrass:{}:{}:components:{}".format(region, account_num, component_name)
+
+
+def get_component_version_arn(region, account_num, component_name, component_version):
+    """
+    Returns the ARN of a version of a private component in an account in a region.
+    """
+    return "{}:versions:{}".format(get_component_arn(region, account_num, component_name), component_version)
+
+
+def get_semver_key(version):
+    """
+    Returns a key that orders versions by semantic version precedence.
+
+    Versions are ordered by the major, minor and patch numbers and then by their pre-release identifiers. A pre-release
+    version has a lower precedence than the release version, numeric identifiers have a lower precedence than
+    alphanumeric ones and the build metadata is ignored. Eg. 1.0.0-alpha < 1.0.0-alpha.1 < 1.0.0-beta < 1.0.0 < 1.0.10
+
+    Raises an exception if the version is not a semantic version.
+
+    Parameters
+    ----------
+        version(string): Semantic version.
+
+    Returns
+    -------
+        (tuple): Sort key of the version.
+    """
+    match = SEMVER_PATTERN.match(version)
+    if not match:
+        raise Exception("Invalid semantic version '{}'.".format(version))
+    major, minor, patch, prerelease = match.groups()
+    if prerelease is None:
+        prerelease_key = (1,)
+    else:
+        identifiers = prerelease.split(".")
+        prerelease_key = (0,) + tuple((0, int(i), "") if i.isdigit() else (1, 0, i) for i in identifiers)
+    return (int(major), int(minor), int(patch), prerelease_key)
+
+
+def get_next_patch_version(version):
+    """
+    Returns the next patch version of a semantic version, without its pre-release and build metadata.
+
+    Parameters
+    ----------
+        version(string): Semantic version. Eg. 1.0.6-beta
+
+    Returns
+    -------
+        (string): Next patch version. Eg. 1.0.7
+    """
+    major, minor, patch, _ = get_semver_key(version)
+    return "{}.{}.{}".format(major, minor, patch + 1)
+
+
+def list_component_versions(greengrass_client, component_arn):
+    """
+    Lists all the versions of a private component by paging through the component versions in the account.
+
+    Parameters
+    ----------
+        greengrass_client(boto3.client): GreengrassV2 client of the region of the component.
+        component_arn(string): ARN of the component.
+
+    Returns
+    -------
+        versions(list): Versions of the component.
+    """
+    paginator = greengrass_client.get_paginator("list_component_versions")
+    versions = []
+    for page in paginator.paginate(arn=component_arn):
+        versions.extend(component_version["componentVersion"] for component_version in page["componentVersions"])
+    return versions
+
+
+def get_latest_component_version(greengrass_client, component_arn):
+    """
+    Returns the highest version of a private component by semantic version precedence.
+
+    The versions of a component are listed once per run of the CLI and the result is reused.
+
+    Parameters
+    ----------
+        greengrass_client(boto3.client): GreengrassV2 client of the region of the component.
+        component_arn(string): ARN of the component.
+
+    Returns
+    -------
+        version(string): Highest version of the component if it exists. Else None.
+    """
+    return get_latest_component_versions(greengrass_client, [component_arn])[component_arn]
+
+
+def get_latest_component_versions(greengrass_client, component_arns):
+    """
+    Returns the highest versions of many private components in one batch.
+
+    The versions of the components that are not resolved already in this run are listed concurrently.
+
+    Parameters
+    ----------
+        greengrass_client(boto3.client): GreengrassV2 client of the region of the components.
+        component_arns(list): ARNs of the components.
+
+    Returns
+    -------
+        latest_versions(dict): Highest version of each component by its ARN. None if the component doesn't exist.
+    """
+    unresolved_arns = [arn for arn in dict.fromkeys(component_arns) if arn not in _latest_versions]
+    if unresolved_arns:
+        logging.debug("Listing the versions of {} components.".format(len(unresolved_arns)))
+        with ThreadPoolExecutor(max_workers=min(len(unresolved_arns), MAX_CONCURRENT_LOOKUPS)) as executor:
+            component_versions = executor.map(lambda arn: list_component_versions(greengrass_client, arn), unresolved_arns)
+            for arn, versions in zip(unresolved_arns, component_versions):
+                _latest_versions[arn] = _get_highest_version(arn, versions)
+    return {arn: _latest_versions[arn] for arn in component_arns}
+
+
+def cache_latest_component_versions(latest_versions):
+    """
+    Stores the highest versions of components resolved elsewhere in this run, so that they are not listed again.
+
+    Parameters
+    ----------
+        latest_versions(dict): Highest version of each component by its ARN. None if the component doesn't exist.
+
+    Returns
+    -------
+        None
+    """
+    _latest_versions.update(latest_versions)
+
+
+def _get_highest_version(component_arn, versions):
+    semantic_versions = [version for version in versions if SEMVER_PATTERN.match(version)]
+    if len(semantic_versions) != len(versions):
+        logging.debug("Ignoring the versions of '{}' that are not semantic versions.".format(component_arn))
+    return max(semantic_versions, key=get_semver_key, default=None)
+
+
+# Highest version of each component by its ARN, resolved in this run of the CLI.
+_latest_versions = {}
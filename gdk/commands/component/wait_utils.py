@@ -0,0 +1,105 @@
+import heapq
+import logging
+import random
+import time
+
+import gdk.commands.component.project_utils as project_utils
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+
+# States of a component version that don't change anymore while it is being created.
+FINAL_STATES = ["DEPLOYABLE", "FAILED"]
+
+
+def wait_for_components(component_arns, timeout=None):
+    """
+    Waits until each of the component versions is deployable or has failed, polling all of them from a single poller.
+
+    Each component version is polled with the describe component request after a delay that doubles after every poll,
+    up to the maximum delay in the wait options. The delays are jittered so that the polls of many components (or of many
+    publishes running at the same time) are spread out. The poller sleeps until the next component version is due, so
+    any number of component versions are waited for from one thread.
+
+    Raises an exception if any of the component versions has failed or is not deployable within the timeout.
+
+    Parameters
+    ----------
+        component_arns(list): ARNs of the component versions.
+        timeout(int): Seconds to wait for the component versions. Defaults to the timeout in the wait options.
+
+    Returns
+    -------
+        states(dict): Tuple (state, seconds) of each component version by its ARN, where seconds is the time waited for it.
+    """
+    wait_options = consts.default_wait_options
+    if timeout is None:
+        timeout = wait_options["timeout"]
+    start = time.monotonic()
+    # Next poll time, ARN and number of polls of each component version that is not in a final state yet.
+    schedule = [(start + get_poll_delay(0), arn, 0) for arn in dict.fromkeys(component_arns)]
+    heapq.heapify(schedule)
+    states = {}
+    logging.info("Waiting for {} component versions to be deployable.".format(len(schedule)))
+    while schedule:
+        poll_time, component_arn, polls = heapq.heappop(schedule)
+        time.sleep(max(0.0, min(poll_time, start + timeout) - time.monotonic()))
+        state = get_component_state(component_arn)
+        seconds = time.monotonic() - start
+        if state["componentState"] in FINAL_STATES:
+            states[component_arn] = (state["componentState"], seconds)
+            _log_component_state(component_arn, state, seconds)
+        elif seconds >= timeout:
+            states[component_arn] = (state["componentState"], seconds)
+            name = _get_display_name(component_arn)
+            logging.error("Timed out waiting for {} in the state '{}'.".format(name, state["componentState"]))
+        else:
+            heapq.heappush(schedule, (time.monotonic() + get_poll_delay(polls + 1), component_arn, polls + 1))
+
+    not_deployable = [
+        "{} ({})".format(_get_display_name(arn), state) for arn, (state, _) in states.items() if state != "DEPLOYABLE"
+    ]
+    if not_deployable:
+        raise Exception(error_messages.COMPONENTS_NOT_DEPLOYABLE.format(", ".join(not_deployable)))
+    return states
+
+
+def get_poll_delay(polls):
+    """
+    Returns the seconds to wait before the next poll of a component version that has been polled the given times.
+
+    The delay doubles after every poll up to the maximum delay, and a random delay of up to half of it is subtracted.
+    """
+    wait_options = consts.default_wait_options
+    delay = min(wait_options["max_delay"], wait_options["initial_delay"] * 2**polls)
+    return delay - random.uniform(0, delay / 2)
+
+
+def get_component_state(component_arn):
+    """
+    Returns the state of the component version using the greengrass client of the region in its ARN.
+
+    Parameters
+    ----------
+        component_arn(string): ARN of the component version.
+
+    Returns
+    -------
+        status(dict): Status of the component version with its 'componentState', 'message' and 'errors'.
+    """
+    region = component_arn.split(":")[3]
+    response = project_utils.create_greengrass_client(region).describe_component(arn=component_arn)
+    return response["status"]
+
+
+def _log_component_state(component_arn, state, seconds):
+    name = _get_display_name(component_arn)
+    if state["componentState"] == "DEPLOYABLE":
+        logging.info("{} is deployable after {:.1f}s.".format(name, seconds))
+        return
+    logging.error("{} failed after {:.1f}s. {}\n{}".format(name, seconds, state.get("message", ""), state.get("errors", {})))
+
+
+def _get_display_name(component_arn):
+    # arn:aws:greengrass:<region>:<account>:components:<name>:versions:<version>
+    parts = component_arn.split(":")
+    return "'{}-{}'".format(parts[6], parts[8]) if len(parts) == 9 else "'{}'".format(component_arn)
@@ -0,0 +1,225 @@
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+
+# Timestamp of all the entries in a deterministic archive. This is the earliest timestamp supported by the zip format.
+DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# Compressed entries up to this size are kept in memory until they are written to the archive. Larger ones spill to disk.
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def create_zip_archive(source_dir, archive_file, ignore, zip_options, excluded_dirs=None):
+    """
+    Creates a zip archive of the source directory by streaming its files straight into the archive.
+
+    The source directory is walked once and the ignore function is applied to each directory as it is walked, in the
+    same way as the ignore function of shutil.copytree. Entries in the archive are relative to the source directory.
+
+    Files with an extension in the 'store_extensions' zip option are stored without compression as they are already
+    compressed. All other files are compressed with the 'compression_level' zip option.
+
+    By default, each file is streamed straight into its entry in the archive and compressed by zipfile. When the
+    'parallel' zip option is set, files are compressed on a pool of 'max_workers' threads (number of CPUs by default)
+    and their entries are written to the archive in the order of the walk. Compression is the same in both modes, so the
+    archive is byte-identical to the one created serially (except on Python 3.6, where zipfile always uses the default
+    compression level).
+
+    When the 'deterministic' zip option is set, the timestamps and permissions of the entries are normalized, so that
+    the archive created from the same files is byte-identical across builds and machines.
+
+    Parameters
+    ----------
+        source_dir(Path): Directory whose files are added to the archive.
+        archive_file(Path): Path of the zip archive to create.
+        ignore(callable): Function called with a directory and the names in it that returns the names to ignore.
+        zip_options(dict): Options used to create the zip archive.
+        excluded_dirs(list): Directories that are not added to the archive. Eg. the directory of the archive.
+
+    Returns
+    -------
+        None
+    """
+    source_dir = Path(source_dir).resolve()
+    excluded_dirs = {Path(excluded_dir).resolve() for excluded_dir in excluded_dirs or []}
+    store_extensions = {extension.lower() for extension in zip_options["store_extensions"]}
+    compression_level = zip_options["compression_level"]
+    deterministic = zip_options["deterministic"]
+    entries = (
+        (path, _get_zip_info(path, source_dir, store_extensions, deterministic))
+        for path, _ in _walk(source_dir, ignore, excluded_dirs)
+    )
+    logging.debug("Creating the archive '{}' with the files in '{}'.".format(archive_file, source_dir))
+    with zipfile.ZipFile(archive_file, "w") as zf:
+        if not zip_options["parallel"]:
+            for path, zinfo in entries:
+                _write_entry(zf, path, zinfo, compression_level)
+            return
+        max_workers = zip_options["max_workers"] or os.cpu_count() or 1
+        logging.debug("Compressing the files with {} workers.".format(max_workers))
+        for zinfo, data in _compress_entries_parallel(entries, compression_level, max_workers):
+            _write_compressed_entry(zf, zinfo, data)
+
+
+def _walk(source_dir, ignore, excluded_dirs):
+    """
+    Yields the directories and files to add to the archive in a sorted order as a tuple of path and is_dir.
+    """
+    for root, dirs, files in os.walk(source_dir, followlinks=True):
+        root_path = Path(root)
+        ignored_names = set(ignore(root, dirs + files)) if ignore else set()
+        dirs[:] = sorted(
+            d for d in dirs if d not in ignored_names and root_path.joinpath(d).resolve() not in excluded_dirs
+        )
+        for name in dirs:
+            yield root_path.joinpath(name), True
+        for name in sorted(files):
+            path = root_path.joinpath(name)
+            if name not in ignored_names and path.is_file():
+                yield path, False
+
+
+def _get_zip_info(path, source_dir, store_extensions, deterministic=False):
+    """
+    Creates the zip entry of a file or directory with its compression type.
+
+    Entries of a deterministic archive use a fixed timestamp, unix as the creating system and normalized permissions.
+    Directories and executable files get 0755 and all other files get 0644.
+    """
+    arcname = path.relative_to(source_dir).as_posix()
+    if deterministic:
+        zinfo = _get_deterministic_zip_info(path, arcname)
+    else:
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    if zinfo.is_dir() or path.suffix.lower() in store_extensions:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def _get_deterministic_zip_info(path, arcname):
+    """
+    Creates the zip entry of a deterministic archive from the mode and size of the file or directory.
+
+    ZipInfo.from_file is not used as it fails on files modified before 1980 (Eg. files with the epoch as their
+    modification time in reproducible builds), even though their timestamp is replaced.
+    """
+    st = os.stat(path)
+    if stat.S_ISDIR(st.st_mode):
+        zinfo = zipfile.ZipInfo(arcname + "/", DETERMINISTIC_DATE_TIME)
+        zinfo.file_size = 0
+        zinfo.external_attr = ((stat.S_IFDIR | 0o755) << 16) | 0x10
+    else:
+        zinfo = zipfile.ZipInfo(arcname, DETERMINISTIC_DATE_TIME)
+        zinfo.file_size = st.st_size
+        permissions = 0o755 if st.st_mode & stat.S_IXUSR else 0o644
+        zinfo.external_attr = (stat.S_IFREG | permissions) << 16
+    zinfo.create_system = 3
+    return zinfo
+
+
+def _write_entry(zf, path, zinfo, compression_level):
+    """
+    Streams a file or directory into its entry in the zip archive, compressed by zipfile as per the entry.
+    """
+    _set_compress_level(zinfo, compression_level)
+    with zf.open(zinfo, "w") as dest:
+        if not zinfo.is_dir():
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, dest, consts.read_chunk_size)
+
+
+def _set_compress_level(zinfo, compression_level):
+    """
+    Sets the compression level that ZipFile.open uses to write the entry.
+
+    ZipFile.open takes the level only from the entry: 'compress_level' from Python 3.13 and the private '_compresslevel'
+    from Python 3.7 to 3.12. zipfile on Python 3.6 has no compression levels and always uses the default level.
+    """
+    if hasattr(zinfo, "compress_level"):
+        zinfo.compress_level = compression_level
+    elif hasattr(zinfo, "_compresslevel"):
+        zinfo._compresslevel = compression_level
+
+
+def _compress_entries_parallel(entries, compression_level, max_workers):
+    """
+    Compresses the entries on a pool of threads and yields them in the given order.
+
+    Only a bounded number of entries are compressed ahead of the one being written so that a large file at the start
+    of the archive doesn't hold the rest of the compressed archive in memory.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for path, zinfo in entries:
+            pending.append(executor.submit(_compress_entry, path, zinfo, compression_level))
+            if len(pending) >= max_workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _compress_entry(path, zinfo, compression_level):
+    """
+    Reads and compresses a file into a temporary file as per the compression type of its zip entry.
+
+    The raw deflate stream is created with the same compressor settings as zipfile. The CRC and sizes of the zip entry
+    are updated from the file content.
+
+    Returns
+    -------
+        zinfo(zipfile.ZipInfo): Zip entry of the file.
+        data(tempfile.SpooledTemporaryFile): Compressed content of the file. None for directories.
+    """
+    if zinfo.is_dir():
+        zinfo.CRC = 0
+        zinfo.compress_size = 0
+        return zinfo, None
+
+    compressor = None
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+    data = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    crc = 0
+    file_size = 0
+    for chunk in utils.read_file_chunks(path):
+        crc = zlib.crc32(chunk, crc)
+        file_size += len(chunk)
+        data.write(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        data.write(compressor.flush())
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = data.tell()
+    data.seek(0)
+    return zinfo, data
+
+
+def _write_compressed_entry(zf, zinfo, data):
+    """
+    Writes an entry compressed in parallel to the zip archive.
+
+    zipfile has no public API to write data that is already compressed, so this depends on the same ZipFile internals
+    that ZipFile.write uses for directories (since Python 3.6): the archive file 'fp', the entries 'filelist' and
+    'NameToInfo' that the central directory is written from on close, the central directory offset 'start_dir' and
+    ZipInfo.FileHeader. The local header and data are written at the end of the archive and the entry is registered in
+    the same way. These internals are pinned by the tests.
+    """
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader())
+    if data:
+        with data:
+            shutil.copyfileobj(data, zf.fp)
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.start_dir = zf.fp.tell()
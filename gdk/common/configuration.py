@@ -1,11 +1,11 @@
 import json
 import logging
+import os
 from pathlib import Path
 
 import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
-import jsonschema
 
 
 def get_configuration():
@@ -22,6 +22,8 @@ def get_configuration():
     -------
        config_data(dict): Greengrass project configuration as a dictionary object if the config is valid.
     """
+    import jsonschema
+
     project_config_file = _get_project_config_file()
     with open(project_config_file, "r") as config_file:
         config_data = json.loads(config_file.read())
@@ -48,13 +50,50 @@ def validate_configuration(data):
       None
     """
 
+    import jsonschema
+
     config_schema_file = utils.get_static_file_path(consts.config_schema_file)
     if not config_schema_file:
         raise Exception(error_messages.CONFIG_SCHEMA_FILE_NOT_EXISTS)
-    with open(config_schema_file, "r") as schemaFile:
-        schema = json.loads(schemaFile.read())
+    validator = get_schema_validator(config_schema_file)
     logging.debug("Validating the configuration file.")
-    jsonschema.validate(data, schema)
+    # Raises the same error as jsonschema.validate
+    error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
+
+
+def get_schema_validator(schema_file):
+    """
+    Returns the validator of the json schema in the given file.
+
+    The schema is loaded and checked against its metaschema only the first time its validator is created. Validators are
+    cached for the life of the process by the schema file and are created again only when the size or the modification
+    time of the file changes.
+
+    Parameters
+    ----------
+        schema_file(Path): Path of the json schema file.
+
+    Returns
+    -------
+        validator(jsonschema.protocols.Validator): Validator of the json schema.
+    """
+    import jsonschema
+
+    stat = os.stat(schema_file)
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _validator_cache.get(schema_file)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    logging.debug("Creating the validator of the schema '{}'.".format(schema_file))
+    with open(schema_file, "r") as schemaFile:
+        schema = json.loads(schemaFile.read())
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+    _validator_cache[schema_file] = (cache_key, validator)
+    return validator
 
 
 def _get_project_config_file():
@@ -77,3 +116,7 @@ def _get_project_config_file():
     if not utils.file_exists(config_file):
         raise Exception(error_messages.CONFIG_FILE_NOT_EXISTS)
     return config_file
+
+
+# Validators of the json schema files by the schema file, along with the size and modification time of the file.
+_validator_cache = {}
@@ -1,3 +1,19 @@
+import argparse
+
+
+def non_negative_int(value):
+    """
+    Parses the value of a command line argument as an integer that is zero or more.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is None or number < 0:
+        raise argparse.ArgumentTypeError("'{}' is not an integer that is zero or more.".format(value))
+    return number
+
+
 # CLI MODEL
 cli_tool_name = "gdk"
 arg_parameters = [
@@ -13,6 +29,15 @@ arg_parameters = [
     "metavar",
     "dest",
 ]
+# Functions that can be used as the 'type' of an argument in the cli model.
+arg_types = {
+    "str": str,
+    "int": int,
+    "non_negative_int": non_negative_int,
+    "float": float,
+    "str.lower": str.lower,
+    "str.upper": str.upper,
+}
 # FILES
 config_schema_file = "config_schema.json"
 cli_model_file = "cli_model.json"
@@ -20,6 +45,15 @@ cli_project_config_file = "gdk-config.json"
 greengrass_build_dir = "greengrass-build"
 project_build_system_file = "project_build_system.json"
 project_build_schema_file = "project_build_schema.json"
+# Size in bytes of the chunks in which files are read when they are hashed or compressed.
+read_chunk_size = 1024 * 1024
+build_cache_file = ".build_cache.json"
+project_cache_file = ".project_cache.json"
+upload_checkpoints_dir = ".upload_checkpoints"
+# Directory of the caches shared by all the projects of the user, in the home directory.
+user_cache_dir = ".gdk"
+caller_identity_cache_file = "caller_identity_cache.json"
+bucket_cache_file = "bucket_cache.json"
 
 # URLS
 templates_list_url = (
@@ -29,3 +63,48 @@ repository_list_url = (
     "https://raw.githubusercontent.com/aws-greengrass/aws-greengrass-software-catalog/main/cli-components/"
     + "community-components.json"
 )
+
+# BUILD
+# Build configuration file of each build system with modules. The build folder of a module is next to its build file.
+build_system_files = {"maven": "pom.xml", "gradle": "build.gradle"}
+# Directories in which the build tools keep their own state. They are not part of the sources of a component build.
+build_state_dirs = {".git", "__pycache__"}
+build_system_state_dirs = {"gradle": {".gradle"}}
+default_artifact_staging = "copy"
+default_zip_options = {
+    "compression_level": 6,
+    "store_extensions": [".zip", ".jar", ".whl", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".png", ".jpg", ".jpeg", ".mp4"],
+    "parallel": False,
+    "max_workers": None,
+    "deterministic": False,
+}
+
+# PUBLISH
+default_upload_options = {
+    "part_size_mb": 8,
+    "max_concurrency": 10,
+    "throughput_summary": False,
+    "skip_unchanged": False,
+    "max_pool_connections": None,
+    "resumable": True,
+    "stale_upload_ttl_hours": 24,
+}
+# Seconds for which the account of the credentials is reused without calling STS.
+caller_identity_cache_ttl = 3600
+# Seconds for which an artifacts bucket verified to exist in its region is used without checking it again.
+bucket_cache_ttl = 86400
+
+# Seconds to wait for the created component versions to be deployable and the delays between their polls.
+default_wait_options = {
+    "timeout": 600,
+    "initial_delay": 1,
+    "max_delay": 20,
+}
+
+# AWS CLIENTS
+default_client_options = {
+    "max_pool_connections": 10,
+    "retry_mode": "adaptive",
+    "max_attempts": 5,
+    "tcp_keepalive": True,
+}
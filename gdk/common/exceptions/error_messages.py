@@ -38,6 +38,18 @@ INIT_NON_EMPTY_DIR_ERROR = (
 
 # BUILD COMMAND
 BUILD_FAILED = "Failed to build the component with the given project configuration."
+COMPONENT_PROJECTS_NOT_FOUND = (
+    "No component projects are found. Please run the command in a directory that contains component projects with a"
+    " project configuration file."
+)
+COMPONENT_PROJECT_NOT_FOUND = "Could not find the project configuration file of the component project '{}'."
+COMPONENT_DEPENDENCY_CYCLE = "The dependencies of the component projects form a cycle: {}."
+MULTI_COMPONENT_COMMAND_FAILED = "Failed to {} {} of the {} components: {}."
+COMPONENTS_NOT_DEPLOYABLE = "The created component versions are not deployable: {}."
+PROJECT_CONFIG_LISTS_COMPONENTS = (
+    "The project configuration file lists the component projects of a multi-component project. Please run the command in"
+    " the directory of a component project."
+)
 
 # PUBLISH COMMAND
 PUBLISH_FAILED = "Failed to publish new version of component with the given configuration."
@@ -89,7 +89,7 @@ def conflicting_arg_groups(command_args, command):
     -------
       (bool) Returns True if the command arguments conflict. Else False.
     """
-    cli_model = gdk.CLIParser.cli_tool.cli_model
+    cli_model = gdk.CLIParser.CLIParser.cli_model
     conf_args_dict = _dic_of_conflicting_args(cli_model, command)
     logging.debug("Checking if arguments in the command conflict.")
     return check_command_args_with_conflicting_args(command_args, conf_args_dict)
@@ -1,8 +1,22 @@
+import errno
+import hashlib
+import json
 import logging
+import os
 import shutil
+import threading
 from pathlib import Path
 
 import gdk
+import gdk.common.consts as consts
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# ioctl request that clones the data of a file into another on Linux filesystems with copy-on-write support (btrfs, xfs).
+FICLONE = 0x40049409
 
 
 def get_static_file_path(file_name):
@@ -103,6 +117,120 @@ def clean_dir(dir):
     shutil.rmtree(dir, ignore_errors=True, onerror=None)
 
 
+def stage_file(source_file, destination_dir, link=False):
+    """
+    Stages a file into the destination directory with the same name.
+
+    The file is copied by default. When link is set, the file is cloned with copy-on-write (reflink) where the
+    filesystem supports it, else hardlinked, so that staging does not duplicate the file data. The file is copied only
+    when it can't be linked, eg. when the destination directory is on a different device.
+
+    Parameters
+    ----------
+        source_file(Path): Path of the file to stage.
+        destination_dir(Path): Directory to stage the file into.
+        link(bool): Links the file into the directory instead of copying it when possible.
+
+    Returns
+    -------
+        method(string): How the file is staged. One of 'reflink', 'hardlink' or 'copy'.
+    """
+    destination_file = Path(destination_dir).joinpath(Path(source_file).name)
+    if link:
+        if destination_file.exists():
+            destination_file.unlink()
+        if _reflink(source_file, destination_file):
+            return "reflink"
+        try:
+            os.link(source_file, destination_file)
+            return "hardlink"
+        except OSError as e:
+            reason = "it is on a different device" if e.errno == errno.EXDEV else e
+            logging.debug("Copying the file '{}' as it can't be linked: {}".format(source_file, reason))
+    shutil.copy(source_file, destination_file)
+    return "copy"
+
+
+def _reflink(source_file, destination_file):
+    """
+    Clones the source file into a new destination file without copying its data. Returns False if the filesystem
+    doesn't support it.
+    """
+    if fcntl is None:
+        return False
+    try:
+        with open(source_file, "rb") as src, open(destination_file, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError as e:
+        logging.debug("Could not reflink the file '{}'.\n{}".format(source_file, e))
+        if Path(destination_file).exists():
+            Path(destination_file).unlink()
+        return False
+    shutil.copymode(source_file, destination_file)
+    return True
+
+
+def write_json_atomic(file_path, data, mode=0o666):
+    """
+    Writes the data as json to the file, creating its directory if it doesn't exist.
+
+    The data is written to a temporary file that then replaces the file, so that an interrupted write doesn't leave a
+    partial file behind and readers never see one.
+
+    Parameters
+    ----------
+        file_path(Path): Path of the file to write.
+        data(object): Data to write as json.
+        mode(int): Permissions of the file, before the umask of the process is applied.
+
+    Returns
+    -------
+        None
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = file_path.with_name("{}.{}.{}.tmp".format(file_path.name, os.getpid(), threading.get_ident()))
+    with open(os.open(str(temp_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode), "w") as f:
+        f.write(json.dumps(data))
+    os.replace(str(temp_file), str(file_path))
+
+
+def read_file_chunks(file_path):
+    """
+    Yields the content of the file in chunks, so that large files are streamed rather than read into memory at once.
+
+    Parameters
+    ----------
+        file_path(Path): Path of the file to read.
+
+    Returns
+    -------
+        chunks(generator): Bytes of each chunk of the file.
+    """
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(consts.read_chunk_size), b""):
+            yield chunk
+
+
+def get_file_hash(file_path, algorithm="sha256"):
+    """
+    Hashes the content of the file as it is streamed.
+
+    Parameters
+    ----------
+        file_path(Path): Path of the file to hash.
+        algorithm(string): Name of the hash algorithm in hashlib. Eg. 'sha256' or 'md5'.
+
+    Returns
+    -------
+        file_hash(hashlib.Hash): Hash of the file content.
+    """
+    file_hash = hashlib.new(algorithm)
+    for chunk in read_file_chunks(file_path):
+        file_hash.update(chunk)
+    return file_hash
+
+
 error_line = "\n=============================== ERROR ===============================\n"
 help_line = "\n=============================== HELP ===============================\n"
 current_directory = Path(".").resolve()
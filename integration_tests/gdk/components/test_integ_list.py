@@ -6,5 +6,5 @@ import pytest
 
 def test_list_run():
     with pytest.raises(Exception) as e:
-        parse_args_actions.run_command(CLIParser.cli_parser.parse_args(["component", "list", "-d"]))
+        parse_args_actions.run_command(CLIParser.get_cli_parser().parse_args(["component", "list", "-d"]))
     assert e.value.args[0] == error_messages.LIST_WITH_INVALID_ARGS
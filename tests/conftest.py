@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock benchmark that runs only when GDK_RUN_BENCHMARKS is set.")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks measure wall-clock time and are too noisy to run as part of the unit tests on shared machines.
+    if os.environ.get("GDK_RUN_BENCHMARKS"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Benchmarks run only when GDK_RUN_BENCHMARKS is set.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
@@ -1,7 +1,10 @@
+import copy
 from pathlib import Path
 from shutil import Error
 from unittest.mock import mock_open, patch
 
+import gdk.commands.component.command_context as command_context
+import gdk.common.consts as consts
 import gdk.common.utils as utils
 import pytest
 from gdk.common.exceptions import error_messages
@@ -9,6 +12,13 @@ from gdk.common.exceptions import error_messages
 json_values = {
     "component_name": "component_name",
     "component_build_config": {"build_system": "zip"},
+    "zip_options": {
+        "compression_level": 6,
+        "store_extensions": [".zip"],
+        "parallel": False,
+        "max_workers": None,
+        "deterministic": False,
+    },
     "component_version": "1.0.0",
     "component_author": "abc",
     "bucket": "default",
@@ -35,15 +45,18 @@ json_values = {
 }
 
 
+@pytest.fixture(autouse=True)
+def project_config(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=copy.deepcopy(json_values))
+    command_context.reset_context()
+    yield
+    command_context.reset_context()
+
+
 def test_create_recipe_file_json_valid(mocker):
     # Tests if a new recipe file is created with updated values - json
-    mock_get_parsed_config = mocker.patch(
-        "gdk.commands.component.project_utils.get_project_config_values", return_value=json_values
-    )
-
     import gdk.commands.component.build as build
 
-    assert mock_get_parsed_config.call_count == 1
     file_name = Path(json_values["gg_build_recipes_dir"]).joinpath(json_values["component_recipe_file"].name).resolve()
     mock_json_dump = mocker.patch("json.dumps")
     mock_yaml_dump = mocker.patch("yaml.dump")
@@ -79,10 +92,10 @@ def test_create_recipe_file_json_invalid(mocker):
     import gdk.commands.component.build as build
 
     build.project_config["component_recipe_file"] = Path("some-json.json").resolve()
-    file_name = Path(json_values["gg_build_recipes_dir"]).joinpath(json_values["component_recipe_file"].name).resolve()
+    file_name = Path(json_values["gg_build_recipes_dir"]).joinpath("some-json.json").resolve()
 
     def throw_error(*args, **kwargs):
-        if args[0] == json_values["parsed_component_recipe"]:
+        if args[0] == build.project_config["parsed_component_recipe"]:
             raise TypeError("I mock json error")
 
     mock_json_dump = mocker.patch("json.dumps", side_effect=throw_error)
@@ -106,7 +119,7 @@ def test_create_recipe_file_yaml_invalid(mocker):
     )
 
     def throw_error(*args, **kwargs):
-        if args[0] == json_values["parsed_component_recipe"]:
+        if args[0] == build.project_config["parsed_component_recipe"]:
             raise TypeError("I mock yaml error")
 
     mock_json_dump = mocker.patch("json.dumps")
@@ -129,19 +142,43 @@ def test_get_build_folder_by_build_system():
 
 
 def test_create_gg_build_directories(mocker):
-    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=json_values)
     import gdk.commands.component.build as build
 
     mock_mkdir = mocker.patch("pathlib.Path.mkdir")
     mock_clean = mocker.patch("gdk.common.utils.clean_dir")
+    mocker.patch("gdk.common.utils.dir_exists", return_value=False)
     build.create_gg_build_directories()
 
     assert mock_mkdir.call_count == 2
-    assert mock_clean.call_count == 1
+    assert mock_clean.call_count == 0
 
     mock_mkdir.assert_any_call(json_values["gg_build_recipes_dir"], parents=True, exist_ok=True)
     mock_mkdir.assert_any_call(json_values["gg_build_component_artifacts_dir"], parents=True, exist_ok=True)
-    mock_clean.assert_called_once_with(json_values["gg_build_directory"])
+
+
+def test_create_gg_build_directories_keeps_caches(mocker, tmp_path):
+    import gdk.commands.component.build as build
+
+    gg_build_directory = tmp_path.joinpath(consts.greengrass_build_dir)
+    gg_build_directory.joinpath("artifacts", "old").mkdir(parents=True)
+    gg_build_directory.joinpath(consts.build_cache_file).write_text("{}")
+    gg_build_directory.joinpath(consts.project_cache_file).write_text("{}")
+    gg_build_directory.joinpath(consts.upload_checkpoints_dir).mkdir()
+    gg_build_directory.joinpath(consts.upload_checkpoints_dir, "upload.json").write_text("{}")
+    mocker.patch.dict(
+        build.project_config,
+        {
+            "gg_build_directory": gg_build_directory,
+            "gg_build_recipes_dir": gg_build_directory.joinpath("recipes"),
+            "gg_build_component_artifacts_dir": gg_build_directory.joinpath("artifacts", "name", "1.0.0"),
+        },
+    )
+    build.create_gg_build_directories()
+
+    kept_files = sorted([consts.project_cache_file, consts.upload_checkpoints_dir, "artifacts", "recipes"])
+    assert sorted(path.name for path in gg_build_directory.iterdir()) == kept_files
+    assert gg_build_directory.joinpath(consts.upload_checkpoints_dir, "upload.json").exists()
+    assert [path.name for path in gg_build_directory.joinpath("artifacts").iterdir()] == ["name"]
 
 
 def test_run_build_command_with_error_not_zip(mocker):
@@ -193,17 +230,14 @@ def test_run_build_command_zip_build(mocker):
 
 
 def test_build_system_zip_valid(mocker):
-    # build_file = Path('mock-file.py').resolve()
     zip_build_path = Path("zip-build").resolve()
-    zip_artifacts_path = Path(zip_build_path).joinpath(utils.current_directory.name).resolve()
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value={zip_build_path}
     )
     mock_clean_dir = mocker.patch("gdk.common.utils.clean_dir", return_value=None)
-    mock_copytree = mocker.patch("shutil.copytree")
+    mock_mkdir = mocker.patch("pathlib.Path.mkdir")
     mock_subprocess_run = mocker.patch("subprocess.run", return_value=None)
-    mock_ignore_files_during_zip = mocker.patch("gdk.commands.component.build._ignore_files_during_zip", return_value=[])
-    mock_make_archive = mocker.patch("shutil.make_archive")
+    mock_create_zip_archive = mocker.patch("gdk.commands.component.zip_utils.create_zip_archive")
     import gdk.commands.component.build as build
 
     build.project_config["component_build_config"]["build_system"] = "zip"
@@ -212,13 +246,17 @@ def test_build_system_zip_valid(mocker):
     assert not mock_subprocess_run.called
     mock_build_info.assert_called_with()
     mock_clean_dir.assert_called_with(zip_build_path)
+    mock_mkdir.assert_called_with(zip_build_path, parents=True, exist_ok=True)
 
     curr_dir = Path(".").resolve()
-
-    mock_copytree.assert_called_with(curr_dir, zip_artifacts_path, ignore=mock_ignore_files_during_zip)
-    assert mock_make_archive.called
-    zip_build_file = Path(zip_build_path).joinpath(utils.current_directory.name).resolve()
-    mock_make_archive.assert_called_with(zip_build_file, "zip", root_dir=zip_artifacts_path)
+    zip_build_file = Path(zip_build_path).joinpath(f"{utils.current_directory.name}.zip").resolve()
+    mock_create_zip_archive.assert_called_with(
+        curr_dir,
+        zip_build_file,
+        build._ignore_files_during_zip,
+        json_values["zip_options"],
+        excluded_dirs=[zip_build_path],
+    )
 
 
 def test_ignore_files_during_zip():
@@ -231,48 +269,16 @@ def test_ignore_files_during_zip():
 
 
 def test_build_system_zip_error_archive(mocker):
-
     zip_build_path = Path("zip-build").resolve()
-    zip_artifacts_path = Path(zip_build_path).joinpath(utils.current_directory.name).resolve()
-
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value={zip_build_path}
     )
     mock_clean_dir = mocker.patch("gdk.common.utils.clean_dir", return_value=None)
-    mock_copytree = mocker.patch("shutil.copytree")
+    mocker.patch("pathlib.Path.mkdir")
     mock_subprocess_run = mocker.patch("subprocess.run", return_value=None)
-    mock_ignore_files_during_zip = mocker.patch("gdk.commands.component.build._ignore_files_during_zip", return_value=[])
-    mock_make_archive = mocker.patch("shutil.make_archive", side_effect=Error("some error"))
-    import gdk.commands.component.build as build
-
-    with pytest.raises(Exception) as e:
-        build._build_system_zip()
-
-    assert "Failed to zip the component in default build mode." in e.value.args[0]
-    assert not mock_subprocess_run.called
-    mock_build_info.assert_called_with()
-    mock_clean_dir.assert_called_with(zip_build_path)
-
-    curr_dir = Path(".").resolve()
-
-    mock_copytree.assert_called_with(curr_dir, zip_artifacts_path, ignore=mock_ignore_files_during_zip)
-    assert mock_make_archive.called
-    zip_build_file = Path(zip_build_path).joinpath(utils.current_directory.name).resolve()
-    mock_make_archive.assert_called_with(zip_build_file, "zip", root_dir=zip_artifacts_path)
-
-
-def test_build_system_zip_error_copytree(mocker):
-    zip_build_path = Path("zip-build").resolve()
-    zip_artifacts_path = Path(zip_build_path).joinpath(utils.current_directory.name).resolve()
-
-    mock_build_info = mocker.patch(
-        "gdk.commands.component.build._get_build_folder_by_build_system", return_value={zip_build_path}
+    mock_create_zip_archive = mocker.patch(
+        "gdk.commands.component.zip_utils.create_zip_archive", side_effect=Error("some error")
     )
-    mock_clean_dir = mocker.patch("gdk.common.utils.clean_dir", return_value=None)
-    mock_copytree = mocker.patch("shutil.copytree", side_effect=Error("some error"))
-    mock_subprocess_run = mocker.patch("subprocess.run", return_value=None)
-    mock_ignore_files_during_zip = mocker.patch("gdk.commands.component.build._ignore_files_during_zip", return_value=[])
-    mock_make_archive = mocker.patch("shutil.make_archive")
     import gdk.commands.component.build as build
 
     with pytest.raises(Exception) as e:
@@ -282,11 +288,7 @@ def test_build_system_zip_error_copytree(mocker):
     assert not mock_subprocess_run.called
     mock_build_info.assert_called_with()
     mock_clean_dir.assert_called_with(zip_build_path)
-
-    curr_dir = Path(".").resolve()
-
-    mock_copytree.assert_called_with(curr_dir, zip_artifacts_path, ignore=mock_ignore_files_during_zip)
-    assert not mock_make_archive.called
+    assert mock_create_zip_archive.called
 
 
 def test_build_system_zip_error_get_build_folder_by_build_system(mocker):
@@ -297,10 +299,8 @@ def test_build_system_zip_error_get_build_folder_by_build_system(mocker):
         side_effect=Error("some error"),
     )
     mock_clean_dir = mocker.patch("gdk.common.utils.clean_dir", return_value=None)
-    mock_copytree = mocker.patch("shutil.copytree")
     mock_subprocess_run = mocker.patch("subprocess.run", return_value=None)
-    mock_ignore_files_during_zip = mocker.patch("gdk.commands.component.build._ignore_files_during_zip", return_value=[])
-    mock_make_archive = mocker.patch("shutil.make_archive")
+    mock_create_zip_archive = mocker.patch("gdk.commands.component.zip_utils.create_zip_archive")
     import gdk.commands.component.build as build
 
     with pytest.raises(Exception) as e:
@@ -310,9 +310,7 @@ def test_build_system_zip_error_get_build_folder_by_build_system(mocker):
     assert not mock_subprocess_run.called
     mock_build_info.assert_called_with()
     assert not mock_clean_dir.called
-    assert not mock_copytree.called
-    assert not mock_make_archive.called
-    assert not mock_ignore_files_during_zip.called
+    assert not mock_create_zip_archive.called
 
 
 def test_build_system_zip_error_clean_dir(mocker):
@@ -321,9 +319,8 @@ def test_build_system_zip_error_clean_dir(mocker):
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value={zip_build_path}
     )
     mock_clean_dir = mocker.patch("gdk.common.utils.clean_dir", return_value=None, side_effect=Error("some error"))
-    mock_copytree = mocker.patch("shutil.copytree")
     mock_subprocess_run = mocker.patch("subprocess.run", return_value=None)
-    mock_make_archive = mocker.patch("shutil.make_archive")
+    mock_create_zip_archive = mocker.patch("gdk.commands.component.zip_utils.create_zip_archive")
     import gdk.commands.component.build as build
 
     with pytest.raises(Exception) as e:
@@ -333,8 +330,7 @@ def test_build_system_zip_error_clean_dir(mocker):
     assert not mock_subprocess_run.called
     mock_build_info.assert_called_with()
     assert mock_clean_dir.called
-    assert not mock_copytree.called
-    assert not mock_make_archive.called
+    assert not mock_create_zip_archive.called
 
 
 def test_copy_artifacts_and_update_uris_valid(mocker):
@@ -342,14 +338,17 @@ def test_copy_artifacts_and_update_uris_valid(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=[Path(".").joinpath("hello_world.py")])
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mock_index = mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"hello_world.py": [Path(".").joinpath("hello_world.py")]},
+    )
     import gdk.commands.component.build as build
 
     build.copy_artifacts_and_update_uris()
     assert mock_build_info.assert_called_once
-    assert mock_glob.assert_called_once
-    assert mock_shutil_copy.called
+    mock_index.assert_called_once_with(zip_build_path)
+    assert mock_stage_file.called
 
 
 def test_copy_artifacts_and_update_uris_recipe_uri_matches(mocker):
@@ -358,16 +357,17 @@ def test_copy_artifacts_and_update_uris_recipe_uri_matches(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_iter_dir_list = [Path("hello_world.py").resolve()]
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=mock_iter_dir_list)
+    mock_index = {"hello_world.py": [Path("hello_world.py").resolve()], "other.py": [Path("other.py").resolve()]}
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch("gdk.commands.component.build.get_artifact_index", return_value=mock_index)
     import gdk.commands.component.build as build
 
     build.copy_artifacts_and_update_uris()
-    assert mock_shutil_copy.called
+    assert mock_stage_file.call_count == 1
     assert mock_build_info.assert_called_once
-    assert mock_glob.assert_called_once
-    mock_shutil_copy.assert_called_with(Path("hello_world.py").resolve(), json_values["gg_build_component_artifacts_dir"])
+    mock_stage_file.assert_called_with(
+        Path("hello_world.py").resolve(), json_values["gg_build_component_artifacts_dir"], link=False
+    )
 
 
 def test_copy_artifacts_and_update_uris_recipe_uri_not_matches(mocker):
@@ -377,8 +377,8 @@ def test_copy_artifacts_and_update_uris_recipe_uri_not_matches(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=[])
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mock_index = mocker.patch("gdk.commands.component.build.get_artifact_index", return_value={})
     import gdk.commands.component.build as build
 
     with pytest.raises(Exception) as e:
@@ -387,9 +387,9 @@ def test_copy_artifacts_and_update_uris_recipe_uri_not_matches(mocker):
     assert (
         "Could not find the artifact file specified in the recipe 'hello_world.py' inside the build folder" in e.value.args[0]
     )
-    assert not mock_shutil_copy.called
+    assert not mock_stage_file.called
     assert mock_build_info.assert_called_once
-    assert mock_glob.assert_called_once
+    mock_index.assert_called_once_with(zip_build_path)
 
 
 def test_default_build_component(mocker):
@@ -460,13 +460,67 @@ def test_build_run_default(mocker):
     mock_create_gg_build_directories = mocker.patch("gdk.commands.component.build.create_gg_build_directories")
     mock_default_build_component = mocker.patch("gdk.commands.component.build.default_build_component")
     mock_subprocess_run = mocker.patch("subprocess.run")
+    mock_fingerprint = mocker.patch(
+        "gdk.commands.component.cache_utils.get_build_fingerprint", return_value=("fingerprint", {})
+    )
+    mock_is_build_cached = mocker.patch("gdk.commands.component.cache_utils.is_build_cached", return_value=False)
+    mock_update_build_cache = mocker.patch("gdk.commands.component.cache_utils.update_build_cache")
     import gdk.commands.component.build as build
 
     build.run({})
 
-    assert mock_create_gg_build_directories.assert_called_once
-    assert mock_default_build_component.assert_called_once
+    assert mock_create_gg_build_directories.call_count == 1
+    assert mock_default_build_component.call_count == 1
     assert not mock_subprocess_run.called
+    assert mock_fingerprint.call_count == 1
+    mock_is_build_cached.assert_called_once_with(build.project_config, "fingerprint")
+    mock_update_build_cache.assert_called_once_with(build.project_config, "fingerprint", {})
+
+
+def test_build_run_default_cache_hit(mocker):
+    mock_create_gg_build_directories = mocker.patch("gdk.commands.component.build.create_gg_build_directories")
+    mock_default_build_component = mocker.patch("gdk.commands.component.build.default_build_component")
+    mocker.patch("gdk.commands.component.cache_utils.get_build_fingerprint", return_value=("fingerprint", {}))
+    mock_is_build_cached = mocker.patch("gdk.commands.component.cache_utils.is_build_cached", return_value=True)
+    mock_update_build_cache = mocker.patch("gdk.commands.component.cache_utils.update_build_cache")
+    import gdk.commands.component.build as build
+
+    build.run({})
+
+    assert mock_is_build_cached.call_count == 1
+    assert not mock_create_gg_build_directories.called
+    assert not mock_default_build_component.called
+    assert not mock_update_build_cache.called
+
+
+def test_build_run_default_cache_hit_forced(mocker):
+    mock_create_gg_build_directories = mocker.patch("gdk.commands.component.build.create_gg_build_directories")
+    mock_default_build_component = mocker.patch("gdk.commands.component.build.default_build_component")
+    mocker.patch("gdk.commands.component.cache_utils.get_build_fingerprint", return_value=("fingerprint", {}))
+    mock_is_build_cached = mocker.patch("gdk.commands.component.cache_utils.is_build_cached", return_value=True)
+    mock_update_build_cache = mocker.patch("gdk.commands.component.cache_utils.update_build_cache")
+    import gdk.commands.component.build as build
+
+    build.run({"force": True})
+
+    assert not mock_is_build_cached.called
+    assert mock_create_gg_build_directories.call_count == 1
+    assert mock_default_build_component.call_count == 1
+    mock_update_build_cache.assert_called_once_with(build.project_config, "fingerprint", {})
+
+
+def test_build_run_default_error_not_cached(mocker):
+    mocker.patch("gdk.commands.component.build.create_gg_build_directories")
+    mocker.patch("gdk.commands.component.build.default_build_component", side_effect=Error("some error"))
+    mocker.patch("gdk.commands.component.cache_utils.get_build_fingerprint", return_value=("fingerprint", {}))
+    mocker.patch("gdk.commands.component.cache_utils.is_build_cached", return_value=False)
+    mock_update_build_cache = mocker.patch("gdk.commands.component.cache_utils.update_build_cache")
+    import gdk.commands.component.build as build
+
+    with pytest.raises(Exception) as e:
+        build.run({})
+    assert "some error" in str(e.value)
+    assert not mock_update_build_cache.called
 
 
 def test_build_run_custom(mocker):
@@ -484,6 +538,19 @@ def test_build_run_custom(mocker):
     assert mock_subprocess_run.called
 
 
+def test_build_run_multi_component(mocker):
+    mock_build_components = mocker.patch("gdk.commands.component.multi_component.build_components")
+    mock_create_gg_build_directories = mocker.patch("gdk.commands.component.build.create_gg_build_directories")
+    mock_get_project_config_values = mocker.patch("gdk.commands.component.project_utils.get_project_config_values")
+    import gdk.commands.component.build as build
+
+    build.run({"all": True, "workers": 4})
+
+    mock_build_components.assert_called_once_with({"all": True, "workers": 4})
+    assert not mock_create_gg_build_directories.called
+    assert not mock_get_project_config_values.called
+
+
 def test_copy_artifacts_and_update_uris_no_manifest_in_recipe(mocker):
     # Nothing to copy if manifest file doesnt exist
     # recipe with no manifest key
@@ -494,9 +561,8 @@ def test_copy_artifacts_and_update_uris_no_manifest_in_recipe(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_iter_dir_list = [Path("this-recipe-uri-not-exists.sh").resolve()]
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.iterdir", return_value=mock_iter_dir_list)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mock_index = mocker.patch("gdk.commands.component.build.get_artifact_index")
 
     modify_build = build.project_config
     modify_build["parsed_component_recipe"] = {
@@ -508,9 +574,9 @@ def test_copy_artifacts_and_update_uris_no_manifest_in_recipe(mocker):
         "ComponentConfiguration": {"DefaultConfiguration": {"Message": "world"}},
     }
     build.copy_artifacts_and_update_uris()
-    assert not mock_shutil_copy.called
+    assert not mock_stage_file.called
     assert not mock_build_info.called
-    assert not mock_glob.called
+    assert not mock_index.called
 
 
 def test_copy_artifacts_and_update_uris_no_artifacts_in_recipe(mocker):
@@ -522,9 +588,11 @@ def test_copy_artifacts_and_update_uris_no_artifacts_in_recipe(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_iter_dir_list = Path("this-recipe-uri-not-exists.sh").resolve()
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=mock_iter_dir_list)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"this-recipe-uri-not-exists.sh": [Path("this-recipe-uri-not-exists.sh").resolve()]},
+    )
 
     modify_build = build.project_config
     modify_build["parsed_component_recipe"] = {
@@ -543,9 +611,8 @@ def test_copy_artifacts_and_update_uris_no_artifacts_in_recipe(mocker):
     }
 
     build.copy_artifacts_and_update_uris()
-    assert not mock_shutil_copy.called
+    assert not mock_stage_file.called
     assert mock_build_info.called
-    assert not mock_glob.called
 
 
 def test_copy_artifacts_and_update_uris_no_artifact_uri_in_recipe(mocker):
@@ -557,9 +624,11 @@ def test_copy_artifacts_and_update_uris_no_artifact_uri_in_recipe(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_iter_dir_list = Path("this-recipe-uri-not-exists.sh").resolve()
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=mock_iter_dir_list)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"this-recipe-uri-not-exists.sh": [Path("this-recipe-uri-not-exists.sh").resolve()]},
+    )
 
     modify_build = build.project_config
     modify_build["parsed_component_recipe"] = {
@@ -579,9 +648,8 @@ def test_copy_artifacts_and_update_uris_no_artifact_uri_in_recipe(mocker):
     }
 
     build.copy_artifacts_and_update_uris()
-    assert not mock_shutil_copy.called
+    assert not mock_stage_file.called
     assert mock_build_info.called
-    assert not mock_glob.called
 
 
 def test_copy_artifacts_and_update_uris_docker_uri_in_recipe(mocker):
@@ -593,9 +661,11 @@ def test_copy_artifacts_and_update_uris_docker_uri_in_recipe(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path
     )
-    mock_iter_dir_list = Path("this-recipe-uri-not-exists.sh").resolve()
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=mock_iter_dir_list)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"this-recipe-uri-not-exists.sh": [Path("this-recipe-uri-not-exists.sh").resolve()]},
+    )
 
     modify_build = build.project_config
     modify_build["parsed_component_recipe"] = {
@@ -615,10 +685,9 @@ def test_copy_artifacts_and_update_uris_docker_uri_in_recipe(mocker):
     }
 
     build.copy_artifacts_and_update_uris()
-    assert not mock_shutil_copy.called
+    assert not mock_stage_file.called
 
     assert mock_build_info.called
-    assert not mock_glob.called
 
 
 def test_copy_artifacts_and_update_uris_mix_uri_in_recipe(mocker):
@@ -630,9 +699,10 @@ def test_copy_artifacts_and_update_uris_mix_uri_in_recipe(mocker):
     mock_build_info = mocker.patch(
         "gdk.commands.component.build._get_build_folder_by_build_system", return_value={zip_build_path}
     )
-    mock_iter_dir_list = [Path("hello_world.py").resolve()]
-    mock_shutil_copy = mocker.patch("shutil.copy")
-    mock_glob = mocker.patch("pathlib.Path.glob", return_value=mock_iter_dir_list)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index", return_value={"hello_world.py": [Path("hello_world.py").resolve()]}
+    )
 
     modify_build = build.project_config
     modify_build["parsed_component_recipe"] = {
@@ -652,9 +722,96 @@ def test_copy_artifacts_and_update_uris_mix_uri_in_recipe(mocker):
     }
 
     build.copy_artifacts_and_update_uris()
-    mock_shutil_copy.assert_called_with(Path("hello_world.py").resolve(), json_values["gg_build_component_artifacts_dir"])
+    mock_stage_file.assert_called_with(
+        Path("hello_world.py").resolve(), json_values["gg_build_component_artifacts_dir"], link=False
+    )
     assert mock_build_info.called
-    mock_glob.assert_called_with("hello_world.py")
+    assert modify_build["parsed_component_recipe"]["Manifests"][0]["Artifacts"][1]["URI"] == (
+        "s3://default/component_name/1.0.0/hello_world.py"
+    )
+
+
+def test_copy_artifacts_and_update_uris_duplicate_artifact(mocker):
+    zip_build_path = [Path("module_a").resolve(), Path("module_b").resolve()]
+    mocker.patch("gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"hello_world.py": [Path("module_a", "hello_world.py"), Path("module_b", "hello_world.py")]},
+    )
+    import gdk.commands.component.build as build
+
+    build.project_config["parsed_component_recipe"] = {
+        "Manifests": [{"Artifacts": [{"URI": "s3://bucket/hello_world.py"}]}],
+    }
+    with pytest.raises(Exception) as e:
+        build.copy_artifacts_and_update_uris()
+
+    assert "Found the artifact file specified in the recipe 'hello_world.py' in multiple build folders." in e.value.args[0]
+    assert not mock_stage_file.called
+
+
+def test_copy_artifacts_and_update_uris_multiple_manifests(mocker):
+    zip_build_path = [Path("zip-build").resolve()]
+    mocker.patch("gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="copy")
+    mock_index = mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"hello_world.py": [Path("zip-build", "hello_world.py")], "run.sh": [Path("zip-build", "run.sh")]},
+    )
+    import gdk.commands.component.build as build
+
+    build.project_config["parsed_component_recipe"] = {
+        "Manifests": [
+            {"Platform": {"os": "linux"}, "Artifacts": [{"URI": "s3://a/hello_world.py"}, {"URI": "s3://a/run.sh"}]},
+            {"Platform": {"os": "windows"}, "Artifacts": [{"URI": "s3://a/hello_world.py"}]},
+        ],
+    }
+    build.copy_artifacts_and_update_uris()
+
+    mock_index.assert_called_once_with(zip_build_path)
+    assert mock_stage_file.call_count == 2
+    assert build.project_config["parsed_component_recipe"]["Manifests"][1]["Artifacts"][0]["URI"] == (
+        "s3://default/component_name/1.0.0/hello_world.py"
+    )
+
+
+def test_copy_artifacts_and_update_uris_link_staging(mocker):
+    zip_build_path = [Path("zip-build").resolve()]
+    mocker.patch("gdk.commands.component.build._get_build_folder_by_build_system", return_value=zip_build_path)
+    mock_stage_file = mocker.patch("gdk.common.utils.stage_file", return_value="hardlink")
+    mocker.patch(
+        "gdk.commands.component.build.get_artifact_index",
+        return_value={"hello_world.py": [Path("zip-build", "hello_world.py")]},
+    )
+    import gdk.commands.component.build as build
+
+    build.project_config["component_build_config"] = {"build_system": "zip", "artifact_staging": "link"}
+    build.project_config["parsed_component_recipe"] = {"Manifests": [{"Artifacts": [{"URI": "s3://a/hello_world.py"}]}]}
+    build.copy_artifacts_and_update_uris()
+
+    mock_stage_file.assert_called_once_with(
+        Path("zip-build", "hello_world.py"), json_values["gg_build_component_artifacts_dir"], link=True
+    )
+    build.project_config["component_build_config"] = {"build_system": "zip"}
+
+
+def test_get_artifact_index(tmp_path):
+    import gdk.commands.component.build as build
+
+    module_a = tmp_path.joinpath("module_a", "target")
+    module_b = tmp_path.joinpath("module_b", "target")
+    module_a.joinpath("classes").mkdir(parents=True)
+    module_b.mkdir(parents=True)
+    module_a.joinpath("a.jar").touch()
+    module_a.joinpath("common.jar").touch()
+    module_b.joinpath("common.jar").touch()
+
+    artifact_index = build.get_artifact_index({module_a, module_b, tmp_path.joinpath("missing")})
+
+    assert artifact_index.keys() == {"a.jar", "common.jar"}
+    assert artifact_index["a.jar"] == [module_a.joinpath("a.jar")]
+    assert sorted(artifact_index["common.jar"]) == [module_a.joinpath("common.jar"), module_b.joinpath("common.jar")]
 
 
 def test_get_build_folder_by_build_system_maven(mocker):
@@ -679,49 +836,65 @@ def test_get_build_folder_by_build_system_gradle(mocker):
     mock_get_build_folders.assert_any_call(["build", "libs"], "build.gradle")
 
 
-def test_get_build_folders_maven(mocker):
+def test_get_build_folders_maven(mocker, tmp_path):
     import gdk.commands.component.build as build
 
-    dummy_build_file_paths = [Path("/").joinpath("path1"), Path("/").joinpath(*["path1", "path2"])]
-    dummy_build_folder_paths = [
-        Path("/").joinpath("path1"),
-        Path("/").joinpath(*["path1", "path2"]),
-        Path("/").joinpath(*["path3", "path1"]),
-    ]
-
-    def get_files(*args, **kwargs):
-        if args[0] == "pom.xml":
-            return dummy_build_file_paths
-        else:
-            return dummy_build_folder_paths
+    for module in [[], ["module_a"], ["module_b"], ["module_a", "nested"], ["no_build"], ["node_modules", "pkg"], [".git"]]:
+        tmp_path.joinpath(*module).mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(*module, "pom.xml").touch()
+    for module in [[], ["module_a"], ["module_a", "nested"], ["node_modules", "pkg"], [".git"], ["no_pom"]]:
+        tmp_path.joinpath(*module, "target").mkdir(parents=True)
+    tmp_path.joinpath("module_b", "target").touch()
+    mocker.patch.object(utils, "current_directory", tmp_path)
+    mock_walk = mocker.spy(build.os, "walk")
+    build._build_folders_cache.clear()
 
-    mock_rglob = mocker.patch("pathlib.Path.rglob", side_effect=get_files)
-    build.project_config["component_build_config"] = {"build_system": "maven"}
     maven_b_paths = build.get_build_folders(["target"], "pom.xml")
-    mock_rglob.assert_any_call("pom.xml")
-    mock_rglob.assert_any_call("target")
-    assert maven_b_paths == {Path("/").joinpath(*["target"]), Path("/").joinpath(*["path1", "target"])}
+
+    assert maven_b_paths == {
+        tmp_path.joinpath("target"),
+        tmp_path.joinpath("module_a", "target"),
+        tmp_path.joinpath("module_a", "nested", "target"),
+    }
+    assert mock_walk.call_count == 1
+    assert build.get_build_folders(["target"], "pom.xml") == maven_b_paths
+    assert mock_walk.call_count == 1
 
 
-def test_get_build_folders_gradle(mocker):
+def test_get_build_folders_gradle(mocker, tmp_path):
     import gdk.commands.component.build as build
 
-    dummy_build_file_paths = [Path("/").joinpath("path1"), Path("/").joinpath(*["path1", "path2"])]
-    dummy_build_folder_paths = [
-        Path("/").joinpath("path1"),
-        Path("/").joinpath(*["path1", "path2"]),
-        Path("/").joinpath(*["path3", "path1"]),
-    ]
+    for module in [[], ["module_a"], ["module_b"]]:
+        tmp_path.joinpath(*module).mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(*module, "build.gradle").touch()
+    tmp_path.joinpath("build", "libs").mkdir(parents=True)
+    tmp_path.joinpath("module_a", "build", "libs").mkdir(parents=True)
+    tmp_path.joinpath("module_b", "build").mkdir(parents=True)
+    mocker.patch.object(utils, "current_directory", tmp_path)
+    build._build_folders_cache.clear()
 
-    def get_files(*args, **kwargs):
-        if args[0] == "build.gradle":
-            return dummy_build_file_paths
-        else:
-            return dummy_build_folder_paths
+    gradle_b_paths = build.get_build_folders(["build", "libs"], "build.gradle")
 
-    mock_rglob = mocker.patch("pathlib.Path.rglob", side_effect=get_files)
-    build.project_config["component_build_config"] = {"build_system": "gradle"}
-    maven_b_paths = build.get_build_folders(["build", "libs"], "build.gradle")
-    mock_rglob.assert_any_call("build.gradle")
-    mock_rglob.assert_any_call(str(Path(".").joinpath(*["build", "libs"])))
-    assert maven_b_paths == {Path("/").joinpath(*["build", "libs"]), Path("/").joinpath(*["path1", "build", "libs"])}
+    assert gradle_b_paths == {tmp_path.joinpath("build", "libs"), tmp_path.joinpath("module_a", "build", "libs")}
+
+
+def test_get_build_folders_prunes_ignored_dirs(mocker, tmp_path):
+    import gdk.commands.component.build as build
+
+    tmp_path.joinpath("pom.xml").touch()
+    for ignored in [".git", "node_modules", "greengrass-build", "target"]:
+        tmp_path.joinpath(ignored, "module").mkdir(parents=True)
+    mocker.patch.object(utils, "current_directory", tmp_path)
+    walk = build.os.walk
+    walked = []
+
+    def spy_walk(top):
+        for root, dirs, files in walk(top):
+            walked.append(Path(root))
+            yield root, dirs, files
+
+    mocker.patch.object(build.os, "walk", side_effect=spy_walk)
+    build._build_folders_cache.clear()
+
+    assert build.get_build_folders(["target"], "pom.xml") == {tmp_path.joinpath("target")}
+    assert walked == [tmp_path]
@@ -0,0 +1,216 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import gdk.commands.component.cache_utils as cache_utils
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+import pytest
+
+build_system_config = {"build_command": ["mvn", "clean", "package"], "build_folder": ["target"]}
+
+
+@pytest.fixture()
+def project(mocker, tmp_path):
+    mocker.patch("gdk.common.utils.current_directory", tmp_path)
+    tmp_path.joinpath("recipe.json").write_text("{}")
+    tmp_path.joinpath("gdk-config.json").write_text("{}")
+    tmp_path.joinpath("pom.xml").write_text("<project/>")
+    tmp_path.joinpath("src").mkdir()
+    tmp_path.joinpath("src", "main.py").write_text("print('hello')")
+    gg_build_directory = tmp_path.joinpath(consts.greengrass_build_dir)
+    return {
+        "component_build_config": {"build_system": "maven"},
+        "component_recipe_file": tmp_path.joinpath("recipe.json"),
+        "gg_build_directory": gg_build_directory,
+        "gg_build_recipes_dir": gg_build_directory.joinpath("recipes"),
+        "gg_build_component_artifacts_dir": gg_build_directory.joinpath("artifacts", "component_name", "1.0.0"),
+    }
+
+
+def build(project_config):
+    project_config["gg_build_recipes_dir"].mkdir(parents=True)
+    project_config["gg_build_component_artifacts_dir"].mkdir(parents=True)
+    project_config["gg_build_recipes_dir"].joinpath("recipe.json").write_text("{}")
+
+
+def test_get_build_fingerprint_ignores_build_outputs(project, tmp_path):
+    fingerprint, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    assert sorted(files) == ["gdk-config.json", "pom.xml", "recipe.json", "src/main.py"]
+
+    build(project)
+    tmp_path.joinpath("target").mkdir()
+    tmp_path.joinpath("target", "main.jar").write_text("jar")
+    tmp_path.joinpath("module", "target").mkdir(parents=True)
+    tmp_path.joinpath("module", "pom.xml").write_text("<project/>")
+    fingerprint, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    tmp_path.joinpath("module", "target", "module.jar").write_text("jar")
+    tmp_path.joinpath(".git").mkdir()
+    tmp_path.joinpath(".git", "HEAD").write_text("ref")
+    assert cache_utils.get_build_fingerprint(project, build_system_config) == (fingerprint, files)
+
+
+@pytest.mark.parametrize(
+    "source_file",
+    [("src", "target", "Main.java"), ("src", "build", "config.py"), (".mvn", "maven.config"), (".python-version",)],
+)
+def test_get_build_fingerprint_includes_source_dirs_named_as_build_outputs(project, tmp_path, source_file):
+    fingerprint, _ = cache_utils.get_build_fingerprint(project, build_system_config)
+    tmp_path.joinpath(*source_file).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path.joinpath(*source_file).write_text("source")
+    fingerprint_with_source, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    assert fingerprint_with_source != fingerprint
+    assert "/".join(source_file) in files
+
+
+def test_get_build_fingerprint_excludes_top_level_build_folder_without_build_file(project, tmp_path):
+    zip_build_system_config = {"build_command": ["zip"], "build_folder": ["zip-build"]}
+    project["component_build_config"] = {"build_system": "zip"}
+    fingerprint, _ = cache_utils.get_build_fingerprint(project, zip_build_system_config)
+    tmp_path.joinpath("zip-build").mkdir()
+    tmp_path.joinpath("zip-build", "project.zip").write_text("zip")
+    tmp_path.joinpath("src", "zip-build").mkdir()
+    assert cache_utils.get_build_fingerprint(project, zip_build_system_config)[0] == fingerprint
+    tmp_path.joinpath("src", "zip-build", "source.py").write_text("source")
+    assert cache_utils.get_build_fingerprint(project, zip_build_system_config)[0] != fingerprint
+
+
+def test_get_build_fingerprint_ignores_build_tool_state(project, tmp_path):
+    gradle_build_system_config = {"build_command": ["gradle", "build"], "build_folder": ["build", "libs"]}
+    project["component_build_config"] = {"build_system": "gradle"}
+    tmp_path.joinpath("build.gradle").write_text("plugins {}")
+    fingerprint, files = cache_utils.get_build_fingerprint(project, gradle_build_system_config)
+    build(project)
+    tmp_path.joinpath(".gradle", "7.4").mkdir(parents=True)
+    tmp_path.joinpath(".gradle", "7.4", "fileHashes.bin").write_text("state")
+    tmp_path.joinpath("src", "__pycache__").mkdir()
+    tmp_path.joinpath("src", "__pycache__", "main.cpython-36.pyc").write_text("bytecode")
+    cache_utils.update_build_cache(project, fingerprint, files)
+
+    next_fingerprint, _ = cache_utils.get_build_fingerprint(project, gradle_build_system_config)
+    assert next_fingerprint == fingerprint
+    assert cache_utils.is_build_cached(project, next_fingerprint)
+
+
+def test_get_build_fingerprint_source_changed(project, tmp_path):
+    fingerprint, _ = cache_utils.get_build_fingerprint(project, build_system_config)
+    tmp_path.joinpath("src", "main.py").write_text("print('changed')")
+    assert cache_utils.get_build_fingerprint(project, build_system_config)[0] != fingerprint
+
+
+def test_get_build_fingerprint_build_config_changed(project):
+    fingerprint, _ = cache_utils.get_build_fingerprint(project, build_system_config)
+    changed_build_system_config = dict(build_system_config, build_command=["mvn", "package"])
+    assert cache_utils.get_build_fingerprint(project, changed_build_system_config)[0] != fingerprint
+
+
+def test_get_build_fingerprint_reuses_cached_digests(mocker, project):
+    fingerprint, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    build(project)
+    cache_utils.update_build_cache(project, fingerprint, files)
+
+    spy_digest = mocker.spy(utils, "get_file_hash")
+    assert cache_utils.get_build_fingerprint(project, build_system_config) == (fingerprint, files)
+    assert not spy_digest.called
+
+
+def test_is_build_cached(project):
+    fingerprint, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    assert not cache_utils.is_build_cached(project, fingerprint)
+
+    build(project)
+    cache_utils.update_build_cache(project, fingerprint, files)
+    assert cache_utils.is_build_cached(project, fingerprint)
+    assert not cache_utils.is_build_cached(project, "other")
+
+    with open(project["gg_build_directory"].joinpath(consts.build_cache_file)) as f:
+        assert json.loads(f.read())["fingerprint"] == fingerprint
+
+
+def test_is_build_cached_build_output_removed(project):
+    fingerprint, files = cache_utils.get_build_fingerprint(project, build_system_config)
+    build(project)
+    cache_utils.update_build_cache(project, fingerprint, files)
+    Path(project["gg_build_recipes_dir"]).joinpath("recipe.json").unlink()
+    assert not cache_utils.is_build_cached(project, fingerprint)
+
+
+def test_is_build_cached_invalid_cache_file(project):
+    build(project)
+    project["gg_build_directory"].joinpath(consts.build_cache_file).write_text("not json")
+    assert not cache_utils.is_build_cached(project, "fingerprint")
+
+
+def test_get_cached_file_data(mocker, project, tmp_path):
+    recipe_file = tmp_path.joinpath("recipe.json")
+    file_key = cache_utils.get_file_key(recipe_file)
+    assert cache_utils.get_cached_file_data("recipe", file_key) == (False, None)
+
+    cache_utils.update_cached_file_data("recipe", file_key, {"ComponentName": "name"})
+    assert cache_utils.get_cached_file_data("recipe", file_key) == (True, {"ComponentName": "name"})
+
+    mocker.patch("gdk._version.__version__", "0.0.0")
+    assert cache_utils.get_cached_file_data("recipe", cache_utils.get_file_key(recipe_file)) == (False, None)
+
+
+def test_get_cached_file_data_invalid_cache_file(project, tmp_path):
+    file_key = cache_utils.get_file_key(tmp_path.joinpath("recipe.json"))
+    project["gg_build_directory"].mkdir()
+    project["gg_build_directory"].joinpath(consts.project_cache_file).write_text("{")
+    assert cache_utils.get_cached_file_data("recipe", file_key) == (False, None)
+
+    cache_utils.update_cached_file_data("recipe", file_key, {})
+    assert cache_utils.get_cached_file_data("recipe", file_key) == (True, {})
+
+
+@pytest.fixture()
+def home_dir(mocker, tmp_path):
+    mocker.patch("pathlib.Path.home", return_value=tmp_path)
+    return tmp_path
+
+
+def test_get_cached_account_number(home_dir):
+    assert cache_utils.get_cached_account_number("key") is None
+
+    cache_utils.update_cached_account_number("key", "123456789012")
+    assert cache_utils.get_cached_account_number("key") == "123456789012"
+    assert cache_utils.get_cached_account_number("other_key") is None
+    cache_file = home_dir.joinpath(consts.user_cache_dir, consts.caller_identity_cache_file)
+    assert os.stat(cache_file).st_mode & 0o777 == 0o600
+
+
+def test_get_cached_account_number_expired(mocker, home_dir):
+    cache_utils.update_cached_account_number("key", "123456789012")
+    mocker.patch("time.time", return_value=time.time() + consts.caller_identity_cache_ttl)
+    assert cache_utils.get_cached_account_number("key") is None
+
+    cache_utils.update_cached_account_number("other_key", "210987654321")
+    cache_file = home_dir.joinpath(consts.user_cache_dir, consts.caller_identity_cache_file)
+    assert list(json.loads(cache_file.read_text())) == ["other_key"]
+
+
+def test_get_cached_account_number_invalid_cache_file(home_dir):
+    home_dir.joinpath(consts.user_cache_dir).mkdir()
+    home_dir.joinpath(consts.user_cache_dir, consts.caller_identity_cache_file).write_text("[")
+    assert cache_utils.get_cached_account_number("key") is None
+
+    cache_utils.update_cached_account_number("key", "123456789012")
+    assert cache_utils.get_cached_account_number("key") == "123456789012"
+
+
+def test_get_cached_account_number_no_home_dir(mocker):
+    mocker.patch("pathlib.Path.home", side_effect=RuntimeError("Could not determine home directory."))
+    cache_utils.update_cached_account_number("key", "123456789012")
+    assert cache_utils.get_cached_account_number("key") is None
+
+
+def test_get_cached_bucket_region(home_dir):
+    assert cache_utils.get_cached_bucket_region("bucket") is None
+    cache_utils.update_cached_bucket_region("bucket", "us-east-1")
+    cache_utils.update_cached_account_number("key", "123456789012")
+    assert cache_utils.get_cached_bucket_region("bucket") == "us-east-1"
+
+    cache_utils.remove_cached_bucket_region("bucket")
+    assert cache_utils.get_cached_bucket_region("bucket") is None
+    assert cache_utils.get_cached_account_number("key") == "123456789012"
@@ -0,0 +1,91 @@
+import gdk.commands.component.build as build
+import gdk.commands.component.command_context as command_context
+import gdk.commands.component.publish as publish
+import pytest
+
+project_config = {"component_name": "component_name", "region": "us-west-2"}
+
+
+@pytest.fixture(autouse=True)
+def context():
+    command_context.reset_context()
+    yield
+    command_context.reset_context()
+
+
+def test_project_config_loaded_once_on_first_use(mocker):
+    mock_get_project_config_values = mocker.patch(
+        "gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config)
+    )
+    context = command_context.get_context()
+    assert not mock_get_project_config_values.called
+
+    assert context.project_config["component_name"] == "component_name"
+    assert context.project_config["region"] == "us-west-2"
+    assert mock_get_project_config_values.call_count == 1
+
+
+def test_get_context_is_shared(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config))
+    assert command_context.get_context() is command_context.get_context()
+
+
+def test_reset_context(mocker):
+    mock_get_project_config_values = mocker.patch(
+        "gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config)
+    )
+    command_context.get_context().project_config
+    command_context.reset_context()
+    command_context.get_context().project_config
+    assert mock_get_project_config_values.call_count == 2
+
+    context = command_context.CommandContext(project_config={"component_name": "other"})
+    command_context.reset_context(context)
+    assert command_context.get_context() is context
+    assert command_context.project_config["component_name"] == "other"
+    assert mock_get_project_config_values.call_count == 2
+
+
+def test_service_client_created_on_first_use(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config))
+    mock_create_s3_client = mocker.patch("gdk.commands.component.project_utils.create_s3_client")
+    mock_create_sts_client = mocker.patch("gdk.commands.component.project_utils.create_sts_client")
+    context = command_context.get_context()
+
+    assert context.get_service_client("s3_client") == mock_create_s3_client.return_value
+    assert context.get_service_client("s3_client") == mock_create_s3_client.return_value
+    mock_create_s3_client.assert_called_once_with("us-west-2", 10)
+    assert not mock_create_sts_client.called
+
+
+def test_s3_client_pool_sized_for_uploads(mocker):
+    config = dict(project_config, upload_options={"max_concurrency": 16})
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=config)
+    mock_create_s3_client = mocker.patch("gdk.commands.component.project_utils.create_s3_client")
+
+    command_context.service_clients["s3_client"]
+    mock_create_s3_client.assert_called_once_with("us-west-2", 16)
+
+
+def test_build_and_publish_share_project_config(mocker):
+    mock_get_project_config_values = mocker.patch(
+        "gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config)
+    )
+    publish.project_config["bucket"] = "default-us-west-2-1234"
+
+    assert build.project_config["bucket"] == "default-us-west-2-1234"
+    assert dict(build.project_config) == dict(command_context.project_config)
+    assert len(build.project_config) == 3
+    del build.project_config["bucket"]
+    assert "bucket" not in publish.project_config
+    assert mock_get_project_config_values.call_count == 1
+
+
+def test_service_clients_view(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=dict(project_config))
+    mock_create_greengrass_client = mocker.patch("gdk.commands.component.project_utils.create_greengrass_client")
+
+    assert set(command_context.service_clients) == {"s3_client", "sts_client", "greengrass_client"}
+    assert len(command_context.service_clients) == 3
+    assert command_context.service_clients["greengrass_client"] == mock_create_greengrass_client.return_value
+    mock_create_greengrass_client.assert_called_once_with("us-west-2")
@@ -18,12 +18,14 @@ def test_component_build(mocker):
 
 
 def test_component_publish(mocker):
-    mocker.patch("gdk.commands.component.project_utils.get_service_clients", return_value=None)
-    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value={"region": "None"})
+    mock_get_project_config_values = mocker.patch("gdk.commands.component.project_utils.get_project_config_values")
+    mock_create_client = mocker.patch("boto3.client")
     mock_component_publish = mocker.patch("gdk.commands.component.publish.run", return_value=None)
     d_args = {"init": None}
     component.publish(d_args)
     assert mock_component_publish.call_count == 1
+    assert not mock_get_project_config_values.called
+    assert not mock_create_client.called
     mock_component_publish.assert_called_with(d_args)
 
 
@@ -0,0 +1,282 @@
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import gdk.commands.component.multi_component as multi_component
+import gdk.commands.component.project_utils as project_utils
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+import pytest
+
+
+def create_component_project(project_dir, name, recipe=True):
+    project_dir.mkdir(parents=True)
+    config = {
+        "component": {
+            name: {
+                "author": "abc",
+                "version": "1.0.0",
+                "build": {"build_system": "zip"},
+                "publish": {"bucket": "default", "region": "us-east-1"},
+            }
+        },
+        "gdk_version": "1.0.0",
+    }
+    project_dir.joinpath(consts.cli_project_config_file).write_text(json.dumps(config))
+    project_dir.joinpath("main.py").write_text("print('hello')")
+    if recipe:
+        recipe_yaml = "ComponentName: {}\nManifests:\n  - Artifacts:\n      - URI: s3://BUCKET/{}.zip\n"
+        project_dir.joinpath("recipe.yaml").write_text(recipe_yaml.format(name, project_dir.name))
+    return project_dir
+
+
+@pytest.fixture()
+def root_dir(mocker, tmp_path):
+    mocker.patch("gdk.common.utils.current_directory", tmp_path)
+    return tmp_path
+
+
+def test_is_multi_component_command(root_dir):
+    assert multi_component.is_multi_component_command({"all": True})
+    assert not multi_component.is_multi_component_command({"all": False})
+
+    root_dir.joinpath(consts.cli_project_config_file).write_text(json.dumps({"components": ["a"], "gdk_version": "1.0.0"}))
+    assert multi_component.is_multi_component_command({})
+
+
+def test_get_component_dirs_found(root_dir):
+    first = create_component_project(root_dir.joinpath("services", "first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    # Projects in hidden, build output and nested directories are not components of the project.
+    create_component_project(root_dir.joinpath(".hidden", "project"), "com.example.Hidden")
+    create_component_project(root_dir.joinpath("node_modules", "project"), "com.example.Module")
+    create_component_project(second.joinpath("nested"), "com.example.Nested")
+
+    assert multi_component.get_component_dirs() == [second, first]
+
+
+def test_get_component_dirs_listed(root_dir):
+    first = create_component_project(root_dir.joinpath("services", "first"), "com.example.First")
+    create_component_project(root_dir.joinpath("services", "second"), "com.example.Second")
+    config = {"components": ["services/first"], "gdk_version": "1.0.0"}
+    root_dir.joinpath(consts.cli_project_config_file).write_text(json.dumps(config))
+
+    assert multi_component.get_component_dirs() == [first]
+
+
+def test_get_component_dirs_listed_not_exists(root_dir):
+    config = {"components": ["services/first"], "gdk_version": "1.0.0"}
+    root_dir.joinpath(consts.cli_project_config_file).write_text(json.dumps(config))
+
+    with pytest.raises(Exception) as e:
+        multi_component.get_component_dirs()
+    assert e.value.args[0] == error_messages.COMPONENT_PROJECT_NOT_FOUND.format(root_dir.joinpath("services", "first"))
+
+
+def test_get_component_dirs_not_found(root_dir):
+    root_dir.joinpath("src").mkdir()
+    with pytest.raises(Exception) as e:
+        multi_component.get_component_dirs()
+    assert e.value.args[0] == error_messages.COMPONENT_PROJECTS_NOT_FOUND
+
+
+def test_build_components(mocker, root_dir, capsys):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    spy_executor = mocker.spy(multi_component, "ProcessPoolExecutor")
+
+    multi_component.build_components({"all": True, "workers": 2})
+
+    spy_executor.assert_called_once_with(max_workers=2)
+    for project_dir in [first, second]:
+        assert project_dir.joinpath(consts.greengrass_build_dir, "recipes", "recipe.yaml").is_file()
+        artifact = "{}.zip".format(project_dir.name)
+        assert list(project_dir.joinpath(consts.greengrass_build_dir, "artifacts").rglob(artifact))
+    output = capsys.readouterr().out
+    assert "first (BUILT)" in output
+    assert "second (BUILT)" in output
+    assert "This component is identified as using 'zip' build system." in output
+
+
+def test_build_components_failed(root_dir, capsys):
+    create_component_project(root_dir.joinpath("first"), "com.example.First")
+    create_component_project(root_dir.joinpath("second"), "com.example.Second", recipe=False)
+
+    with pytest.raises(Exception) as e:
+        multi_component.build_components({"all": True, "workers": 1})
+
+    assert e.value.args[0] == error_messages.MULTI_COMPONENT_COMMAND_FAILED.format("build", 1, 2, "second")
+    output = capsys.readouterr().out
+    assert "first (BUILT)" in output
+    assert "second (FAILED)" in output
+    assert error_messages.PROJECT_RECIPE_FILE_NOT_FOUND in output
+
+
+def add_dependencies(project_dir, *dependencies):
+    recipe_file = project_dir.joinpath("recipe.yaml")
+    recipe_yaml = recipe_file.read_text() + "ComponentDependencies:\n"
+    for dependency in dependencies:
+        recipe_yaml += "  {}:\n    VersionRequirement: '>=1.0.0'\n".format(dependency)
+    recipe_file.write_text(recipe_yaml)
+
+
+def test_get_component_dependencies(root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    third = create_component_project(root_dir.joinpath("third"), "com.example.Third", recipe=False)
+    add_dependencies(second, "com.example.First", "aws.greengrass.Nucleus")
+    recipe = {"ComponentDependencies": {"com.example.First": {}, "com.example.Second": {}}}
+    third.joinpath("recipe.json").write_text(json.dumps(recipe))
+
+    dependencies = multi_component.get_component_dependencies([first, second, third])
+
+    assert dependencies == {first: [], second: [first], third: [first, second]}
+
+
+def test_get_component_dependencies_invalid_project(root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    first.joinpath(consts.cli_project_config_file).write_text("{")
+    assert multi_component.get_component_dependencies([first]) == {first: []}
+
+
+def test_get_component_dependencies_cycle(root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    add_dependencies(first, "com.example.Second")
+    add_dependencies(second, "com.example.First")
+
+    with pytest.raises(Exception) as e:
+        multi_component.get_component_dependencies([first, second])
+    assert e.value.args[0] == error_messages.COMPONENT_DEPENDENCY_CYCLE.format("first -> second -> first")
+
+
+@pytest.fixture()
+def run_component(mocker):
+    # Runs the components on threads with a fake command that records the order in which the components run.
+    events = []
+
+    def fake_run_component(command, component_dir, command_args, log_level):
+        events.append(("start", component_dir.name))
+        error = "error" if component_dir.name.startswith("failing") else None
+        events.append(("end", component_dir.name))
+        result = {"component_dir": component_dir, "error": error, "skipped": False, "output": "", "duration": 0.0}
+        return dict(result, result="arn:{}".format(component_dir.name))
+
+    mocker.patch.object(multi_component, "ProcessPoolExecutor", ThreadPoolExecutor)
+    mocker.patch.object(multi_component, "_run_component", side_effect=fake_run_component)
+    return events
+
+
+def test_publish_components_dependency_order(mocker, root_dir, run_component):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    third = create_component_project(root_dir.joinpath("third"), "com.example.Third")
+    add_dependencies(first, "com.example.Third")
+    add_dependencies(second, "com.example.First", "com.example.Third")
+
+    multi_component.publish_components({"all": True, "workers": 3})
+
+    assert run_component.index(("end", "third")) < run_component.index(("start", "first"))
+    assert run_component.index(("end", "first")) < run_component.index(("start", "second"))
+    first_call = mocker.call(
+        "publish",
+        third,
+        {"all": False, "workers": 3, "latest_component_versions": {}, "refresh_account": False, "wait": False},
+        mocker.ANY,
+    )
+    assert multi_component._run_component.call_args_list[0] == first_call
+
+
+def test_publish_components_refresh_account_once(mocker, root_dir, run_component):
+    create_component_project(root_dir.joinpath("first"), "com.example.First")
+    create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    mock_get_account_number = mocker.patch("gdk.commands.component.project_utils.get_account_number")
+    mock_sts_client = mocker.patch("gdk.commands.component.project_utils.create_sts_client")
+
+    multi_component.publish_components({"all": True, "refresh_account": True})
+
+    mock_get_account_number.assert_called_once_with(mock_sts_client.return_value, refresh=True)
+    assert all(not call[0][2]["refresh_account"] for call in multi_component._run_component.call_args_list)
+
+
+def test_publish_components_wait_on_one_poller(mocker, root_dir, run_component):
+    create_component_project(root_dir.joinpath("first"), "com.example.First")
+    create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    mock_wait_for_components = mocker.patch("gdk.commands.component.wait_utils.wait_for_components")
+
+    multi_component.publish_components({"all": True, "wait": True, "wait_timeout": 30})
+
+    mock_wait_for_components.assert_called_once_with(["arn:first", "arn:second"], 30)
+    assert all(not call[0][2]["wait"] for call in multi_component._run_component.call_args_list)
+
+
+def test_publish_components_dependents_of_failed_skipped(root_dir, run_component, capsys):
+    failing = create_component_project(root_dir.joinpath("failing"), "com.example.Failing")
+    dependent = create_component_project(root_dir.joinpath("dependent"), "com.example.Dependent")
+    create_component_project(root_dir.joinpath("independent"), "com.example.Independent")
+    add_dependencies(dependent, "com.example.Failing")
+
+    with pytest.raises(Exception) as e:
+        multi_component.publish_components({"all": True})
+
+    assert e.value.args[0] == error_messages.MULTI_COMPONENT_COMMAND_FAILED.format("publish", 2, 3, "dependent, failing")
+    assert ("start", "dependent") not in run_component
+    assert ("start", "independent") in run_component
+    output = capsys.readouterr().out
+    assert "dependent (SKIPPED)" in output
+    assert "failing (FAILED)" in output
+    assert "independent (PUBLISHED)" in output
+    assert failing.name in output
+
+
+def test_get_latest_component_versions(mocker, root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    for project_dir in [first, second]:
+        config_file = project_dir.joinpath(consts.cli_project_config_file)
+        config_file.write_text(config_file.read_text().replace('"1.0.0", "build"', '"NEXT_PATCH", "build"'))
+    create_component_project(root_dir.joinpath("third"), "com.example.Third")
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value=None)
+    mock_sts_client = mocker.patch("gdk.commands.component.project_utils.create_sts_client")
+    mock_sts_client.return_value.get_caller_identity.return_value = {"Account": "1234"}
+    mock_greengrass_client = mocker.patch("gdk.commands.component.project_utils.create_greengrass_client")
+    mock_get_latest_versions = mocker.patch(
+        "gdk.commands.component.version_utils.get_latest_component_versions", return_value={"arn": "1.0.0"}
+    )
+
+    assert multi_component.get_latest_component_versions([first, second, root_dir.joinpath("third")]) == {"arn": "1.0.0"}
+
+    mock_greengrass_client.assert_called_once_with("us-east-1")
+    arns = ["arn:aws:greengrass:us-east-1:1234:components:com.example.{}".format(name) for name in ["First", "Second"]]
+    mock_get_latest_versions.assert_called_once_with(mock_greengrass_client.return_value, arns)
+
+
+def test_get_latest_component_versions_error(mocker, root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    config_file = first.joinpath(consts.cli_project_config_file)
+    config_file.write_text(config_file.read_text().replace('"1.0.0", "build"', '"NEXT_PATCH", "build"'))
+    mocker.patch("gdk.commands.component.project_utils.create_sts_client", side_effect=Exception("no credentials"))
+
+    assert multi_component.get_latest_component_versions([first]) == {}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="Workers are not forked from the test process.")
+def test_run_components_workers_do_not_reuse_clients(mocker, root_dir):
+    first = create_component_project(root_dir.joinpath("first"), "com.example.First")
+    second = create_component_project(root_dir.joinpath("second"), "com.example.Second")
+    mocker.patch.object(project_utils, "_clients", {})
+    mocker.patch.object(project_utils, "_session", None)
+    mocker.patch.object(project_utils, "_botocore_session", None)
+    parent_client = project_utils.create_sts_client("us-east-1")
+    # The parent client is at the same address in the memory of a forked worker, so its id identifies it in the worker.
+    mocker.patch(
+        "gdk.commands.component.component.build",
+        side_effect=lambda _: (id(project_utils.get_session()), id(project_utils.create_sts_client("us-east-1"))),
+    )
+
+    results = multi_component.run_components("build", [first, second], {"workers": 2})
+
+    for component_dir in [first, second]:
+        session_id, client_id = results[component_dir]["result"]
+        assert session_id != id(project_utils.get_session())
+        assert client_id != id(parent_client)
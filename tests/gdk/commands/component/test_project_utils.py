@@ -1,8 +1,9 @@
 import json
 from pathlib import Path
-from unittest.mock import mock_open, patch
+from unittest.mock import ANY, mock_open, patch
 
 import gdk.commands.component.project_utils as project_utils
+import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import pytest
 import yaml
@@ -28,6 +29,13 @@ with open(valid_yaml_recipe_file, "r") as f:
     parsed_yaml_recipe_file = yaml.safe_load(f.read())
 
 
+@pytest.fixture(autouse=True)
+def project_dir(mocker, tmp_path):
+    # Keeps the project cache written by the project config functions out of the working directory.
+    mocker.patch("gdk.common.utils.current_directory", tmp_path)
+    return tmp_path
+
+
 def test_get_recipe_file_not_exists():
     # Checks in the current directory for json or yaml files. Since none of them are present, this will raise an exception
     with pytest.raises(Exception) as e:
@@ -175,6 +183,8 @@ def test_get_project_config_values(mocker):
     assert "gg_build_component_artifacts_dir" in values
     assert "component_recipe_file" in values
     assert "parsed_component_recipe" in values
+    assert "upload_options" in values
+    assert "zip_options" in values
 
 
 def test_get_project_config_values_invalid_config(mocker):
@@ -267,25 +277,175 @@ def test_service_clients(mocker):
     mock_greengrass_client.assert_any_call("region")
 
 
-def test_service_clients_with_s3_region(mocker):
-    mock_boto3_client = mocker.patch("boto3.client", return_value=None)
-    project_utils.create_s3_client("region")
-    assert mock_boto3_client.call_count == 1
-    mock_boto3_client.assert_called_once_with("s3", region_name="region")
+@pytest.fixture()
+def mock_session(mocker, mock_botocore_session):
+    mocker.patch.object(project_utils, "_clients", {})
+    mocker.patch.object(project_utils, "_session", None)
+    return mocker.patch("boto3.session.Session")
+
+
+@pytest.fixture()
+def mock_botocore_session(mocker):
+    mocker.patch.object(project_utils, "_botocore_session", None)
+    return mocker.patch("botocore.session.Session")
+
 
+def assert_client_created(mock_session, service_name, region, max_pool_connections=10):
+    mock_client = mock_session.return_value.client
+    mock_client.assert_called_once_with(service_name, region_name=region, config=ANY)
+    config = mock_client.call_args[1]["config"]
+    assert config.max_pool_connections == max_pool_connections
+    assert config.retries == {"mode": "adaptive", "max_attempts": 5}
+    assert config.tcp_keepalive
 
-def test_service_clients_with_greengrassv2_region(mocker):
-    mock_boto3_client = mocker.patch("boto3.client", return_value=None)
+
+def test_service_clients_with_s3_region(mocker, mock_session):
+    assert project_utils.create_s3_client("region", 25) == mock_session.return_value.client.return_value
+    assert_client_created(mock_session, "s3", "region", 25)
+
+
+def test_service_clients_with_greengrassv2_region(mocker, mock_session):
     project_utils.create_greengrass_client("region")
-    assert mock_boto3_client.call_count == 1
-    mock_boto3_client.assert_called_once_with("greengrassv2", region_name="region")
+    assert_client_created(mock_session, "greengrassv2", "region")
 
 
-def test_service_clients_with_sts_region(mocker):
-    mock_boto3_client = mocker.patch("boto3.client", return_value=None)
+def test_service_clients_with_sts_region(mocker, mock_session):
     project_utils.create_sts_client("region")
-    assert mock_boto3_client.call_count == 1
-    mock_boto3_client.assert_called_once_with("sts", region_name="region")
+    assert_client_created(mock_session, "sts", "region")
+
+
+def test_service_clients_reused_from_shared_session(mocker, mock_session):
+    mock_session.return_value.client.side_effect = lambda *args, **kwargs: mocker.Mock()
+    s3_client = project_utils.create_s3_client("region")
+    assert project_utils.create_s3_client("region") is s3_client
+    assert project_utils.create_s3_client("other-region") is not s3_client
+    assert project_utils.create_s3_client("region", 20) is not s3_client
+    project_utils.create_greengrass_client("region")
+    assert mock_session.call_count == 1
+    assert mock_session.return_value.client.call_count == 4
+
+
+def test_get_session_wraps_botocore_session(mock_session, mock_botocore_session):
+    assert project_utils.get_session() == mock_session.return_value
+    mock_session.assert_called_once_with(botocore_session=mock_botocore_session.return_value)
+
+
+def test_reset_clients(mocker, mock_session):
+    mock_session.side_effect = lambda botocore_session: mocker.Mock()
+    s3_client = project_utils.create_s3_client("region")
+    session = project_utils.get_session()
+
+    project_utils.reset_clients()
+
+    assert project_utils.get_session() is not session
+    assert project_utils.create_s3_client("region") is not s3_client
+    assert mock_session.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "upload_options, max_pool_connections",
+    [
+        ({}, 10),
+        ({"max_concurrency": 4}, 10),
+        ({"max_concurrency": 32}, 32),
+        ({"max_concurrency": 32, "max_pool_connections": 8}, 8),
+    ],
+)
+def test_get_max_pool_connections(upload_options, max_pool_connections):
+    assert project_utils.get_max_pool_connections(upload_options) == max_pool_connections
+
+
+def test_get_credentials_key(mocker, mock_session, mock_botocore_session):
+    from botocore.credentials import Credentials
+
+    mock_session.return_value.profile_name = "default"
+    mock_botocore_session.return_value.get_scoped_config.return_value = {}
+    mock_session.return_value.get_credentials.return_value = Credentials("access_key", "secret_key", method="env")
+    static_key = project_utils.get_credentials_key()
+    mock_session.return_value.get_credentials.return_value = Credentials("other_key", "secret_key", method="env")
+    assert project_utils.get_credentials_key() != static_key
+
+    mock_session.return_value.get_credentials.return_value = None
+    assert project_utils.get_credentials_key() is None
+
+
+def mock_refreshable_credentials(
+    mocker, mock_session, mock_botocore_session, method, access_key="access_key", profile_config=None
+):
+    from botocore.credentials import RefreshableCredentials
+
+    mock_session.return_value.profile_name = "default"
+    mock_botocore_session.return_value.get_scoped_config.return_value = profile_config or {}
+    credentials = mocker.Mock(spec=RefreshableCredentials, method=method, access_key=access_key)
+    mock_session.return_value.get_credentials.return_value = credentials
+
+
+@pytest.mark.parametrize(
+    "method, profile_config, env",
+    [
+        ("assume-role-with-web-identity", {}, {"AWS_ROLE_ARN": "arn:aws:iam::{}:role/ci"}),
+        ("assume-role-with-web-identity", {"role_arn": "arn:aws:iam::{}:role/ci"}, {}),
+        ("assume-role", {"role_arn": "arn:aws:iam::{}:role/ci"}, {}),
+        ("sso", {"sso_account_id": "{}", "sso_role_name": "ci"}, {}),
+    ],
+)
+def test_get_credentials_key_configured_role(mocker, mock_session, mock_botocore_session, method, profile_config, env):
+    # The access key of the refreshed credentials changes without changing the key. The account of the role does.
+    keys = []
+    for account, access_key in [("1111", "first_key"), ("1111", "refreshed_key"), ("2222", "first_key")]:
+        mocker.patch.dict("os.environ", {name: value.format(account) for name, value in env.items()})
+        config = {name: value.format(account) for name, value in profile_config.items()}
+        mock_refreshable_credentials(mocker, mock_session, mock_botocore_session, method, access_key, config)
+        keys.append(project_utils.get_credentials_key())
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+
+
+@pytest.mark.parametrize("method", ["container-role", "iam-role", "assume-role"])
+def test_get_credentials_key_refreshable_without_role(mocker, mock_session, mock_botocore_session, method):
+    mock_refreshable_credentials(mocker, mock_session, mock_botocore_session, method, "first_key")
+    first_key = project_utils.get_credentials_key()
+    mock_refreshable_credentials(mocker, mock_session, mock_botocore_session, method, "other_key")
+    assert project_utils.get_credentials_key() != first_key
+
+    mock_refreshable_credentials(mocker, mock_session, mock_botocore_session, method, None)
+    assert project_utils.get_credentials_key() is None
+
+
+def test_get_account_number_cached(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value="key")
+    mock_get_cached = mocker.patch("gdk.commands.component.cache_utils.get_cached_account_number", return_value="1234")
+    mock_update_cached = mocker.patch("gdk.commands.component.cache_utils.update_cached_account_number")
+    mock_sts_client = mocker.Mock()
+
+    assert project_utils.get_account_number(mock_sts_client) == "1234"
+    mock_get_cached.assert_called_once_with("key")
+    assert not mock_sts_client.get_caller_identity.called
+    assert not mock_update_cached.called
+
+
+@pytest.mark.parametrize("credentials_key, cached_account, refresh", [("key", None, False), ("key", "1234", True)])
+def test_get_account_number_not_cached(mocker, credentials_key, cached_account, refresh):
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value=credentials_key)
+    mocker.patch("gdk.commands.component.cache_utils.get_cached_account_number", return_value=cached_account)
+    mock_update_cached = mocker.patch("gdk.commands.component.cache_utils.update_cached_account_number")
+    mock_sts_client = mocker.Mock()
+    mock_sts_client.get_caller_identity.return_value = {"Account": "5678"}
+
+    assert project_utils.get_account_number(mock_sts_client, refresh) == "5678"
+    mock_update_cached.assert_called_once_with("key", "5678")
+
+
+def test_get_account_number_no_credentials_key(mocker):
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value=None)
+    mock_get_cached = mocker.patch("gdk.commands.component.cache_utils.get_cached_account_number")
+    mock_update_cached = mocker.patch("gdk.commands.component.cache_utils.update_cached_account_number")
+    mock_sts_client = mocker.Mock()
+    mock_sts_client.get_caller_identity.return_value = {"Account": "5678"}
+
+    assert project_utils.get_account_number(mock_sts_client) == "5678"
+    assert not mock_get_cached.called
+    assert not mock_update_cached.called
 
 
 def test_get_supported_component_builds_not_exists(mocker):
@@ -303,3 +463,99 @@ def test_get_supported_component_builds_exists(mocker):
         mock_file.assert_called_once_with(mock_file_path, "r")
         assert mock_file_not_exists.called
         assert mock_json_loads.called
+
+
+def test_get_upload_options_default():
+    upload_options = project_utils.get_upload_options({"bucket": "default", "region": "region"})
+    assert upload_options == consts.default_upload_options
+
+
+def test_get_upload_options_override():
+    publish_config = {"bucket": "default", "region": "region", "upload_options": {"max_concurrency": 32}}
+    upload_options = project_utils.get_upload_options(publish_config)
+    assert upload_options["max_concurrency"] == 32
+    assert upload_options["part_size_mb"] == consts.default_upload_options["part_size_mb"]
+
+
+def test_get_zip_options_default():
+    zip_options = project_utils.get_zip_options({"build_system": "zip"})
+    assert zip_options == consts.default_zip_options
+
+
+def test_get_zip_options_override():
+    zip_options = project_utils.get_zip_options({"build_system": "zip", "zip_options": {"compression_level": 1}})
+    assert zip_options["compression_level"] == 1
+    assert zip_options["store_extensions"] == consts.default_zip_options["store_extensions"]
+
+
+def get_valid_config():
+    config = json.loads(json.dumps(parsed_config_file))
+    config["component"]["component_name"]["publish"]["region"] = "us-east-1"
+    return config
+
+
+def test_get_project_configuration_cached(mocker, project_dir):
+    config_file = project_dir.joinpath(consts.cli_project_config_file)
+    config_file.write_text(json.dumps(get_valid_config()))
+    spy_get_configuration = mocker.spy(project_utils.config_actions, "get_configuration")
+
+    assert project_utils.get_project_configuration() == get_valid_config()
+    assert project_utils.get_project_configuration() == get_valid_config()
+    assert spy_get_configuration.call_count == 1
+    assert project_dir.joinpath(consts.greengrass_build_dir, consts.project_cache_file).is_file()
+
+
+def test_get_project_configuration_cache_invalidated(mocker, project_dir):
+    config_file = project_dir.joinpath(consts.cli_project_config_file)
+    config_file.write_text(json.dumps(get_valid_config()))
+    project_utils.get_project_configuration()
+
+    config = get_valid_config()
+    config["component"]["component_name"]["version"] = "2.0.0"
+    config_file.write_text(json.dumps(config))
+    spy_get_configuration = mocker.spy(project_utils.config_actions, "get_configuration")
+
+    assert project_utils.get_project_configuration() == config
+    assert spy_get_configuration.call_count == 1
+
+
+def test_get_project_configuration_invalid_config_not_cached(mocker, project_dir):
+    config_file = project_dir.joinpath(consts.cli_project_config_file)
+    config_file.write_text(json.dumps({"component": {}}))
+    for _ in range(2):
+        with pytest.raises(Exception) as e:
+            project_utils.get_project_configuration()
+        assert "Please correct its format and try again." in e.value.args[0]
+    assert not project_dir.joinpath(consts.greengrass_build_dir, consts.project_cache_file).exists()
+
+
+def test_get_parsed_recipe_cached(mocker, project_dir):
+    recipe_file = project_dir.joinpath("recipe.yaml")
+    recipe_file.write_text(valid_yaml_recipe_file.read_text())
+    spy_parse_recipe_file = mocker.spy(project_utils, "parse_recipe_file")
+
+    assert project_utils.get_parsed_recipe(recipe_file) == parsed_yaml_recipe_file
+    assert project_utils.get_parsed_recipe(recipe_file) == parsed_yaml_recipe_file
+    assert spy_parse_recipe_file.call_count == 1
+
+    recipe_file.write_text(valid_yaml_recipe_file.read_text().replace("1.0.0", "1.0.1"))
+    assert project_utils.get_parsed_recipe(recipe_file)["ComponentVersion"] == "1.0.1"
+    assert spy_parse_recipe_file.call_count == 2
+
+
+def test_get_parsed_recipe_not_json_serializable_not_cached(mocker, project_dir):
+    recipe_file = project_dir.joinpath("recipe.yaml")
+    recipe_file.write_text("ComponentName: com.example.Date\nReleaseDate: 2021-01-01\n")
+    spy_parse_recipe_file = mocker.spy(project_utils, "parse_recipe_file")
+
+    project_utils.get_parsed_recipe(recipe_file)
+    project_utils.get_parsed_recipe(recipe_file)
+    assert spy_parse_recipe_file.call_count == 2
+
+
+def test_get_project_config_values_multi_component_config(mocker):
+    config = {"components": ["services/first"], "gdk_version": "1.0.0"}
+    mocker.patch("gdk.common.configuration.get_configuration", return_value=config)
+    with pytest.raises(Exception) as e:
+        project_utils.get_project_config_values()
+    assert e.value.args[0] == error_messages.PROJECT_CONFIG_LISTS_COMPONENTS
@@ -1,11 +1,19 @@
+import base64
+import copy
+import hashlib
+import json
+import logging
 from pathlib import Path
 from unittest import mock
 
 import boto3
+import gdk.commands.component.command_context as command_context
+import gdk.commands.component.publish as publish
 import pytest
 from gdk.common.exceptions import error_messages
 from urllib3.exceptions import HTTPError
 
+checkpoint_dir = Path("/src/GDK-CLI-Internal/greengrass-build").joinpath(".upload_checkpoints")
 json_values = {
     "component_name": "component_name",
     "component_config": {
@@ -18,6 +26,14 @@ json_values = {
     "component_author": "abc",
     "bucket": "default",
     "region": "default",
+    "upload_options": {
+        "part_size_mb": 8,
+        "max_concurrency": 10,
+        "throughput_summary": False,
+        "skip_unchanged": False,
+        "resumable": True,
+        "stale_upload_ttl_hours": 24,
+    },
     "gg_build_directory": Path("/src/GDK-CLI-Internal/greengrass-build"),
     "gg_build_artifacts_dir": Path("/src/GDK-CLI-Internal/greengrass-build/artifacts"),
     "gg_build_recipes_dir": Path("/src/GDK-CLI-Internal/greengrass-build/recipes"),
@@ -41,10 +57,15 @@ json_values = {
     "artifact_uri": "s3://default/component_name/1.0.0",
 }
 
-with mock.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=json_values) as mock_method:
-    mock_client = mock.patch("boto3.client", return_value=None)
-    mock.patch("gdk.commands.component.project_utils.get_service_clients", return_value={})
-    import gdk.commands.component.publish as publish
+
+@pytest.fixture(autouse=True)
+def project_config(mocker, tmp_path):
+    mocker.patch("gdk.commands.component.project_utils.get_project_config_values", return_value=copy.deepcopy(json_values))
+    mocker.patch("pathlib.Path.home", return_value=tmp_path)
+    mocker.patch.dict("gdk.commands.component.version_utils._latest_versions", clear=True)
+    command_context.reset_context()
+    yield
+    command_context.reset_context()
 
 
 def test_create_publish_recipe_file_json(mocker):
@@ -332,13 +353,17 @@ def test_get_component_version_from_config(mocker):
 
 
 def test_get_component_version_from_config_next_patch(mocker):
-    publish.project_config = {
-        "component_name": "component_name",
-        "component_version": "NEXT_PATCH",
-        "component_author": "abc",
-        "bucket": "default",
-        "region": "default",
-    }
+    mocker.patch.object(
+        publish,
+        "project_config",
+        {
+            "component_name": "component_name",
+            "component_version": "NEXT_PATCH",
+            "component_author": "abc",
+            "bucket": "default",
+            "region": "default",
+        },
+    )
     mock_get_next_version = mocker.patch("gdk.commands.component.publish.get_next_version", return_value="1.0.1")
     version = publish.get_component_version_from_config()
     assert version == mock_get_next_version.return_value
@@ -346,6 +371,7 @@ def test_get_component_version_from_config_next_patch(mocker):
 
 
 def test_get_component_version_from_config_exception(mocker):
+    publish.project_config["component_version"] = "NEXT_PATCH"
     mock_get_next_version = mocker.patch(
         "gdk.commands.component.publish.get_next_version", return_value="", side_effect=HTTPError("some error")
     )
@@ -367,16 +393,19 @@ def test_get_next_version_component_not_exists(mocker):
 
 
 def test_get_next_version_component_already_exists(mocker):
+    publish.project_config["account_number"] = "1234"
     mock_get_next_patch_component_version = mocker.patch(
         "gdk.commands.component.publish.get_next_patch_component_version", return_value="1.0.6"
     )
 
     version = publish.get_next_version()
     assert version == "1.0.7"
+    assert publish.project_config["latest_component_version"] == "1.0.6"
     assert mock_get_next_patch_component_version.call_count == 1
 
 
 def test_get_next_version_component_already_exists_semver(mocker):
+    publish.project_config["account_number"] = "1234"
     mock_get_next_patch_component_version = mocker.patch(
         "gdk.commands.component.publish.get_next_patch_component_version", return_value="1.0.6-x-y-z"
     )
@@ -396,37 +425,41 @@ def test_get_next_version_component_exception(mocker):
     assert e.value.args[0] == "Failed to calculate the next version of the component during publish.\nsome error"
 
 
+def mock_list_component_versions(mocker, *pages, side_effect=None):
+    mock_client = mocker.Mock()
+    mock_paginate = mock_client.get_paginator.return_value.paginate
+    mock_paginate.return_value = [{"componentVersions": [{"componentVersion": v} for v in page]} for page in pages]
+    mock_paginate.side_effect = side_effect
+    mocker.patch.object(publish, "service_clients", {"greengrass_client": mock_client})
+    return mock_client
+
+
 def test_get_next_patch_component_version(mocker):
     publish.project_config["account_number"] = "1234"
-    mock_client = mocker.patch("boto3.client", return_value=None)
-    publish.service_clients = {"greengrass_client": mock_client}
-    response = {"componentVersions": [{"componentVersion": "1.0.4"}, {"componentVersion": "1.0.1"}]}
-    mock_get_next_patch_component_version = mocker.patch("boto3.client.list_component_versions", return_value=response)
+    mock_client = mock_list_component_versions(mocker, ["1.0.4", "1.0.10-beta"], ["1.0.9", "1.0.1"])
     li = publish.get_next_patch_component_version("c_name", "region", "1234")
-    assert mock_get_next_patch_component_version.call_count == 1
-    assert li == "1.0.4"
+    mock_client.get_paginator.assert_called_once_with("list_component_versions")
+    mock_paginate = mock_client.get_paginator.return_value.paginate
+    mock_paginate.assert_called_once_with(arn="arn:aws:greengrass:region:1234:components:c_name")
+    assert li == "1.0.10-beta"
+
+    # Versions are listed once per run.
+    assert publish.get_next_patch_component_version("c_name", "region", "1234") == "1.0.10-beta"
+    assert mock_paginate.call_count == 1
 
 
 def test_get_next_patch_component_version_no_components(mocker):
-    mock_client = mocker.patch("boto3.client", return_value=None)
-    publish.service_clients = {"greengrass_client": mock_client}
-    mock_get_next_patch_component_version = mocker.patch(
-        "boto3.client.list_component_versions", return_value={"componentVersions": []}
-    )
+    mock_client = mock_list_component_versions(mocker, [])
     li = publish.get_next_patch_component_version("c_name", "region", "1234")
-    assert mock_get_next_patch_component_version.call_count == 1
+    assert mock_client.get_paginator.return_value.paginate.call_count == 1
     assert not li
 
 
 def test_get_next_patch_component_version_exception(mocker):
-    mock_client = mocker.patch("boto3.client", return_value=None)
-    publish.service_clients = {"greengrass_client": mock_client}
-    mock_get_next_patch_component_version = mocker.patch(
-        "boto3.client.list_component_versions", side_effect=HTTPError("listing error")
-    )
+    mock_client = mock_list_component_versions(mocker, side_effect=HTTPError("listing error"))
     with pytest.raises(Exception) as e:
         publish.get_next_patch_component_version("c_name", "region", "1234")
-    assert mock_get_next_patch_component_version.call_count == 1
+    assert mock_client.get_paginator.return_value.paginate.call_count == 1
     assert (
         e.value.args[0]
         == "Error while getting the component versions of 'c_name' in 'region' from the account '1234' during publish.\nlisting error"
@@ -436,13 +469,13 @@ def test_get_next_patch_component_version_exception(mocker):
 def test_create_gg_component(mocker):
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"greengrass_client": mock_client}
-    mock_create_component = mocker.patch("boto3.client.create_component_version", return_value=None)
+    mock_create_component = mocker.patch("boto3.client.create_component_version", return_value={"arn": "component_arn"})
     publish.project_config["publish_recipe_file"] = Path("some-recipe.yaml")
     component_name = "component_name"
     component_version = "1.0.0"
 
     with mock.patch("builtins.open", mock.mock_open()) as mock_file:
-        publish.create_gg_component(component_name, component_version)
+        assert publish.create_gg_component(component_name, component_version) == "component_arn"
         mock_file.assert_any_call(publish.project_config["publish_recipe_file"])
         assert mock_create_component.call_count == 1
 
@@ -490,7 +523,7 @@ def test_create_bucket_exception(mocker):
 
 
 def test_upload_artifacts_no_artifacts(mocker):
-    publish.project_config = json_values
+    mocker.patch.object(publish, "project_config", json_values)
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"s3_client": mock_client}
     response = {"Buckets": [{"Name": "test-bucket"}]}
@@ -499,62 +532,107 @@ def test_upload_artifacts_no_artifacts(mocker):
     mock_upload_file = mocker.patch("boto3.client.upload_file", return_value=response)
     publish.upload_artifacts_s3("name", "version")
     assert mock_iter_dir.call_count == 1
-    assert mock_create_bucket.call_count == 1
+    assert not mock_create_bucket.called
     assert not mock_upload_file.called
 
 
 def test_upload_artifacts(mocker):
-    publish.project_config = json_values
+    mocker.patch.object(publish, "project_config", json_values)
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"s3_client": mock_client}
     mock_iter_dir = mocker.patch("pathlib.Path.iterdir", return_value=[Path("hello.py")])
     mock_create_bucket = mocker.patch("boto3.client.create_bucket", return_value=None)
-    mock_upload_file = mocker.patch("boto3.client.upload_file", return_value=None)
+    mock_upload_files = mocker.patch("gdk.commands.component.transfer_utils.upload_files", return_value=[])
     publish.upload_artifacts_s3("name", "1.0.0")
     assert mock_iter_dir.call_count == 1
-    assert mock_create_bucket.call_count == 1
-    assert mock_upload_file.call_count == 1
+    assert not mock_create_bucket.called
+    assert mock_upload_files.call_count == 1
     s3_file_path = "name/1.0.0/hello.py"
-    mock_upload_file.assert_any_call(str(Path("hello.py").resolve()), json_values["bucket"], s3_file_path)
+    mock_upload_files.assert_any_call(
+        mock_client,
+        json_values["bucket"],
+        [(Path("hello.py"), s3_file_path)],
+        json_values["upload_options"],
+        {},
+        checkpoint_dir,
+    )
 
 
 def test_upload_artifacts_region_us_east_1(mocker):
-    publish.project_config = json_values
+    mocker.patch.object(publish, "project_config", json_values)
     publish.project_config["region"] = "us-east-1"
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"s3_client": mock_client}
     mock_iter_dir = mocker.patch("pathlib.Path.iterdir", return_value=[Path("hello.py")])
     mock_create_bucket = mocker.patch("boto3.client.create_bucket", return_value=None)
-    mock_upload_file = mocker.patch("boto3.client.upload_file", return_value=None)
+    mock_upload_files = mocker.patch("gdk.commands.component.transfer_utils.upload_files", return_value=[])
     publish.upload_artifacts_s3("name", "1.0.0")
     assert mock_iter_dir.call_count == 1
-    assert mock_create_bucket.call_count == 1
-    assert mock_upload_file.call_count == 1
+    assert not mock_create_bucket.called
+    assert mock_upload_files.call_count == 1
     s3_file_path = "name/1.0.0/hello.py"
-    mock_upload_file.assert_any_call(str(Path("hello.py").resolve()), json_values["bucket"], s3_file_path)
+    mock_upload_files.assert_any_call(
+        mock_client,
+        json_values["bucket"],
+        [(Path("hello.py"), s3_file_path)],
+        json_values["upload_options"],
+        {},
+        checkpoint_dir,
+    )
+
+
+def test_upload_artifacts_with_latest_version(mocker):
+    mocker.patch.object(publish, "project_config", json_values)
+    publish.project_config["latest_component_version"] = "1.0.0"
+    mock_client = mocker.patch("boto3.client", return_value=None)
+    publish.service_clients = {"s3_client": mock_client}
+    mocker.patch("pathlib.Path.iterdir", return_value=[Path("hello.py")])
+    mocker.patch("boto3.client.create_bucket", return_value=None)
+    mock_upload_files = mocker.patch("gdk.commands.component.transfer_utils.upload_files", return_value=[])
+    publish.upload_artifacts_s3("name", "1.0.1")
+    del publish.project_config["latest_component_version"]
+    mock_upload_files.assert_called_once_with(
+        mock_client,
+        json_values["bucket"],
+        [(Path("hello.py"), "name/1.0.1/hello.py")],
+        json_values["upload_options"],
+        {"name/1.0.1/hello.py": "name/1.0.0/hello.py"},
+        checkpoint_dir,
+    )
 
 
 def test_upload_artifacts_exception(mocker):
-    publish.project_config = json_values
+    mocker.patch.object(publish, "project_config", json_values)
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"s3_client": mock_client}
     mock_iter_dir = mocker.patch("pathlib.Path.iterdir", return_value=[Path("hello.py")])
     mock_create_bucket = mocker.patch("boto3.client.create_bucket", return_value=None)
-    # mock_dir_exists = mocker.patch("gdk.common.utils.dir_exists", return_value=True)
-    mock_upload_file = mocker.patch("boto3.client.upload_file", return_value=None, side_effect=HTTPError("some error"))
+    mock_upload_files = mocker.patch(
+        "gdk.commands.component.transfer_utils.upload_files", return_value=None, side_effect=HTTPError("some error")
+    )
     with pytest.raises(Exception) as e:
         publish.upload_artifacts_s3("name", "1.0.0")
     assert "some error" in e.value.args[0]
-    # assert mock_dir_exists.call_count == 1
     assert mock_iter_dir.call_count == 1
-    assert mock_create_bucket.call_count == 1
-    assert mock_upload_file.call_count == 1
-    s3_file_path = "name/1.0.0/hello.py"
-    mock_upload_file.assert_any_call(str(Path("hello.py").resolve()), json_values["bucket"], s3_file_path)
+    assert not mock_create_bucket.called
+    assert mock_upload_files.call_count == 1
+
+
+def test_publish_run_refresh_account(mocker):
+    mock_get_account_num = mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value=None)
+    mocker.patch("gdk.commands.component.publish.upload_artifacts_s3", return_value=None)
+    mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file", return_value=None)
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+    mocker.patch("gdk.commands.component.publish.create_gg_component", return_value=None)
+    publish.run({"refresh_account": True})
+    mock_get_account_num.assert_called_once_with(True)
 
 
 def test_publish_run_not_build(mocker):
     mock_get_account_num = mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mock_prepare_bucket = mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
     mock_get_component_version_from_config = mocker.patch(
         "gdk.commands.component.publish.get_component_version_from_config", return_value=None
     )
@@ -575,10 +653,12 @@ def test_publish_run_not_build(mocker):
     assert mock_upload_artifacts_s3.call_count == 1
     assert mock_update_and_create_recipe_file.call_count == 1
     assert mock_create_gg_component.call_count == 1
+    mock_prepare_bucket.assert_called_once_with("default-us-east-1-1234", "us-east-1")
 
 
 def test_publish_run_build(mocker):
     mock_get_account_num = mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mock_prepare_bucket = mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
     mock_get_component_version_from_config = mocker.patch(
         "gdk.commands.component.publish.get_component_version_from_config", return_value=None
     )
@@ -600,10 +680,12 @@ def test_publish_run_build(mocker):
     assert mock_upload_artifacts_s3.call_count == 1
     assert mock_update_and_create_recipe_file.call_count == 1
     assert mock_create_gg_component.call_count == 1
+    mock_prepare_bucket.assert_called_once_with("default-us-east-1-1234", "us-east-1")
 
 
 def test_publish_run_exception(mocker):
     mock_get_account_num = mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mock_prepare_bucket = mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
     mock_get_component_version_from_config = mocker.patch(
         "gdk.commands.component.publish.get_component_version_from_config",
         return_value=None,
@@ -614,6 +696,7 @@ def test_publish_run_exception(mocker):
         "gdk.commands.component.publish.update_and_create_recipe_file", return_value=None
     )
     mock_create_gg_component = mocker.patch("gdk.commands.component.publish.create_gg_component", return_value=None)
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
     publish.project_config["bucket"] = "default"
     with pytest.raises(Exception) as e:
         publish.run({})
@@ -622,11 +705,199 @@ def test_publish_run_exception(mocker):
     assert e.value.args[0] == "{}\n{}".format(error_messages.PUBLISH_FAILED, "some error")
     assert mock_get_account_num.call_count == 1
     assert mock_get_component_version_from_config.call_count == 1
+    assert mock_prepare_bucket.call_count == 1
     assert mock_upload_artifacts_s3.call_count == 0
     assert mock_update_and_create_recipe_file.call_count == 0
     assert mock_create_gg_component.call_count == 0
 
 
+def test_publish_run_logs_step_timings(mocker, caplog):
+    caplog.set_level(logging.INFO)
+    mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value="1.0.0")
+    mocker.patch("gdk.commands.component.publish.upload_artifacts_s3", return_value=None)
+    mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file", return_value=None)
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+    mock_create_gg_component = mocker.patch("gdk.commands.component.publish.create_gg_component", return_value=None)
+    publish.run({})
+    mock_create_gg_component.assert_called_once_with("component_name", "1.0.0")
+    assert "Publish steps completed in" in caplog.text
+    for step in ["account", "build", "version", "bucket", "upload", "recipe", "create"]:
+        assert "{} ".format(step) in caplog.text
+
+
+def test_get_publish_steps_dependencies():
+    steps = publish.get_publish_steps("component_name")
+    dependencies = {name: dependencies for name, (_, dependencies) in steps.items()}
+    assert dependencies == {
+        "account": [],
+        "build": ["account"],
+        "version": ["account"],
+        "bucket": ["account"],
+        "upload": ["build", "bucket", "version"],
+        "recipe": ["build", "version"],
+        "create": ["upload", "recipe"],
+    }
+
+
+def test_publish_run_build_reads_bucket_with_account(mocker):
+    mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value="1.0.0")
+    mocker.patch("gdk.commands.component.publish.upload_artifacts_s3", return_value=None)
+    mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file", return_value=None)
+    mocker.patch("gdk.commands.component.publish.create_gg_component", return_value=None)
+    build_buckets = []
+    mocker.patch(
+        "gdk.commands.component.publish.build_if_not_built",
+        side_effect=lambda _: build_buckets.append(publish.project_config["bucket"]),
+    )
+    publish.run({})
+    assert build_buckets == ["default-us-east-1-1234"]
+
+
+def test_get_publish_steps_dependencies_idempotent():
+    steps = publish.get_publish_steps("component_name", idempotent=True)
+    dependencies = {name: dependencies for name, (_, dependencies) in steps.items()}
+    assert dependencies["reuse"] == ["build", "version"]
+    assert dependencies["upload"] == ["build", "bucket", "version", "reuse"]
+    assert dependencies["recipe"] == ["build", "version", "reuse"]
+    assert dependencies["create"] == ["upload", "recipe"]
+
+
+def test_publish_run_idempotent_reuses_latest_version(mocker):
+    mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value="1.0.1")
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+    mock_get_reusable = mocker.patch(
+        "gdk.commands.component.publish.get_reusable_component_version", return_value="latest_component_arn"
+    )
+    mock_upload_artifacts_s3 = mocker.patch("gdk.commands.component.publish.upload_artifacts_s3")
+    mock_update_and_create_recipe_file = mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file")
+    mock_create_gg_component = mocker.patch("gdk.commands.component.publish.create_gg_component")
+
+    assert publish.run({"idempotent": True}) == "latest_component_arn"
+    mock_get_reusable.assert_called_once_with("component_name")
+    assert not mock_upload_artifacts_s3.called
+    assert not mock_update_and_create_recipe_file.called
+    assert not mock_create_gg_component.called
+
+
+def test_publish_run_idempotent_changed(mocker):
+    mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value="1.0.1")
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+    mocker.patch("gdk.commands.component.publish.get_reusable_component_version", return_value=None)
+    mock_upload_artifacts_s3 = mocker.patch("gdk.commands.component.publish.upload_artifacts_s3")
+    mock_update_and_create_recipe_file = mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file")
+    mocker.patch("gdk.commands.component.publish.create_gg_component", return_value="component_arn")
+
+    assert publish.run({"idempotent": True}) == "component_arn"
+    mock_upload_artifacts_s3.assert_called_once_with("component_name", "1.0.1")
+    mock_update_and_create_recipe_file.assert_called_once_with("component_name", "1.0.1")
+
+
+@pytest.fixture()
+def latest_component(mocker, tmp_path):
+    component_name = "com.example.HelloWorld"
+    artifacts_dir = tmp_path.joinpath("artifacts")
+    artifacts_dir.mkdir()
+    artifacts_dir.joinpath("hello_world.py").write_bytes(b"print('hello')")
+    mocker.patch(
+        "gdk.commands.component.project_utils.parse_recipe_file",
+        side_effect=lambda _: copy.deepcopy(json_values["parsed_component_recipe"]),
+    )
+    publish.project_config["gg_build_component_artifacts_dir"] = artifacts_dir
+    publish.project_config["region"] = "us-east-1"
+    publish.project_config["account_number"] = "1234"
+    publish.project_config["latest_component_version"] = "1.0.0"
+    latest_recipe = copy.deepcopy(json_values["parsed_component_recipe"])
+    latest_recipe["Manifests"][0]["Artifacts"][0] = {
+        "URI": "s3://default/{}/1.0.0/hello_world.py".format(component_name),
+        "Digest": base64.b64encode(hashlib.sha256(b"print('hello')").digest()).decode(),
+        "Algorithm": "SHA-256",
+    }
+    mock_client = mocker.Mock()
+    mocker.patch.object(publish, "service_clients", {"greengrass_client": mock_client})
+    mock_client.get_component.side_effect = lambda **_: {"recipe": json.dumps(latest_recipe).encode()}
+    return latest_recipe, mock_client
+
+
+def test_get_reusable_component_version_unchanged(latest_component):
+    _, mock_client = latest_component
+    arn = "arn:aws:greengrass:us-east-1:1234:components:com.example.HelloWorld:versions:1.0.0"
+    assert publish.get_reusable_component_version("com.example.HelloWorld") == arn
+    mock_client.get_component.assert_called_once_with(arn=arn, recipeOutputFormat="JSON")
+
+
+def test_get_reusable_component_version_recipe_changed(latest_component):
+    latest_recipe, _ = latest_component
+    latest_recipe["ComponentConfiguration"]["DefaultConfiguration"]["Message"] = "friend"
+    assert publish.get_reusable_component_version("com.example.HelloWorld") is None
+
+
+def test_get_reusable_component_version_artifact_changed(latest_component):
+    publish.project_config["gg_build_component_artifacts_dir"].joinpath("hello_world.py").write_bytes(b"print('hi')")
+    assert publish.get_reusable_component_version("com.example.HelloWorld") is None
+
+
+def test_get_reusable_component_version_no_digest(latest_component):
+    latest_recipe, _ = latest_component
+    del latest_recipe["Manifests"][0]["Artifacts"][0]["Digest"]
+    assert publish.get_reusable_component_version("com.example.HelloWorld") is None
+
+
+def test_get_reusable_component_version_exception(latest_component):
+    _, mock_client = latest_component
+    mock_client.get_component.side_effect = HTTPError("some error")
+    assert publish.get_reusable_component_version("com.example.HelloWorld") is None
+
+
+def test_get_reusable_component_version_no_latest_version(latest_component):
+    _, mock_client = latest_component
+    del publish.project_config["latest_component_version"]
+    assert publish.get_reusable_component_version("com.example.HelloWorld") is None
+    assert not mock_client.get_component.called
+
+
+def test_get_recipe_hash_ignores_key_order_and_digests():
+    recipe = {"ComponentName": "A", "Manifests": [{"Artifacts": [{"URI": "s3://b/a.zip"}]}]}
+    latest_recipe = {
+        "Manifests": [{"Artifacts": [{"Algorithm": "SHA-256", "Digest": "abc=", "URI": "s3://b/a.zip"}]}],
+        "ComponentName": "A",
+    }
+    assert publish.get_recipe_hash(recipe) == publish.get_recipe_hash(latest_recipe)
+    assert "Digest" in latest_recipe["Manifests"][0]["Artifacts"][0]
+
+
+def test_publish_run_wait(mocker):
+    mocker.patch("gdk.commands.component.publish.get_account_number", return_value="1234")
+    mocker.patch("gdk.commands.component.publish.prepare_artifacts_bucket", return_value=None)
+    mocker.patch("gdk.commands.component.publish.get_component_version_from_config", return_value="1.0.0")
+    mocker.patch("gdk.commands.component.publish.upload_artifacts_s3", return_value=None)
+    mocker.patch("gdk.commands.component.publish.update_and_create_recipe_file", return_value=None)
+    mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+    mocker.patch("gdk.commands.component.publish.create_gg_component", return_value="component_arn")
+    mock_wait_for_components = mocker.patch("gdk.commands.component.wait_utils.wait_for_components")
+    assert publish.run({"wait": True, "wait_timeout": 30}) == "component_arn"
+    mock_wait_for_components.assert_called_once_with(["component_arn"], 30)
+
+
+def test_publish_run_multi_component(mocker):
+    mock_publish_components = mocker.patch("gdk.commands.component.multi_component.publish_components")
+    mock_get_account_num = mocker.patch("gdk.commands.component.publish.get_account_number")
+    mock_get_project_config_values = mocker.patch("gdk.commands.component.project_utils.get_project_config_values")
+
+    publish.run({"all": True})
+
+    mock_publish_components.assert_called_once_with({"all": True})
+    assert not mock_get_account_num.called
+    assert not mock_get_project_config_values.called
+
+
 def test_create_bucket_exception_bucket_exists(mocker):
     bucket = "test-bucket"
     region = "region"
@@ -719,6 +990,7 @@ def test_create_bucket_exception_bucket_owned_in_region(mocker):
 def test_get_account_number_exception(mocker):
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"sts_client": mock_client}
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value=None)
     mock_get_caller_identity = mocker.patch("boto3.client.get_caller_identity", return_value=None)
     with pytest.raises(Exception) as e:
         publish.get_account_number()
@@ -729,12 +1001,96 @@ def test_get_account_number_exception(mocker):
 def test_get_account_number(mocker):
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"sts_client": mock_client}
+    mocker.patch("gdk.commands.component.project_utils.get_credentials_key", return_value=None)
     mock_get_caller_identity = mocker.patch("boto3.client.get_caller_identity", return_value={"Account": 124})
     num = publish.get_account_number()
     assert mock_get_caller_identity.call_count == 1
     assert num == 124
 
 
+def test_get_account_number_refresh(mocker):
+    publish.service_clients = {"sts_client": mocker.Mock()}
+    mock_get_account_number = mocker.patch("gdk.commands.component.project_utils.get_account_number", return_value="1234")
+    assert publish.get_account_number(True) == "1234"
+    mock_get_account_number.assert_called_once_with(publish.service_clients["sts_client"], True)
+
+
+@pytest.fixture()
+def bucket_cache(mocker):
+    cached_regions = {}
+    mocker.patch("gdk.commands.component.cache_utils.get_cached_bucket_region", side_effect=cached_regions.get)
+    mocker.patch("gdk.commands.component.cache_utils.update_cached_bucket_region", side_effect=cached_regions.__setitem__)
+    return cached_regions
+
+
+def test_prepare_artifacts_bucket_cached(mocker, bucket_cache):
+    bucket_cache["bucket"] = "us-east-1"
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    mock_create_bucket = mocker.patch("gdk.commands.component.publish.create_bucket")
+    publish.prepare_artifacts_bucket("bucket", "us-east-1")
+    assert not publish.service_clients["s3_client"].head_bucket.called
+    assert not mock_create_bucket.called
+
+
+def test_prepare_artifacts_bucket_exists(mocker, bucket_cache):
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    publish.service_clients["s3_client"].head_bucket.return_value = {"BucketRegion": "us-east-1"}
+    mock_create_bucket = mocker.patch("gdk.commands.component.publish.create_bucket")
+    publish.prepare_artifacts_bucket("bucket", "us-east-1")
+    publish.service_clients["s3_client"].head_bucket.assert_called_once_with(Bucket="bucket")
+    assert not mock_create_bucket.called
+    assert bucket_cache == {"bucket": "us-east-1"}
+
+
+def test_prepare_artifacts_bucket_not_exists(mocker, bucket_cache):
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    error = boto3.client("s3", region_name="us-east-1").exceptions.ClientError(
+        {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadBucket"
+    )
+    publish.service_clients["s3_client"].head_bucket.side_effect = error
+    mock_create_bucket = mocker.patch("gdk.commands.component.publish.create_bucket")
+    publish.prepare_artifacts_bucket("bucket", "us-west-2")
+    mock_create_bucket.assert_called_once_with("bucket", "us-west-2")
+    assert bucket_cache == {"bucket": "us-west-2"}
+
+
+def test_prepare_artifacts_bucket_other_region(mocker, bucket_cache):
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    error = boto3.client("s3", region_name="us-east-1").exceptions.ClientError(
+        {
+            "Error": {"Code": "301", "Message": "Moved Permanently"},
+            "ResponseMetadata": {"HTTPHeaders": {"x-amz-bucket-region": "eu-west-1"}},
+        },
+        "HeadBucket",
+    )
+    publish.service_clients["s3_client"].head_bucket.side_effect = error
+    mock_create_bucket = mocker.patch("gdk.commands.component.publish.create_bucket")
+    with pytest.raises(Exception) as e:
+        publish.prepare_artifacts_bucket("bucket", "us-west-2")
+    assert e.value.args[0] == "The artifacts bucket 'bucket' exists in the region 'eu-west-1' instead of 'us-west-2'."
+    assert not mock_create_bucket.called
+    assert bucket_cache == {}
+
+
+def test_get_bucket_region_from_headers(mocker):
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    publish.service_clients["s3_client"].head_bucket.return_value = {
+        "ResponseMetadata": {"HTTPHeaders": {"x-amz-bucket-region": "us-west-2"}}
+    }
+    assert publish.get_bucket_region("bucket") == "us-west-2"
+
+
+def test_upload_artifacts_exception_removes_cached_bucket(mocker):
+    mocker.patch.object(publish, "project_config", json_values)
+    publish.service_clients = {"s3_client": mocker.Mock()}
+    mocker.patch("pathlib.Path.iterdir", return_value=[Path("hello.py")])
+    mocker.patch("gdk.commands.component.transfer_utils.upload_files", side_effect=HTTPError("NoSuchBucket"))
+    mock_remove_cached_bucket = mocker.patch("gdk.commands.component.cache_utils.remove_cached_bucket_region")
+    with pytest.raises(Exception):
+        publish.upload_artifacts_s3("name", "1.0.0")
+    mock_remove_cached_bucket.assert_called_once_with(json_values["bucket"])
+
+
 def test_bucket_exists_in_same_region_exists(mocker):
     mock_client = mocker.patch("boto3.client", return_value=None)
     publish.service_clients = {"s3_client": mock_client}
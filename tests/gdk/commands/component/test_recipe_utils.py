@@ -0,0 +1,116 @@
+import io
+import time
+
+import gdk.commands.component.recipe_utils as recipe_utils
+import pytest
+import yaml
+
+requires_libyaml = pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML is not built with libyaml.")
+
+
+def get_recipe(platforms):
+    # Multi-platform recipe with the kinds of scalars found in recipes, including long and multi-line scripts.
+    return {
+        "RecipeFormatVersion": "2020-01-25",
+        "ComponentName": "com.example.Large",
+        "ComponentVersion": "1.0.0",
+        "ComponentDescription": "A component with a long description. " * 10 + "Ünïcode ✓, 'quotes' and: colons.",
+        "ComponentConfiguration": {
+            "DefaultConfiguration": {"Message": "hello", "Count": 3, "Ratio": 0.5, "Enabled": True, "Topic": None}
+        },
+        "ComponentDependencies": {
+            "aws.greengrass.Nucleus": {"VersionRequirement": ">=2.0.0 <3.0.0", "DependencyType": "SOFT"}
+        },
+        "Manifests": [
+            {
+                "Platform": {"os": "linux", "architecture": "arch-{}".format(i)},
+                "Lifecycle": {
+                    "Install": "pip3 install -r {artifacts:decompressedPath}/requirements.txt\necho installed\n",
+                    "Run": "python3 -u {artifacts:path}/main.py '{configuration:/Message}' " + "--flag " * 30,
+                },
+                "Artifacts": [
+                    {
+                        "URI": "s3://bucket/com.example.Large/1.0.0/artifact-{}.zip".format(j),
+                        "Unarchive": "ZIP",
+                        "Permission": {"Read": "ALL", "Execute": "OWNER"},
+                    }
+                    for j in range(5)
+                ],
+            }
+            for i in range(platforms)
+        ],
+    }
+
+
+def dump(recipe):
+    stream = io.StringIO()
+    recipe_utils.dump_yaml_recipe(recipe, stream)
+    return stream.getvalue()
+
+
+def test_dump_and_load_yaml_recipe():
+    recipe = get_recipe(3)
+    assert recipe_utils.load_yaml_recipe(dump(recipe)) == recipe
+    assert yaml.safe_load(dump(recipe)) == recipe
+
+
+@requires_libyaml
+def test_get_yaml_loader_and_dumper_libyaml():
+    assert recipe_utils.get_yaml_loader() == yaml.CSafeLoader
+    assert recipe_utils.get_yaml_dumper() == yaml.CSafeDumper
+
+
+def test_get_yaml_loader_and_dumper_fallback(mocker):
+    mocker.patch("yaml.__with_libyaml__", False)
+    assert recipe_utils.get_yaml_loader() == yaml.SafeLoader
+    assert recipe_utils.get_yaml_dumper() == yaml.SafeDumper
+
+
+@requires_libyaml
+def test_yaml_recipe_identical_with_and_without_libyaml(mocker):
+    recipe = get_recipe(20)
+    libyaml_output = dump(recipe)
+    libyaml_recipe = recipe_utils.load_yaml_recipe(libyaml_output)
+
+    mocker.patch("yaml.__with_libyaml__", False)
+    assert dump(recipe) == libyaml_output
+    assert recipe_utils.load_yaml_recipe(libyaml_output) == libyaml_recipe == recipe
+
+
+@pytest.mark.parametrize(
+    "with_libyaml, loader, dumper", [(True, "CSafeLoader", "CSafeDumper"), (False, "SafeLoader", "SafeDumper")]
+)
+def test_yaml_recipe_uses_libyaml_when_available(mocker, with_libyaml, loader, dumper):
+    if with_libyaml and not yaml.__with_libyaml__:
+        pytest.skip("PyYAML is not built with libyaml.")
+    mocker.patch("yaml.__with_libyaml__", with_libyaml)
+    spy_load = mocker.spy(yaml, "load")
+    spy_dump = mocker.spy(yaml, "dump")
+
+    recipe_utils.load_yaml_recipe(dump(get_recipe(1)))
+
+    assert spy_load.call_args[1]["Loader"] is getattr(yaml, loader)
+    assert spy_dump.call_args[1]["Dumper"] is getattr(yaml, dumper)
+
+
+@pytest.mark.benchmark
+@requires_libyaml
+def test_yaml_recipe_benchmark(mocker):
+    # Micro-benchmark of a load and dump round trip of a large multi-platform recipe with libyaml against the pure
+    # python loader and dumper.
+    recipe_yaml = dump(get_recipe(100))
+    runs = 3
+
+    def round_trip_ms():
+        start = time.perf_counter()
+        for _ in range(runs):
+            dump(recipe_utils.load_yaml_recipe(recipe_yaml))
+        return (time.perf_counter() - start) * 1000 / runs
+
+    libyaml_ms = round_trip_ms()
+    mocker.patch("yaml.__with_libyaml__", False)
+    python_ms = round_trip_ms()
+
+    assert libyaml_ms < python_ms / 2, "Recipe round trip took {:.1f}ms with libyaml, {:.1f}ms without.".format(
+        libyaml_ms, python_ms
+    )
@@ -0,0 +1,120 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import gdk.commands.component.task_utils as task_utils
+import pytest
+
+
+def test_run_tasks_passes_results_of_completed_tasks():
+    tasks = {
+        "first": (lambda results: 1, []),
+        "second": (lambda results: results["first"] + 1, ["first"]),
+        "third": (lambda results: results["first"] + results["second"], ["second"]),
+    }
+    results, timings = task_utils.run_tasks(tasks)
+    assert results == {"first": 1, "second": 2, "third": 3}
+    assert sorted(timings) == ["first", "second", "third"]
+    assert timings["first"][0] <= timings["second"][0] <= timings["third"][0]
+
+
+def test_run_tasks_runs_independent_tasks_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    tasks = {
+        "first": (lambda results: barrier.wait(), []),
+        "second": (lambda results: barrier.wait(), []),
+        "third": (lambda results: "done", ["first", "second"]),
+    }
+    results, _ = task_utils.run_tasks(tasks)
+    assert results["third"] == "done"
+
+
+def test_run_tasks_exception_stops_dependent_tasks():
+    started = []
+
+    def fail(results):
+        started.append("fail")
+        raise Exception("some error")
+
+    tasks = {
+        "fail": (fail, []),
+        "dependent": (lambda results: started.append("dependent"), ["fail"]),
+    }
+    with pytest.raises(Exception) as e:
+        task_utils.run_tasks(tasks)
+    assert e.value.args[0] == "some error"
+    assert started == ["fail"]
+
+
+def test_run_tasks_raises_exception_of_first_failed_task():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fail(message):
+        def run(results):
+            barrier.wait()
+            raise Exception(message)
+
+        return run
+
+    tasks = {"first": (fail("first error"), []), "second": (fail("second error"), [])}
+    with pytest.raises(Exception) as e:
+        task_utils.run_tasks(tasks)
+    assert e.value.args[0] == "first error"
+
+
+def test_run_tasks_unknown_dependency():
+    with pytest.raises(Exception) as e:
+        task_utils.run_tasks({"first": (lambda results: None, ["missing"])})
+    assert e.value.args[0] == "The task 'first' depends on unknown tasks: missing."
+
+
+def test_run_tasks_dependency_cycle():
+    tasks = {"first": (lambda results: None, ["second"]), "second": (lambda results: None, ["first"])}
+    with pytest.raises(Exception) as e:
+        task_utils.run_tasks(tasks)
+    assert e.value.args[0] == "The tasks depend on each other in a cycle: first -> second -> first."
+
+
+def test_schedule_tasks_tasks_without_run_complete_right_away():
+    completed = []
+
+    def get_task(name):
+        return None if name.startswith("skipped") else (lambda: name, ())
+
+    def complete_task(name, future):
+        completed.append(future.result())
+        return True
+
+    dependencies = {"skipped": [], "skipped_dependent": ["skipped"], "dependent": ["skipped_dependent"]}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        task_utils.schedule_tasks(executor, dependencies, get_task, complete_task)
+    assert completed == ["dependent"]
+
+
+def test_schedule_tasks_stops_starting_tasks():
+    started = []
+
+    def get_task(name):
+        started.append(name)
+        return lambda: None, ()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        task_utils.schedule_tasks(executor, {"first": [], "second": ["first"]}, get_task, lambda name, future: False)
+    assert started == ["first"]
+
+
+@pytest.mark.parametrize(
+    "dependencies, cycle",
+    [
+        ({"first": [], "second": ["first"]}, None),
+        ({"first": ["first"]}, ["first", "first"]),
+        ({"first": ["second"], "second": ["third"], "third": ["second"]}, ["second", "third", "second"]),
+    ],
+)
+def test_get_dependency_cycle(dependencies, cycle):
+    assert task_utils.get_dependency_cycle(dependencies) == cycle
+
+
+def test_log_task_timings(caplog):
+    caplog.set_level("INFO")
+    task_utils.log_task_timings("Publish steps", {"upload": (0.5, 1.0), "account": (0.0, 0.5)})
+    assert "Publish steps completed in 1.50s: account 0.50s, upload 1.00s." in caplog.text
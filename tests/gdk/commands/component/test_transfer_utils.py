@@ -0,0 +1,378 @@
+import hashlib
+import json
+import os
+import time
+from unittest.mock import ANY, Mock
+
+import gdk.commands.component.transfer_utils as transfer_utils
+import pytest
+from botocore.exceptions import ClientError
+from urllib3.exceptions import HTTPError
+
+MB = 1024 * 1024
+
+upload_options = {
+    "part_size_mb": 8,
+    "max_concurrency": 10,
+    "throughput_summary": False,
+    "skip_unchanged": False,
+    "resumable": True,
+    "stale_upload_ttl_hours": 24,
+}
+
+
+def test_upload_files_no_files():
+    s3_client = Mock()
+    assert transfer_utils.upload_files(s3_client, "bucket", [], upload_options) == []
+    assert not s3_client.upload_file.called
+
+
+def test_upload_files(tmp_path):
+    s3_client = Mock()
+    uploads = []
+    for name in ["a.zip", "b.jar", "c.py"]:
+        artifact = tmp_path.joinpath(name)
+        artifact.write_bytes(b"x" * 10)
+        uploads.append((artifact, f"name/1.0.0/{name}"))
+
+    summaries = transfer_utils.upload_files(s3_client, "bucket", uploads, upload_options)
+
+    assert s3_client.upload_file.call_count == 3
+    for artifact, s3_key in uploads:
+        s3_client.upload_file.assert_any_call(str(artifact.resolve()), "bucket", s3_key, ExtraArgs=None, Config=ANY)
+    assert [summary["name"] for summary in summaries] == ["a.zip", "b.jar", "c.py"]
+    assert all(summary["size"] == 10 for summary in summaries)
+
+
+def test_upload_files_splits_concurrency_among_files(mocker, tmp_path):
+    spy_transfer_config = mocker.spy(transfer_utils, "get_transfer_config")
+    s3_client = Mock()
+    uploads = []
+    for name in ["a.zip", "b.jar"]:
+        artifact = tmp_path.joinpath(name)
+        artifact.write_bytes(b"x")
+        uploads.append((artifact, name))
+
+    transfer_utils.upload_files(s3_client, "bucket", uploads, upload_options)
+    spy_transfer_config.assert_called_once_with(8, 5)
+
+
+def test_upload_files_throughput_summary(mocker, tmp_path):
+    mock_log_summary = mocker.patch("gdk.commands.component.transfer_utils.log_throughput_summary")
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(b"x")
+    options = dict(upload_options, throughput_summary=True)
+
+    summaries = transfer_utils.upload_files(Mock(), "bucket", [(artifact, "a.zip")], options)
+    mock_log_summary.assert_called_once_with(summaries)
+
+
+def test_upload_files_exception(tmp_path):
+    s3_client = Mock()
+    s3_client.upload_file.side_effect = HTTPError("some error")
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(b"x")
+
+    with pytest.raises(HTTPError) as e:
+        transfer_utils.upload_files(s3_client, "bucket", [(artifact, "a.zip")], upload_options)
+    assert "some error" in str(e.value)
+
+
+def test_get_transfer_config():
+    transfer_config = transfer_utils.get_transfer_config(16, 4)
+    assert transfer_config.multipart_threshold == 16 * transfer_utils.MB
+    assert transfer_config.multipart_chunksize == 16 * transfer_utils.MB
+    assert transfer_config.max_request_concurrency == 4
+
+
+def test_log_throughput_summary(caplog):
+    caplog.set_level("INFO")
+    transfer_utils.log_throughput_summary(
+        [
+            {"name": "a.zip", "size": 4 * transfer_utils.MB, "seconds": 2, "skipped": False},
+            {"name": "b.zip", "size": 1, "seconds": 0, "skipped": True},
+        ]
+    )
+    assert "Uploaded 'a.zip' (4.00 MB) in 2.00s at 2.00 MB/s." in caplog.text
+    assert "Skipped 'b.zip' as it is unchanged in the bucket." in caplog.text
+
+
+def test_upload_files_skip_unchanged(mocker, tmp_path):
+    mock_log_skipped = mocker.patch("gdk.commands.component.transfer_utils.log_skipped_summary")
+    s3_client = Mock()
+    unchanged = tmp_path.joinpath("unchanged.zip")
+    unchanged.write_bytes(b"same")
+    changed = tmp_path.joinpath("changed.zip")
+    changed.write_bytes(b"new")
+    unchanged_sha256 = hashlib.sha256(b"same").hexdigest()
+
+    def head_object(Bucket, Key):
+        return {"Metadata": {transfer_utils.CHECKSUM_METADATA_KEY: unchanged_sha256}}
+
+    s3_client.head_object.side_effect = head_object
+    options = dict(upload_options, skip_unchanged=True)
+    summaries = transfer_utils.upload_files(
+        s3_client, "bucket", [(unchanged, "unchanged.zip"), (changed, "changed.zip")], options
+    )
+
+    assert [summary["skipped"] for summary in summaries] == [True, False]
+    s3_client.upload_file.assert_called_once_with(
+        str(changed.resolve()),
+        "bucket",
+        "changed.zip",
+        ExtraArgs={"Metadata": {transfer_utils.CHECKSUM_METADATA_KEY: hashlib.sha256(b"new").hexdigest()}},
+        Config=ANY,
+    )
+    mock_log_skipped.assert_called_once_with(summaries)
+
+
+def test_upload_files_copy_unchanged_from_previous_key(tmp_path):
+    s3_client = Mock()
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(b"same")
+    checksum = hashlib.sha256(b"same").hexdigest()
+
+    def head_object(Bucket, Key):
+        if Key == "name/1.0.0/a.zip":
+            return {"Metadata": {transfer_utils.CHECKSUM_METADATA_KEY: checksum}}
+        raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+
+    s3_client.head_object.side_effect = head_object
+    options = dict(upload_options, skip_unchanged=True)
+    summaries = transfer_utils.upload_files(
+        s3_client, "bucket", [(artifact, "name/1.0.1/a.zip")], options, {"name/1.0.1/a.zip": "name/1.0.0/a.zip"}
+    )
+
+    assert summaries[0]["skipped"]
+    assert not s3_client.upload_file.called
+    s3_client.copy.assert_called_once_with(
+        {"Bucket": "bucket", "Key": "name/1.0.0/a.zip"}, "bucket", "name/1.0.1/a.zip", Config=ANY
+    )
+
+
+@pytest.mark.parametrize(
+    "multipart_chunksize, file_size, part_size",
+    [
+        (8 * MB, 100 * MB, 8 * MB),
+        (MB, 100 * MB, 5 * MB),
+        (8 * MB, 8 * MB * 10000, 8 * MB),
+        (8 * MB, 8 * MB * 10000 + 1, 16 * MB),
+        (6 * MB, 200 * 1024 * MB, 24 * MB),
+        (8 * 1024 * MB, 10 * 1024 * MB, 5 * 1024 * MB),
+    ],
+)
+def test_get_part_size(multipart_chunksize, file_size, part_size):
+    assert transfer_utils.get_part_size(multipart_chunksize, file_size) == part_size
+
+
+def test_get_file_digests_single_part(tmp_path):
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(b"hello")
+    digests = transfer_utils.get_file_digests(artifact, 10, 10)
+    assert digests == {"sha256": hashlib.sha256(b"hello").hexdigest(), "etag": hashlib.md5(b"hello").hexdigest()}
+
+
+def test_get_file_digests_multipart(mocker, tmp_path):
+    mocker.patch("gdk.common.consts.read_chunk_size", 3)
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(b"abcdefghij")
+    digests = transfer_utils.get_file_digests(artifact, 4, 4)
+    part_md5s = b"".join(hashlib.md5(part).digest() for part in [b"abcd", b"efgh", b"ij"])
+    assert digests["etag"] == "{}-3".format(hashlib.md5(part_md5s).hexdigest())
+    assert digests["sha256"] == hashlib.sha256(b"abcdefghij").hexdigest()
+
+
+def test_upload_file_skip_unchanged_adjusted_part_size(tmp_path):
+    s3_client = Mock()
+    artifact = tmp_path.joinpath("a.zip")
+    content = b"x" * 6 * MB
+    artifact.write_bytes(content)
+    part_size = 5 * MB
+    part_md5s = b"".join(hashlib.md5(part).digest() for part in [content[:part_size], content[part_size:]])
+    s3_client.head_object.return_value = {"ETag": '"{}-2"'.format(hashlib.md5(part_md5s).hexdigest()), "Metadata": {}}
+    transfer_config = transfer_utils.get_transfer_config(1, 1)
+
+    summary = transfer_utils.upload_file(s3_client, "bucket", artifact, "a.zip", transfer_config, skip_unchanged=True)
+
+    assert summary["skipped"]
+    assert not s3_client.upload_file.called
+
+
+def test_is_object_unchanged_etag():
+    s3_client = Mock()
+    s3_client.head_object.return_value = {"ETag": '"abc-2"', "Metadata": {}}
+    assert transfer_utils.is_object_unchanged(s3_client, "bucket", "key", {"sha256": "x", "etag": "abc-2"})
+    assert not transfer_utils.is_object_unchanged(s3_client, "bucket", "key", {"sha256": "x", "etag": "abc-3"})
+
+
+def test_is_object_unchanged_checksum_mismatch():
+    s3_client = Mock()
+    s3_client.head_object.return_value = {"ETag": '"abc"', "Metadata": {transfer_utils.CHECKSUM_METADATA_KEY: "y"}}
+    assert not transfer_utils.is_object_unchanged(s3_client, "bucket", "key", {"sha256": "x", "etag": "abc"})
+
+
+def test_is_object_unchanged_object_not_exists():
+    s3_client = Mock()
+    s3_client.head_object.side_effect = ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+    assert not transfer_utils.is_object_unchanged(s3_client, "bucket", "key", {"sha256": "x", "etag": "abc"})
+
+
+def test_log_skipped_summary(caplog):
+    caplog.set_level("INFO")
+    summaries = [
+        {"name": "a.zip", "size": 2 * transfer_utils.MB, "seconds": 0, "skipped": True},
+        {"name": "b.zip", "size": transfer_utils.MB, "seconds": 1, "skipped": False},
+    ]
+    transfer_utils.log_skipped_summary(summaries)
+    assert "Skipped uploading 1 of 2 artifacts as they are unchanged in the bucket. Saved 2.00 MB of uploads." in caplog.text
+
+
+class FakeMultipartClient:
+    """
+    S3 client that keeps the parts of multipart uploads in memory and fails to upload the given part once.
+    """
+
+    def __init__(self, failing_part=None):
+        self.uploads = {}
+        self.uploaded_parts = []
+        self.completed = {}
+        self.aborted = []
+        self.failing_part = failing_part
+        self.created = 0
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.created += 1
+        upload_id = "upload-{}".format(self.created)
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.failing_part:
+            self.failing_part = None
+            raise HTTPError("connection reset")
+        etag = '"{}"'.format(hashlib.md5(Body).hexdigest())
+        self.uploads[UploadId][PartNumber] = etag
+        self.uploaded_parts.append(PartNumber)
+        return {"ETag": etag}
+
+    def get_paginator(self, operation_name):
+        def paginate(Bucket, Key, UploadId):
+            if UploadId not in self.uploads:
+                raise ClientError({"Error": {"Code": "NoSuchUpload"}}, "ListParts")
+            parts = [{"PartNumber": number, "ETag": etag} for number, etag in self.uploads[UploadId].items()]
+            return [{"Parts": parts}]
+
+        return Mock(paginate=paginate)
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed[UploadId] = MultipartUpload["Parts"]
+        del self.uploads[UploadId]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        if UploadId not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload"}}, "AbortMultipartUpload")
+        self.aborted.append(UploadId)
+        del self.uploads[UploadId]
+
+
+@pytest.fixture()
+def large_artifact(tmp_path):
+    artifact = tmp_path.joinpath("a.zip")
+    artifact.write_bytes(os.urandom(12 * transfer_utils.MB))
+    return artifact
+
+
+def upload_resumable(s3_client, artifact, checkpoint_dir):
+    transfer_config = transfer_utils.get_transfer_config(5, 1)
+    s3_key = "name/1.0.0/a.zip"
+    transfer_utils.upload_file(s3_client, "bucket", artifact, s3_key, transfer_config, checkpoint_dir=checkpoint_dir)
+
+
+def test_upload_file_resumable(tmp_path, large_artifact):
+    s3_client = FakeMultipartClient()
+    upload_resumable(s3_client, large_artifact, tmp_path.joinpath("checkpoints"))
+
+    assert s3_client.uploaded_parts == [1, 2, 3]
+    assert [part["PartNumber"] for part in s3_client.completed["upload-1"]] == [1, 2, 3]
+    assert list(tmp_path.joinpath("checkpoints").iterdir()) == []
+
+
+def test_upload_file_resumable_resumes_interrupted_upload(tmp_path, large_artifact):
+    checkpoint_dir = tmp_path.joinpath("checkpoints")
+    s3_client = FakeMultipartClient(failing_part=2)
+    with pytest.raises(HTTPError):
+        upload_resumable(s3_client, large_artifact, checkpoint_dir)
+    checkpoint_file = transfer_utils.get_checkpoint_file(checkpoint_dir, "bucket", "name/1.0.0/a.zip")
+    assert sorted(json.loads(checkpoint_file.read_text())["parts"]) == ["1", "3"]
+
+    s3_client.uploaded_parts = []
+    upload_resumable(s3_client, large_artifact, checkpoint_dir)
+
+    assert s3_client.uploaded_parts == [2]
+    assert [part["PartNumber"] for part in s3_client.completed["upload-1"]] == [1, 2, 3]
+    assert not checkpoint_file.exists()
+
+
+def test_upload_file_resumable_file_changed(tmp_path, large_artifact):
+    checkpoint_dir = tmp_path.joinpath("checkpoints")
+    s3_client = FakeMultipartClient(failing_part=2)
+    with pytest.raises(HTTPError):
+        upload_resumable(s3_client, large_artifact, checkpoint_dir)
+    large_artifact.write_bytes(os.urandom(11 * transfer_utils.MB))
+
+    s3_client.uploaded_parts = []
+    upload_resumable(s3_client, large_artifact, checkpoint_dir)
+
+    assert s3_client.aborted == ["upload-1"]
+    assert s3_client.uploaded_parts == [1, 2, 3]
+    assert "upload-2" in s3_client.completed
+
+
+def test_upload_file_resumable_upload_not_found(tmp_path, large_artifact):
+    checkpoint_dir = tmp_path.joinpath("checkpoints")
+    s3_client = FakeMultipartClient(failing_part=2)
+    with pytest.raises(HTTPError):
+        upload_resumable(s3_client, large_artifact, checkpoint_dir)
+    s3_client.uploads.clear()
+
+    s3_client.uploaded_parts = []
+    upload_resumable(s3_client, large_artifact, checkpoint_dir)
+
+    assert s3_client.uploaded_parts == [1, 2, 3]
+    assert "upload-2" in s3_client.completed
+
+
+def test_upload_files_not_resumable(tmp_path, large_artifact):
+    s3_client = Mock()
+    options = dict(upload_options, resumable=False, part_size_mb=5)
+    transfer_utils.upload_files(s3_client, "bucket", [(large_artifact, "a.zip")], options, checkpoint_dir=tmp_path)
+    assert s3_client.upload_file.call_count == 1
+    assert not s3_client.create_multipart_upload.called
+
+
+def test_abort_stale_uploads(tmp_path):
+    s3_client = FakeMultipartClient()
+    s3_client.uploads = {"stale": {}, "recent": {}}
+    checkpoint_dir = tmp_path.joinpath("checkpoints")
+    checkpoint_dir.mkdir()
+    for upload_id, age_hours in [("stale", 25), ("recent", 1)]:
+        created_at = time.time() - age_hours * 3600
+        checkpoint = {"bucket": "bucket", "key": upload_id, "upload_id": upload_id, "created_at": created_at}
+        checkpoint_dir.joinpath("{}.json".format(upload_id)).write_text(json.dumps(checkpoint))
+    checkpoint_dir.joinpath("invalid.json").write_text("{")
+
+    transfer_utils.abort_stale_uploads(s3_client, checkpoint_dir, 24)
+
+    assert s3_client.aborted == ["stale"]
+    assert [path.name for path in checkpoint_dir.iterdir()] == ["recent.json"]
+
+
+def test_abort_upload_keeps_checkpoint_on_error(tmp_path):
+    s3_client = Mock()
+    error = ClientError({"Error": {"Code": "AccessDenied"}}, "AbortMultipartUpload")
+    s3_client.abort_multipart_upload.side_effect = error
+    checkpoint_file = tmp_path.joinpath("checkpoint.json")
+    checkpoint_file.write_text("{}")
+
+    transfer_utils.abort_upload(s3_client, checkpoint_file, {"bucket": "bucket", "key": "key", "upload_id": "id"})
+    assert checkpoint_file.exists()
@@ -0,0 +1,63 @@
+import gdk.commands.component.version_utils as version_utils
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def latest_versions(mocker):
+    return mocker.patch.dict(version_utils._latest_versions, clear=True)
+
+
+def mock_greengrass_client(mocker, versions_by_arn):
+    def paginate(arn):
+        return [{"componentVersions": [{"componentVersion": v} for v in page]} for page in versions_by_arn[arn]]
+
+    mock_client = mocker.Mock()
+    mock_client.get_paginator.return_value.paginate.side_effect = paginate
+    return mock_client
+
+
+def test_get_semver_key_precedence():
+    versions = ["1.0.0", "1.0.0-alpha.1", "1.0.0-alpha", "1.0.0-beta.11", "1.0.0-beta.2", "1.0.10", "1.0.9", "1.0.0-rc.1"]
+    expected = ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.9", "1.0.10"]
+    assert sorted(versions, key=version_utils.get_semver_key) == expected
+    assert version_utils.get_semver_key("1.0.0+build.1") == version_utils.get_semver_key("1.0.0")
+
+
+def test_get_semver_key_invalid():
+    with pytest.raises(Exception) as e:
+        version_utils.get_semver_key("1.0")
+    assert e.value.args[0] == "Invalid semantic version '1.0'."
+
+
+@pytest.mark.parametrize(
+    "version, next_version", [("1.0.6", "1.0.7"), ("1.0.6-x-y-z", "1.0.7"), ("2.9.99+build", "2.9.100")]
+)
+def test_get_next_patch_version(version, next_version):
+    assert version_utils.get_next_patch_version(version) == next_version
+
+
+def test_get_component_version_arn():
+    arn = version_utils.get_component_version_arn("us-east-1", "1234", "com.example.A", "1.0.0")
+    assert arn == "arn:aws:greengrass:us-east-1:1234:components:com.example.A:versions:1.0.0"
+
+
+def test_get_latest_component_version_pages(mocker):
+    arn = version_utils.get_component_arn("us-east-1", "1234", "com.example.A")
+    mock_client = mock_greengrass_client(mocker, {arn: [["1.0.9", "1.0.2"], ["1.0.10", "not-a-version"], []]})
+
+    assert version_utils.get_latest_component_version(mock_client, arn) == "1.0.10"
+    assert version_utils.get_latest_component_version(mock_client, arn) == "1.0.10"
+    assert arn == "arn:aws:greengrass:us-east-1:1234:components:com.example.A"
+    mock_client.get_paginator.return_value.paginate.assert_called_once_with(arn=arn)
+
+
+def test_get_latest_component_versions_batch(mocker):
+    arns = [version_utils.get_component_arn("us-east-1", "1234", name) for name in ["A", "B", "C"]]
+    mock_client = mock_greengrass_client(mocker, {arns[0]: [["1.0.0"]], arns[1]: [[]], arns[2]: [["2.0.0", "2.1.0"]]})
+    version_utils.cache_latest_component_versions({arns[2]: "3.0.0"})
+
+    latest_versions = version_utils.get_latest_component_versions(mock_client, arns + [arns[0]])
+
+    assert latest_versions == {arns[0]: "1.0.0", arns[1]: None, arns[2]: "3.0.0"}
+    paginate_calls = mock_client.get_paginator.return_value.paginate.call_args_list
+    assert sorted(paginate_call[1]["arn"] for paginate_call in paginate_calls) == arns[:2]
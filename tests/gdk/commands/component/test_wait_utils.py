@@ -0,0 +1,82 @@
+import gdk.commands.component.wait_utils as wait_utils
+import gdk.common.exceptions.error_messages as error_messages
+import pytest
+
+first_arn = "arn:aws:greengrass:us-east-1:1234:components:com.example.First:versions:1.0.0"
+second_arn = "arn:aws:greengrass:us-west-2:1234:components:com.example.Second:versions:2.0.0"
+
+
+@pytest.fixture()
+def clock(mocker):
+    # Fake clock that moves forward only when the poller sleeps.
+    now = [100.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    mocker.patch("time.sleep", side_effect=lambda seconds: now.__setitem__(0, now[0] + seconds))
+    mocker.patch("random.uniform", return_value=0)
+    return now
+
+
+def mock_component_states(mocker, states):
+    # Returns the given states of each component version one after another, repeating the last one.
+    polls = []
+
+    def get_component_state(component_arn):
+        polls.append(component_arn)
+        component_states = states[component_arn]
+        state = component_states.pop(0) if len(component_states) > 1 else component_states[0]
+        return {"componentState": state, "message": "", "errors": {}}
+
+    mocker.patch("gdk.commands.component.wait_utils.get_component_state", side_effect=get_component_state)
+    return polls
+
+
+def test_wait_for_components(mocker, clock):
+    polls = mock_component_states(
+        mocker,
+        {first_arn: ["REQUESTED", "INITIATED", "DEPLOYABLE"], second_arn: ["DEPLOYABLE"]},
+    )
+    states = wait_utils.wait_for_components([first_arn, second_arn])
+
+    # Polled after 1s, then 2s and 4s later.
+    assert states == {second_arn: ("DEPLOYABLE", 1.0), first_arn: ("DEPLOYABLE", 7.0)}
+    assert polls == [first_arn, second_arn, first_arn, first_arn]
+
+
+def test_wait_for_components_failed(mocker, clock):
+    mock_component_states(mocker, {first_arn: ["FAILED"], second_arn: ["DEPLOYABLE"]})
+    with pytest.raises(Exception) as e:
+        wait_utils.wait_for_components([first_arn, second_arn])
+    assert e.value.args[0] == error_messages.COMPONENTS_NOT_DEPLOYABLE.format("'com.example.First-1.0.0' (FAILED)")
+
+
+def test_wait_for_components_timeout(mocker, clock):
+    polls = mock_component_states(mocker, {first_arn: ["INITIATED"]})
+    with pytest.raises(Exception) as e:
+        wait_utils.wait_for_components([first_arn], timeout=30)
+    assert e.value.args[0] == error_messages.COMPONENTS_NOT_DEPLOYABLE.format("'com.example.First-1.0.0' (INITIATED)")
+    # Polled after 1s, 3s, 7s, 15s and at the timeout.
+    assert len(polls) == 5
+    assert clock[0] == 130.0
+
+
+def test_wait_for_components_zero_timeout(mocker, clock):
+    polls = mock_component_states(mocker, {first_arn: ["INITIATED"]})
+    with pytest.raises(Exception) as e:
+        wait_utils.wait_for_components([first_arn], timeout=0)
+    assert e.value.args[0] == error_messages.COMPONENTS_NOT_DEPLOYABLE.format("'com.example.First-1.0.0' (INITIATED)")
+    # Polled once without waiting.
+    assert polls == [first_arn]
+    assert clock[0] == 100.0
+
+
+def test_get_poll_delay_backoff(mocker):
+    mocker.patch("random.uniform", side_effect=lambda low, high: high)
+    assert [wait_utils.get_poll_delay(polls) for polls in range(7)] == [0.5, 1, 2, 4, 8, 10, 10]
+
+
+def test_get_component_state(mocker):
+    mock_client = mocker.patch("gdk.commands.component.project_utils.create_greengrass_client")
+    mock_client.return_value.describe_component.return_value = {"status": {"componentState": "DEPLOYABLE"}}
+    assert wait_utils.get_component_state(second_arn) == {"componentState": "DEPLOYABLE"}
+    mock_client.assert_called_once_with("us-west-2")
+    mock_client.return_value.describe_component.assert_called_once_with(arn=second_arn)
@@ -0,0 +1,185 @@
+import os
+import stat
+import zipfile
+
+import gdk.commands.component.zip_utils as zip_utils
+import pytest
+
+zip_options = {
+    "compression_level": 6,
+    "store_extensions": [".whl"],
+    "parallel": False,
+    "max_workers": None,
+    "deterministic": False,
+}
+
+
+@pytest.fixture()
+def project(tmp_path):
+    project_dir = tmp_path.joinpath("project")
+    project_dir.mkdir()
+    project_dir.joinpath("main.py").write_text("print('hello')" * 100)
+    project_dir.joinpath("gdk-config.json").write_text("{}")
+    project_dir.joinpath("lib").mkdir()
+    project_dir.joinpath("lib", "vendored.whl").write_bytes(b"wheel" * 100)
+    project_dir.joinpath("lib", "empty").mkdir()
+    project_dir.joinpath("node_modules").mkdir()
+    project_dir.joinpath("node_modules", "module.js").write_text("module")
+    project_dir.joinpath("zip-build").mkdir()
+    return project_dir
+
+
+def ignore(path, names):
+    return ["gdk-config.json", "node_modules"]
+
+
+def test_create_zip_archive(project):
+    archive_file = project.joinpath("zip-build", "project.zip")
+    zip_utils.create_zip_archive(project, archive_file, ignore, zip_options, excluded_dirs=[project.joinpath("zip-build")])
+
+    with zipfile.ZipFile(archive_file) as zf:
+        assert zf.namelist() == ["lib/", "main.py", "lib/empty/", "lib/vendored.whl"]
+        assert zf.getinfo("main.py").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("lib/vendored.whl").compress_type == zipfile.ZIP_STORED
+        assert zf.read("main.py") == b"print('hello')" * 100
+        assert zf.read("lib/vendored.whl") == b"wheel" * 100
+
+
+def test_create_zip_archive_ignore_applied_to_sub_directories(project):
+    archive_file = project.parent.joinpath("project.zip")
+
+    def ignore_empty(path, names):
+        return ["empty"]
+
+    zip_utils.create_zip_archive(project, archive_file, ignore_empty, zip_options)
+    with zipfile.ZipFile(archive_file) as zf:
+        assert "lib/empty/" not in zf.namelist()
+        assert "zip-build/" in zf.namelist()
+        assert "node_modules/module.js" in zf.namelist()
+
+
+def test_create_zip_archive_compression_level(project):
+    archive_file = project.parent.joinpath("project.zip")
+    zip_utils.create_zip_archive(project, archive_file, ignore, dict(zip_options, compression_level=0))
+    with zipfile.ZipFile(archive_file) as zf:
+        info = zf.getinfo("main.py")
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert info.compress_size >= info.file_size
+
+
+def test_create_zip_archive_parallel_identical_to_serial(mocker, project):
+    mocker.patch("gdk.common.consts.read_chunk_size", 64)
+    for i in range(20):
+        project.joinpath("lib", f"module_{i}.py").write_text(f"value = {i}\n" * (i * 50))
+    serial_archive = project.parent.joinpath("serial.zip")
+    parallel_archive = project.parent.joinpath("parallel.zip")
+
+    zip_utils.create_zip_archive(project, serial_archive, ignore, zip_options)
+    zip_utils.create_zip_archive(project, parallel_archive, ignore, dict(zip_options, parallel=True, max_workers=3))
+
+    assert serial_archive.read_bytes() == parallel_archive.read_bytes()
+    with zipfile.ZipFile(parallel_archive) as zf:
+        assert zf.testzip() is None
+        assert zf.read("lib/module_7.py") == b"value = 7\n" * 350
+
+
+@pytest.mark.parametrize("compression_level", [0, 1, 9])
+def test_create_zip_archive_parallel_identical_to_serial_compression_levels(project, compression_level):
+    # Pins the level set on the entries written by ZipFile.open to the level used by the parallel compressors.
+    options = dict(zip_options, compression_level=compression_level)
+    serial_archive = project.parent.joinpath("serial.zip")
+    parallel_archive = project.parent.joinpath("parallel.zip")
+
+    zip_utils.create_zip_archive(project, serial_archive, ignore, options)
+    zip_utils.create_zip_archive(project, parallel_archive, ignore, dict(options, parallel=True, max_workers=2))
+
+    assert serial_archive.read_bytes() == parallel_archive.read_bytes()
+
+
+def test_create_zip_archive_serial_streams_into_archive(mocker, project):
+    spy_temporary_file = mocker.spy(zip_utils.tempfile, "SpooledTemporaryFile")
+    zip_utils.create_zip_archive(project, project.parent.joinpath("serial.zip"), ignore, zip_options)
+    assert not spy_temporary_file.called
+
+    zip_utils.create_zip_archive(project, project.parent.joinpath("parallel.zip"), ignore, dict(zip_options, parallel=True))
+    assert spy_temporary_file.called
+
+
+def test_zipfile_internals_used_to_write_compressed_entries(tmp_path):
+    with zipfile.ZipFile(tmp_path.joinpath("archive.zip"), "w") as zf:
+        assert zf.fp.tell() == zf.start_dir == 0
+        assert zf.filelist == [] and zf.NameToInfo == {}
+        assert callable(zipfile.ZipInfo("name").FileHeader)
+
+
+def test_create_zip_archive_parallel_default_workers(mocker, project):
+    spy_executor = mocker.spy(zip_utils, "ThreadPoolExecutor")
+    mocker.patch("os.cpu_count", return_value=2)
+    zip_utils.create_zip_archive(project, project.parent.joinpath("project.zip"), ignore, dict(zip_options, parallel=True))
+    spy_executor.assert_called_once_with(max_workers=2)
+
+
+def test_create_zip_archive_matches_zipfile(project):
+    # Entries written from the compressed data must be the same as the ones zipfile writes itself.
+    archive_file = project.parent.joinpath("project.zip")
+    zip_utils.create_zip_archive(project, archive_file, ignore, zip_options, excluded_dirs=[project.joinpath("zip-build")])
+
+    expected_archive_file = project.parent.joinpath("expected.zip")
+    # The default deflate level of zipfile is the same as level 6.
+    with zipfile.ZipFile(expected_archive_file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.write(project.joinpath("lib"), "lib/", compress_type=zipfile.ZIP_STORED)
+        zf.write(project.joinpath("main.py"), "main.py")
+        zf.write(project.joinpath("lib", "empty"), "lib/empty/")
+        zf.write(project.joinpath("lib", "vendored.whl"), "lib/vendored.whl", compress_type=zipfile.ZIP_STORED)
+    assert archive_file.read_bytes() == expected_archive_file.read_bytes()
+
+
+def test_create_zip_archive_deterministic(project):
+    deterministic_options = dict(zip_options, deterministic=True)
+    project.joinpath("run.sh").write_text("echo hello")
+    project.joinpath("run.sh").chmod(0o700)
+    project.joinpath("main.py").chmod(0o600)
+    first_archive = project.parent.joinpath("first.zip")
+    second_archive = project.parent.joinpath("second.zip")
+    excluded_dirs = [project.joinpath("zip-build")]
+
+    zip_utils.create_zip_archive(project, first_archive, ignore, deterministic_options, excluded_dirs=excluded_dirs)
+    for path in project.rglob("*"):
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+    zip_utils.create_zip_archive(project, second_archive, ignore, deterministic_options, excluded_dirs=excluded_dirs)
+
+    assert first_archive.read_bytes() == second_archive.read_bytes()
+    with zipfile.ZipFile(first_archive) as zf:
+        assert zf.testzip() is None
+        assert all(info.date_time == zip_utils.DETERMINISTIC_DATE_TIME for info in zf.infolist())
+        assert zf.getinfo("main.py").external_attr >> 16 == stat.S_IFREG | 0o644
+        assert zf.getinfo("run.sh").external_attr >> 16 == stat.S_IFREG | 0o755
+        assert zf.getinfo("lib/").external_attr >> 16 == stat.S_IFDIR | 0o755
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_create_zip_archive_deterministic_files_before_1980(project, parallel):
+    for path in [project, *project.rglob("*")]:
+        os.utime(path, (1, 1))
+    archive_file = project.parent.joinpath("project.zip")
+    options = dict(zip_options, deterministic=True, parallel=parallel)
+
+    zip_utils.create_zip_archive(project, archive_file, ignore, options, excluded_dirs=[project.joinpath("zip-build")])
+
+    with zipfile.ZipFile(archive_file) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["lib/", "main.py", "lib/empty/", "lib/vendored.whl"]
+        assert all(info.date_time == zip_utils.DETERMINISTIC_DATE_TIME for info in zf.infolist())
+        assert zf.read("main.py") == b"print('hello')" * 100
+
+
+def test_create_zip_archive_not_deterministic_by_default(project):
+    first_archive = project.parent.joinpath("first.zip")
+    second_archive = project.parent.joinpath("second.zip")
+    excluded_dirs = [project.joinpath("zip-build")]
+
+    zip_utils.create_zip_archive(project, first_archive, ignore, zip_options, excluded_dirs=excluded_dirs)
+    os.utime(project.joinpath("main.py"), (1_600_000_000, 1_600_000_000))
+    zip_utils.create_zip_archive(project, second_archive, ignore, zip_options, excluded_dirs=excluded_dirs)
+
+    assert first_archive.read_bytes() != second_archive.read_bytes()
@@ -1,9 +1,12 @@
+import json
+import time
 from pathlib import Path
 
 import gdk.common.configuration as config
 import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
+import jsonschema
 import pytest
 
 
@@ -39,6 +42,7 @@ def test_get_configuration_valid_component_config_found(mocker):
         "invalid_build_command_string.json",
         "invalid_build_command_array.json",
         "invalid_region_config.json",
+        "invalid_multi_component_config.json",
     ],
 )
 def test_get_configuration_invalid_config_file(mocker, file_name):
@@ -53,7 +57,7 @@ def test_get_configuration_invalid_config_file(mocker, file_name):
     assert "Please correct its format and try again." in err.value.args[0]
 
 
-@pytest.mark.parametrize("file_name", ["valid_build_command.json"])
+@pytest.mark.parametrize("file_name", ["valid_build_command.json", "valid_multi_component_config.json"])
 def test_get_configuration_config_file(mocker, file_name):
     mock_get_project_config_file = mocker.patch(
         "gdk.common.configuration._get_project_config_file",
@@ -102,3 +106,73 @@ def test_get_project_config_file_not_exists(mocker):
 
     assert e_info.value.args[0] == error_messages.CONFIG_FILE_NOT_EXISTS
     assert mock_file_exists.called
+
+
+def test_get_schema_validator_cached(mocker, tmp_path):
+    schema_file = tmp_path.joinpath("schema.json")
+    schema_file.write_text('{"type": "object", "required": ["a"]}')
+    spy_loads = mocker.spy(config.json, "loads")
+
+    validator = config.get_schema_validator(schema_file)
+    assert config.get_schema_validator(schema_file) is validator
+    assert spy_loads.call_count == 1
+    assert not validator.is_valid({})
+
+    schema_file.write_text('{"type": "object", "required": ["a", "b"]}')
+    new_validator = config.get_schema_validator(schema_file)
+    assert new_validator is not validator
+    assert not new_validator.is_valid({"a": 1})
+
+
+def test_validate_configuration_same_error_as_jsonschema():
+    data = {"component": {"c": {"author": "abc", "version": "1.0.0", "build": {"build_system": "unknown"}, "publish": {}}}}
+    schema_file = utils.get_static_file_path(consts.config_schema_file)
+    with open(schema_file) as f:
+        schema = json.loads(f.read())
+    with pytest.raises(jsonschema.exceptions.ValidationError) as expected:
+        jsonschema.validate(data, schema)
+
+    with pytest.raises(jsonschema.exceptions.ValidationError) as err:
+        config.validate_configuration(data)
+    assert err.value.message == expected.value.message
+
+
+def test_validate_configuration_reuses_validator(mocker):
+    with open(Path(".").joinpath("tests/gdk/static").joinpath("config.json")) as f:
+        data = json.loads(f.read())
+    mocker.patch.dict(config._validator_cache, clear=True)
+    spy_loads = mocker.spy(config.json, "loads")
+
+    for _ in range(3):
+        config.validate_configuration(data)
+
+    # The schema is loaded and its validator created only for the first validation.
+    assert spy_loads.call_count == 1
+    schema_file = utils.get_static_file_path(consts.config_schema_file)
+    assert list(config._validator_cache) == [schema_file]
+    assert config.get_schema_validator(schema_file) is config._validator_cache[schema_file][1]
+
+
+@pytest.mark.benchmark
+def test_validate_configuration_benchmark():
+    # Micro-benchmark of the validation latency of a project config with the cached validator against creating the
+    # validator for each validation, as jsonschema.validate does.
+    with open(Path(".").joinpath("tests/gdk/static").joinpath("config.json")) as f:
+        data = json.loads(f.read())
+    schema_file = utils.get_static_file_path(consts.config_schema_file)
+    with open(schema_file) as f:
+        schema = json.loads(f.read())
+    runs = 50
+
+    config.validate_configuration(data)
+    start = time.perf_counter()
+    for _ in range(runs):
+        config.validate_configuration(data)
+    cached_ms = (time.perf_counter() - start) * 1000 / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        jsonschema.validate(data, schema)
+    uncached_ms = (time.perf_counter() - start) * 1000 / runs
+
+    assert cached_ms < uncached_ms / 2, "Validation took {:.3f}ms cached, {:.3f}ms uncached.".format(cached_ms, uncached_ms)
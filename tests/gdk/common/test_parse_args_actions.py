@@ -254,7 +254,7 @@ def test_conflicting_args_with_conflict(mocker):
         "gdk": "component",
     }
     cli_model = {"init": {"conflicting_arg_groups": [["language", "template"], ["repository"], ["project"], ["interactive"]]}}
-    mocker.patch.object(gdk.CLIParser.cli_tool, "cli_model", cli_model)
+    mocker.patch.object(gdk.CLIParser.CLIParser, "cli_model", cli_model)
 
     assert actions.conflicting_arg_groups(command_args, "init")
     assert mock_dic_of_conflicting_args.call_count == 1
@@ -286,7 +286,7 @@ def test_conflicting_args_with_no_conflict(mocker):
         "gdk": "component",
     }
     cli_model = {"init": {"conflicting_arg_groups": [["language", "template"], ["repository"], ["project"], ["interactive"]]}}
-    mocker.patch.object(gdk.CLIParser.cli_tool, "cli_model", cli_model)
+    mocker.patch.object(gdk.CLIParser.CLIParser, "cli_model", cli_model)
 
     assert not actions.conflicting_arg_groups(command_args, "init")
     assert mock_dic_of_conflicting_args.call_count == 1
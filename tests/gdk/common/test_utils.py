@@ -1,6 +1,10 @@
+import errno
+import hashlib
+import json
 from pathlib import Path
 
 import gdk.common.utils as utils
+import pytest
 from urllib3.exceptions import HTTPError
 
 
@@ -106,3 +110,77 @@ def test_clean_dir(mocker):
     path = Path().resolve()
     utils.clean_dir(path)
     mock_rm.call_count == 1
+
+
+def test_stage_file_copy(tmp_path):
+    source_file = tmp_path.joinpath("artifact.jar")
+    source_file.write_bytes(b"artifact")
+    destination_dir = tmp_path.joinpath("artifacts")
+    destination_dir.mkdir()
+
+    assert utils.stage_file(source_file, destination_dir) == "copy"
+    assert destination_dir.joinpath("artifact.jar").read_bytes() == b"artifact"
+    assert not destination_dir.joinpath("artifact.jar").samefile(source_file)
+
+
+def test_stage_file_hardlink(mocker, tmp_path):
+    mocker.patch("gdk.common.utils._reflink", return_value=False)
+    source_file = tmp_path.joinpath("artifact.jar")
+    source_file.write_bytes(b"artifact")
+    destination_dir = tmp_path.joinpath("artifacts")
+    destination_dir.mkdir()
+    destination_dir.joinpath("artifact.jar").write_bytes(b"old artifact")
+
+    assert utils.stage_file(source_file, destination_dir, link=True) == "hardlink"
+    assert destination_dir.joinpath("artifact.jar").samefile(source_file)
+
+
+def test_stage_file_reflink(mocker, tmp_path):
+    mock_ioctl = mocker.patch("fcntl.ioctl")
+    mock_link = mocker.patch("os.link")
+    source_file = tmp_path.joinpath("artifact.jar")
+    source_file.write_bytes(b"artifact")
+
+    destination_dir = tmp_path.joinpath("artifacts")
+    destination_dir.mkdir()
+    assert utils.stage_file(source_file, destination_dir, link=True) == "reflink"
+    assert mock_ioctl.call_args[0][1] == utils.FICLONE
+    assert not mock_link.called
+
+
+def test_stage_file_copy_across_devices(mocker, tmp_path):
+    mocker.patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported"))
+    mocker.patch("os.link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link"))
+    source_file = tmp_path.joinpath("artifact.jar")
+    source_file.write_bytes(b"artifact")
+    destination_dir = tmp_path.joinpath("artifacts")
+    destination_dir.mkdir()
+
+    assert utils.stage_file(source_file, destination_dir, link=True) == "copy"
+    assert destination_dir.joinpath("artifact.jar").read_bytes() == b"artifact"
+
+
+def test_write_json_atomic(tmp_path):
+    file_path = tmp_path.joinpath("cache", "data.json")
+    utils.write_json_atomic(file_path, {"key": "value"})
+    utils.write_json_atomic(file_path, {"key": "new value"})
+    assert json.loads(file_path.read_text()) == {"key": "new value"}
+    assert list(file_path.parent.iterdir()) == [file_path]
+
+
+def test_write_json_atomic_interrupted(mocker, tmp_path):
+    file_path = tmp_path.joinpath("data.json")
+    utils.write_json_atomic(file_path, {"key": "value"})
+    mocker.patch("json.dumps", side_effect=KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        utils.write_json_atomic(file_path, {"key": "new value"})
+    assert json.loads(file_path.read_text()) == {"key": "value"}
+
+
+def test_get_file_hash(mocker, tmp_path):
+    mocker.patch("gdk.common.consts.read_chunk_size", 3)
+    file_path = tmp_path.joinpath("artifact.zip")
+    file_path.write_bytes(b"abcdefghij")
+    assert list(utils.read_file_chunks(file_path)) == [b"abc", b"def", b"ghi", b"j"]
+    assert utils.get_file_hash(file_path).hexdigest() == hashlib.sha256(b"abcdefghij").hexdigest()
+    assert utils.get_file_hash(file_path, "md5").digest() == hashlib.md5(b"abcdefghij").digest()
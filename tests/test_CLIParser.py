@@ -115,16 +115,21 @@ def test_model_file():
 
 def test_main(mocker):
     args_namespace = argparse.Namespace(component="init", init=None, lang="python", template="name", **{"gdk": "component"})
-    mock_cli_parser = mocker.patch("gdk.CLIParser.cli_parser.parse_args", return_value=args_namespace)
+    mocker.patch("sys.argv", ["gdk", "component", "init"])
+    mock_create_cli_parser = mocker.patch("gdk.CLIParser.create_cli_parser")
+    mock_cli_parser = mock_create_cli_parser.return_value.parse_args
+    mock_cli_parser.return_value = args_namespace
     mock_run_command = mocker.patch("gdk.common.parse_args_actions.run_command", return_value=None)
     cli_parser.main()
+    mock_create_cli_parser.assert_called_once_with(["component", "init"])
     mock_cli_parser.assert_any_call()
     mock_run_command.assert_any_call(args_namespace)
 
 
 def test_main_exception(mocker):
     args_namespace = argparse.Namespace(component="init", init=None, lang="python", template="name", **{"gdk": "component"})
-    mock_cli_parser = mocker.patch("gdk.CLIParser.cli_parser.parse_args", return_value=args_namespace)
+    mock_cli_parser = mocker.patch("gdk.CLIParser.create_cli_parser").return_value.parse_args
+    mock_cli_parser.return_value = args_namespace
     mock_run_command = mocker.patch(
         "gdk.common.parse_args_actions.run_command", return_value=None, side_effect=HTTPError("some")
     )
@@ -132,3 +137,71 @@ def test_main_exception(mocker):
         cli_parser.main()
     mock_cli_parser.assert_any_call()
     mock_run_command.assert_any_call(args_namespace)
+
+
+def test_get_invoked_commands():
+    assert cli_parser.get_invoked_commands([]) == []
+    assert cli_parser.get_invoked_commands(["-d", "component"]) == ["component"]
+    assert cli_parser.get_invoked_commands(["component", "build", "-d"]) == ["component", "build"]
+    assert cli_parser.get_invoked_commands(["component", "init", "-t", "build"]) == ["component", "init"]
+    assert cli_parser.get_invoked_commands(["build"]) == []
+
+
+def test_create_cli_parser_only_invoked_commands(mocker):
+    spy_create_parser = mocker.spy(cli_parser.CLIParser, "create_parser")
+    parser = cli_parser.create_cli_parser(["component", "init", "-l", "PYTHON"])
+
+    created_commands = [call[0][0].command for call in spy_create_parser.call_args_list]
+    assert created_commands == ["gdk", "component", "init"]
+    assert parser.parse_args(["component", "init", "-l", "PYTHON"]).language == "python"
+    # Sub-commands that are not invoked are still known to the parser.
+    assert parser.parse_args(["component", "build"]).component == "build"
+
+
+def test_create_cli_parser_all_commands(mocker):
+    spy_create_parser = mocker.spy(cli_parser.CLIParser, "create_parser")
+    parser = cli_parser.create_cli_parser()
+
+    created_commands = [call[0][0].command for call in spy_create_parser.call_args_list]
+    assert created_commands == ["gdk", "component", "init", "build", "publish", "list"]
+    assert parser.parse_args(["component", "build", "--force"]).force
+    assert cli_parser.get_cli_parser().parse_args(["component", "list", "--template"]).template
+
+
+def test_get_cli_parser_created_once(mocker):
+    mocker.patch("gdk.CLIParser._cli_parser", None)
+    spy_create_cli_parser = mocker.spy(cli_parser, "create_cli_parser")
+    parser = cli_parser.get_cli_parser()
+
+    assert cli_parser.get_cli_parser() is parser
+    spy_create_cli_parser.assert_called_once_with()
+
+
+def test_create_cli_parser_error(mocker):
+    mocker.patch("gdk.CLIParser.CLIParser.create_parser", side_effect=Exception("model error"))
+    with pytest.raises(SystemExit):
+        cli_parser.create_cli_parser([])
+
+
+def test_create_cli_parser_wait_timeout():
+    parser = cli_parser.create_cli_parser(["component", "publish"])
+    assert parser.parse_args(["component", "publish", "--wait", "--wait-timeout", "0"]).wait_timeout == 0
+    with pytest.raises(SystemExit):
+        parser.parse_args(["component", "publish", "--wait", "--wait-timeout", "-1"])
+
+
+@pytest.mark.parametrize("value", ["-1", "1.5", "ten"])
+def test_non_negative_int_invalid(value):
+    with pytest.raises(argparse.ArgumentTypeError) as e:
+        consts.non_negative_int(value)
+    assert e.value.args[0] == "'{}' is not an integer that is zero or more.".format(value)
+
+
+def test_CLIParser_get_arg_from_model_type():
+    cli_tool = cli_parser.CLIParser(consts.cli_tool_name, None)
+    _, args = cli_tool._get_arg_from_model({"name": ["-l"], "help": "help", "type": "str.lower"})
+    assert args["type"] == str.lower
+
+    with pytest.raises(Exception) as e:
+        cli_tool._get_arg_from_model({"name": ["-l"], "help": "help", "type": "__import__('os')"})
+    assert "Unsupported type" in e.value.args[0]
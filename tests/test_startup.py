@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Startup budget of the CLI in milliseconds, measured as the import time of the gdk modules and the modules they import.
+# The budget is generous to keep the benchmark stable on slow machines. It can be tightened with GDK_STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = float(os.environ.get("GDK_STARTUP_BUDGET_MS", 300))
+# Dependencies that are slow to import and are loaded only by the commands that need them.
+HEAVY_MODULES = {"boto3", "botocore", "yaml", "requests", "jsonschema"}
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+# Records the modules imported by the code run after it, including when the code exits with SystemExit.
+RECORD_MODULES = """
+import atexit, json, sys
+
+def record_modules():
+    with open({!r}, "w") as f:
+        json.dump(sorted(sys.modules), f)
+
+atexit.register(record_modules)
+"""
+COMMANDS = [
+    [],
+    ["component"],
+    ["component", "init"],
+    ["component", "build"],
+    ["component", "publish"],
+    ["component", "list"],
+]
+
+
+def run_python(code, cwd, options=()):
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_DIR))
+    command = [sys.executable] + list(options) + ["-c", code]
+    process = subprocess.run(
+        command, cwd=str(cwd), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    )
+    assert process.returncode == 0, process.stderr
+    return process
+
+
+def get_imported_modules(code, cwd):
+    """
+    Runs the code in a new interpreter and returns the names of all the modules imported by it.
+    """
+    modules_file = Path(cwd).joinpath("modules.json")
+    run_python(RECORD_MODULES.format(str(modules_file)) + code, cwd)
+    with open(modules_file) as f:
+        return set(json.load(f))
+
+
+def get_import_times(code, cwd):
+    """
+    Runs the code in a new interpreter with '-X importtime' and returns the cumulative import time in microseconds of
+    each module imported by it, along with the names of the top level modules.
+    """
+    process = run_python(code, cwd, ["-X", "importtime"])
+    import_times = {}
+    top_level_modules = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_times[name.strip()] = int(cumulative)
+        # Nested imports are indented under the module that imports them.
+        if not name.startswith("  "):
+            top_level_modules.add(name.strip())
+    return import_times, top_level_modules
+
+
+def get_help_code(command):
+    return "import sys; sys.argv = {}; from gdk.CLIParser import main; main()".format(["gdk"] + command + ["--help"])
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_startup_imports_no_heavy_dependencies(tmp_path, command):
+    imported_modules = get_imported_modules(get_help_code(command), tmp_path)
+
+    assert "gdk.CLIParser" in imported_modules
+    assert not HEAVY_MODULES & imported_modules
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="'-X importtime' requires Python 3.7")
+@pytest.mark.parametrize("command", COMMANDS)
+def test_startup_time_within_budget(tmp_path, command):
+    import_times, top_level_modules = get_import_times(get_help_code(command), tmp_path)
+
+    assert "gdk.CLIParser" in import_times
+    startup_ms = sum(import_times[name] for name in top_level_modules if name.split(".")[0] == "gdk") / 1000
+    assert startup_ms < STARTUP_BUDGET_MS, "Startup of 'gdk {} --help' took {:.1f}ms".format(" ".join(command), startup_ms)
+
+
+@pytest.mark.parametrize(
+    "module, allowed_modules",
+    [
+        ("gdk.commands.component.project_utils", set()),
+        ("gdk.commands.component.list", {"requests"}),
+        ("gdk.commands.component.init", {"requests"}),
+    ],
+)
+def test_command_modules_import_only_needed_dependencies(tmp_path, module, allowed_modules):
+    imported_modules = get_imported_modules("import {}".format(module), tmp_path)
+    assert HEAVY_MODULES & imported_modules <= allowed_modules